@@ -1,5 +1,8 @@
 import uuid
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, AsyncIterator, Any, Literal
 
 
 class BaseRepositoryException(Exception):
@@ -11,20 +14,70 @@ class NotFoundException(BaseRepositoryException):
 class AlreadyExistsException(BaseRepositoryException):
     pass
 
+class InvalidCursorException(BaseRepositoryException):
+    pass
+
+class PreconditionFailedException(BaseRepositoryException):
+    pass
+
+
+@dataclass
+class Page[Model]:
+    items: list[Model]
+    next_cursor: Optional[str] = None
+
+
+@dataclass
+class Change[Model]:
+    # An upsert carries the entity's current state; a delete only its id.
+    op: Literal["upsert", "delete"]
+    id: uuid.UUID
+    changed_at: datetime
+    item: Optional[Model] = None
+
+
+@dataclass
+class ChangeFeed[Model]:
+    changes: list[Change[Model]]
+    # Pass back as ``since`` to resume after the last change returned.
+    next_token: str
+    has_more: bool = False
+
+
+@dataclass
+class BulkCreateResult[Model]:
+    index: int
+    item: Optional[Model] = None
+    error: Optional[str] = None
+
 
 class CRUDRepositoryInterface[Model, CreateDTO, UpdateDTO](ABC):
     @abstractmethod
     async def create(self, obj: CreateDTO) -> Model:
         pass
 
+    @abstractmethod
+    async def create_many(self, objs: list[CreateDTO], atomic: bool = True) -> list[BulkCreateResult[Model]]:
+        pass
+
     @abstractmethod
     async def get(self, obj_id: uuid.UUID) -> Model:
         pass
 
+    @abstractmethod
+    async def get_many(self, obj_ids: list[uuid.UUID]) -> list[Model]:
+        pass
+
     @abstractmethod
     async def update(self, obj_id: uuid.UUID, obj: UpdateDTO) -> None:
         pass
 
+    @abstractmethod
+    async def patch(
+            self, obj_id: uuid.UUID, values: dict[str, Any], expected_updated_at: Optional[datetime] = None
+    ) -> Model:
+        pass
+
     @abstractmethod
     async def delete(self, obj_id: uuid.UUID) -> None:
         pass
@@ -32,3 +85,35 @@ class CRUDRepositoryInterface[Model, CreateDTO, UpdateDTO](ABC):
     @abstractmethod
     async def get_all(self, limit: int = 100, offset: int = 0, **kwargs) -> list[Model]:
         pass
+
+    @abstractmethod
+    async def get_partial(self, obj_id: uuid.UUID, fields: list[str]) -> dict[str, Any]:
+        pass
+
+    @abstractmethod
+    async def get_all_partial(
+            self, fields: list[str], limit: int = 100, offset: int = 0, **kwargs
+    ) -> list[dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def get_page(self, limit: int = 100, cursor: Optional[str] = None, **kwargs) -> Page[Model]:
+        pass
+
+    @abstractmethod
+    def stream(self, **kwargs) -> AsyncIterator[Model]:
+        pass
+
+    @abstractmethod
+    async def count(self, estimated: bool = False, **kwargs) -> int:
+        pass
+
+    @abstractmethod
+    async def get_version(self, obj_id: uuid.UUID) -> datetime:
+        pass
+
+    @abstractmethod
+    async def get_versions(
+            self, limit: int = 100, offset: int = 0, cursor: Optional[str] = None, **kwargs
+    ) -> list[tuple[uuid.UUID, datetime]]:
+        pass
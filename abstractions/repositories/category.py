@@ -1,9 +1,9 @@
 import uuid
-from abc import ABC
+from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 
 from .abstract import CRUDRepositoryInterface
-from domain import Category
+from domain import Category, CategoryStats
 
 
 @dataclass
@@ -24,4 +24,10 @@ class CategoryRepositoryInterface(
     ],
     ABC,
 ):
-    ...
+    @abstractmethod
+    async def get_stats(self, category_id: uuid.UUID) -> CategoryStats:
+        pass
+
+    @abstractmethod
+    async def get_many_stats(self, category_ids: list[uuid.UUID]) -> list[CategoryStats]:
+        pass
@@ -1,11 +1,16 @@
 import uuid
-from abc import ABC
+from abc import ABC, abstractmethod
+from array import array
 from dataclasses import dataclass, field
-from typing import Optional
+from datetime import datetime, timedelta
+from typing import Optional, Iterable, Literal
 
-from .abstract import CRUDRepositoryInterface
+from .abstract import CRUDRepositoryInterface, Page, ChangeFeed
 from domain import Product
 
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
 
 @dataclass
 class CreateProductDTO:
@@ -26,6 +31,52 @@ class UpdateProductDTO:
     category_id: Optional[uuid.UUID]
 
 
+@dataclass
+class ProductEvent:
+    op: Literal["create", "update", "delete"]
+    id: uuid.UUID
+    category_id: uuid.UUID
+    # The product as written; left out of deletes and of events too large to
+    # publish whole.
+    item: Optional[Product] = None
+    # The category the product was in before an update, so subscribers to
+    # that category see it move out.
+    previous_category_id: Optional[uuid.UUID] = None
+
+
+@dataclass(slots=True)
+class ProductColumns:
+    # One array per field: UUIDs packed as 16 bytes each, timestamps as int64
+    # microseconds since the epoch, prices as int64.
+    ids: bytes
+    created_at: array
+    updated_at: array
+    sku: list[str]
+    name: list[str]
+    description: list[str]
+    price: array
+    category_ids: bytes
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple]) -> "ProductColumns":
+        # Rows hold the product fields in model order.
+        rows = list(rows)
+        ids, created_at, updated_at, sku, name, description, price, category_ids = zip(*rows) if rows else ([],) * 8
+        return cls(
+            ids=b"".join(value.bytes for value in ids),
+            created_at=array("q", [(value - _EPOCH) // _MICROSECOND for value in created_at]),
+            updated_at=array("q", [(value - _EPOCH) // _MICROSECOND for value in updated_at]),
+            sku=list(sku),
+            name=list(name),
+            description=list(description),
+            price=array("q", price),
+            category_ids=b"".join(value.bytes for value in category_ids),
+        )
+
+
 class ProductRepositoryInterface(
     CRUDRepositoryInterface[
         Product,
@@ -34,4 +85,14 @@ class ProductRepositoryInterface(
     ],
     ABC,
 ):
-    ...
+    @abstractmethod
+    async def search(self, query: str, limit: int = 100, cursor: Optional[str] = None) -> Page[Product]:
+        pass
+
+    @abstractmethod
+    async def get_all_columnar(self, limit: int = 100, offset: int = 0, **kwargs) -> ProductColumns:
+        pass
+
+    @abstractmethod
+    async def changes(self, since: Optional[str] = None, limit: int = 1000) -> ChangeFeed[Product]:
+        pass
@@ -1,4 +1,5 @@
 from .product import ProductUseCaseInterface
 from .category import CategoryUseCaseInterface
+from .product_import import ProductImportUseCaseInterface
 
 from .abstract import CRUDUseCaseInterface
@@ -1,5 +1,9 @@
 import uuid
 from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Optional, AsyncIterator, Any
+
+from abstractions.repositories.abstract import Page, BulkCreateResult
 
 
 class CRUDUseCaseInterface[
@@ -9,14 +13,28 @@ class CRUDUseCaseInterface[
     async def create(self, obj: CreateDTO) -> Model:
         pass
 
+    @abstractmethod
+    async def create_many(self, objs: list[CreateDTO], atomic: bool = True) -> list[BulkCreateResult[Model]]:
+        pass
+
     @abstractmethod
     async def get(self, obj_id: uuid.UUID) -> Model:
         pass
 
+    @abstractmethod
+    async def get_many(self, obj_ids: list[uuid.UUID]) -> list[Model]:
+        pass
+
     @abstractmethod
     async def update(self, obj_id: uuid.UUID, obj: UpdateDTO) -> None:
         pass
 
+    @abstractmethod
+    async def patch(
+            self, obj_id: uuid.UUID, values: dict[str, Any], expected_updated_at: Optional[datetime] = None
+    ) -> Model:
+        pass
+
     @abstractmethod
     async def delete(self, obj_id: uuid.UUID) -> None:
         pass
@@ -24,4 +42,35 @@ class CRUDUseCaseInterface[
     @abstractmethod
     async def get_all(self, limit: int = 100, offset: int = 0, **kwargs) -> list[Model]:
         pass
-    
\ No newline at end of file
+
+    @abstractmethod
+    async def get_partial(self, obj_id: uuid.UUID, fields: list[str]) -> dict[str, Any]:
+        pass
+
+    @abstractmethod
+    async def get_all_partial(
+            self, fields: list[str], limit: int = 100, offset: int = 0, **kwargs
+    ) -> list[dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def get_page(self, limit: int = 100, cursor: Optional[str] = None, **kwargs) -> Page[Model]:
+        pass
+
+    @abstractmethod
+    def stream(self, **kwargs) -> AsyncIterator[Model]:
+        pass
+
+    @abstractmethod
+    async def count(self, estimated: bool = False, **kwargs) -> int:
+        pass
+
+    @abstractmethod
+    async def get_version(self, obj_id: uuid.UUID) -> datetime:
+        pass
+
+    @abstractmethod
+    async def get_versions(
+            self, limit: int = 100, offset: int = 0, cursor: Optional[str] = None, **kwargs
+    ) -> list[tuple[uuid.UUID, datetime]]:
+        pass
@@ -1,8 +1,9 @@
-from abc import ABC
+import uuid
+from abc import ABC, abstractmethod
 
 from abstractions.repositories.category import CreateCategoryDTO, UpdateCategoryDTO
 from abstractions.usecases.abstract import CRUDUseCaseInterface
-from domain import Category
+from domain import Category, CategoryStats
 
 
 class CategoryUseCaseInterface(
@@ -11,4 +12,10 @@ class CategoryUseCaseInterface(
     ],
     ABC,
 ):
-    pass
+    @abstractmethod
+    async def get_stats(self, category_id: uuid.UUID) -> CategoryStats:
+        pass
+
+    @abstractmethod
+    async def get_many_stats(self, category_ids: list[uuid.UUID]) -> list[CategoryStats]:
+        pass
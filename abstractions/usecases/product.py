@@ -1,7 +1,10 @@
 import uuid
-from abc import ABC
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Optional, AsyncIterator, Any
 
-from abstractions.repositories.product import CreateProductDTO, UpdateProductDTO
+from abstractions.repositories.abstract import Page, ChangeFeed
+from abstractions.repositories.product import CreateProductDTO, UpdateProductDTO, ProductColumns
 from abstractions.usecases.abstract import CRUDUseCaseInterface
 from domain import Product
 
@@ -15,3 +18,35 @@ class ProductUseCaseInterface(
     async def get_all(self, limit: int = 100, offset: int = 0, sku: str = None, name: str = None,
                       category_id: uuid.UUID = None) -> list[Product]:
         pass
+
+    async def get_page(self, limit: int = 100, cursor: Optional[str] = None, sku: str = None, name: str = None,
+                       category_id: uuid.UUID = None) -> Page[Product]:
+        pass
+
+    async def get_all_partial(self, fields: list[str], limit: int = 100, offset: int = 0, sku: str = None,
+                              name: str = None, category_id: uuid.UUID = None) -> list[dict[str, Any]]:
+        pass
+
+    def stream(self, sku: str = None, name: str = None, category_id: uuid.UUID = None) -> AsyncIterator[Product]:
+        pass
+
+    async def count(self, estimated: bool = False, sku: str = None, name: str = None,
+                    category_id: uuid.UUID = None) -> int:
+        pass
+
+    async def get_versions(self, limit: int = 100, offset: int = 0, cursor: Optional[str] = None, sku: str = None,
+                           name: str = None, category_id: uuid.UUID = None) -> list[tuple[uuid.UUID, datetime]]:
+        pass
+
+    @abstractmethod
+    async def get_all_columnar(self, limit: int = 100, offset: int = 0, sku: str = None, name: str = None,
+                               category_id: uuid.UUID = None) -> ProductColumns:
+        pass
+
+    @abstractmethod
+    async def changes(self, since: Optional[str] = None, limit: int = 1000) -> ChangeFeed[Product]:
+        pass
+
+    @abstractmethod
+    async def search(self, query: str, limit: int = 100, cursor: Optional[str] = None) -> Page[Product]:
+        pass
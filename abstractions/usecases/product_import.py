@@ -0,0 +1,33 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Optional
+
+
+@dataclass
+class ImportRecord:
+    row: int
+    values: Optional[dict] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class RejectedRow:
+    row: int
+    reason: str
+
+
+@dataclass
+class ImportSummary:
+    total_rows: int = 0
+    imported: int = 0
+    rejected: int = 0
+    elapsed_seconds: float = 0.0
+    rows_per_second: float = 0.0
+    rejections: list[RejectedRow] = field(default_factory=list)
+    rejections_truncated: bool = False
+
+
+class ProductImportUseCaseInterface(ABC):
+    @abstractmethod
+    async def run(self, records: AsyncIterator[ImportRecord]) -> ImportSummary:
+        pass
@@ -0,0 +1,51 @@
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import main
+from benchmarks.replay import load_traffic, open_client, replay
+
+COUNTS_TRAFFIC = Path(__file__).parent / "counts.jsonl"
+
+
+async def run(args: argparse.Namespace) -> int:
+    entries = load_traffic(args.traffic)
+    cache_ttl = main.settings.counts.cache_ttl
+    results = {}
+    # The same traffic with the count cache off and on; writes clear it, and
+    # this traffic has none, so the cached run measures hits after the first
+    # read of each filter.
+    for label, ttl in (("uncached", 0.0), ("cached", cache_ttl)):
+        main.settings.counts.cache_ttl = ttl
+        async with open_client(None) as client:
+            if args.warmup:
+                await replay(client, entries, args.warmup, args.concurrency, args.seed)
+            routes, elapsed = await replay(client, entries, args.requests, args.concurrency, args.seed)
+        results[label] = {route: result.summary(elapsed) for route, result in routes.items()}
+    main.settings.counts.cache_ttl = cache_ttl
+
+    print(f"{'count mode':<24} {'uncached p50/p95 ms':>20} {'cached p50/p95 ms':>20}")
+    for route in results["uncached"]:
+        print(f"{route:<24} " + " ".join(
+            f"{results[label][route]['p50_ms']:>10.1f} / {results[label][route]['p95_ms']:<7.1f}"
+            for label in ("uncached", "cached")
+        ))
+    if args.output is not None:
+        args.output.write_text(json.dumps({"concurrency": args.concurrency, "runs": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Replay listing traffic per count mode with the count cache off and on, in-process; "
+                    "seed the database with benchmarks.seed first"
+    )
+    parser.add_argument("traffic", type=Path, nargs="?", default=COUNTS_TRAFFIC)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path)
+    sys.exit(asyncio.run(run(parser.parse_args())))
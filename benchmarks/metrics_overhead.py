@@ -0,0 +1,119 @@
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+import httpx
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from infrastructure.handlers.fastapi.metrics import MetricsMiddleware
+from infrastructure.metrics import AppMetrics
+from infrastructure.repositories.instrumented import InstrumentedRepository
+
+ROUTE = SimpleNamespace(path="/products")
+STATEMENT = "SELECT products.id, products.created_at FROM products ORDER BY products.created_at DESC LIMIT $1"
+
+
+async def endpoint(scope, receive, send) -> None:
+    scope["route"] = ROUTE
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def noop_send(message) -> None:
+    pass
+
+
+class NullRepository:
+    async def get_all(self, limit: int = 100, offset: int = 0, **kwargs) -> list:
+        return []
+
+
+async def time_loop(call, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await call()
+    return (time.perf_counter() - started) / iterations
+
+
+async def middleware_cost(metrics: AppMetrics, iterations: int) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/products"}
+    instrumented = MetricsMiddleware(endpoint, metrics)
+    bare = await time_loop(lambda: endpoint(dict(scope), None, noop_send), iterations)
+    timed = await time_loop(lambda: instrumented(dict(scope), None, noop_send), iterations)
+    return max(timed - bare, 0.0)
+
+
+async def repository_cost(metrics: AppMetrics, iterations: int) -> float:
+    repository = NullRepository()
+    instrumented = InstrumentedRepository(repository, metrics.repository_duration, "product")
+    bare = await time_loop(repository.get_all, iterations)
+    timed = await time_loop(instrumented.get_all, iterations)
+    return max(timed - bare, 0.0)
+
+
+def query_cost(metrics: AppMetrics, iterations: int) -> float:
+    bare_engine = create_async_engine("postgresql+asyncpg://bench@localhost/bench")
+    engine = create_async_engine("postgresql+asyncpg://bench@localhost/bench")
+    metrics.instrument_engine(engine, "primary")
+    results = []
+    for target in (bare_engine, engine):
+        dispatch = target.sync_engine.dispatch.before_cursor_execute
+        started = time.perf_counter()
+        for _ in range(iterations):
+            dispatch(None, None, STATEMENT, (), None, False)
+        results.append((time.perf_counter() - started) / iterations)
+    return max(results[1] - results[0], 0.0)
+
+
+async def request_latency(path: str, requests: int) -> float:
+    from main import setup
+
+    app = await setup()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        await client.get(path)
+        latencies = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - started)
+            response.raise_for_status()
+    return statistics.median(latencies)
+
+
+async def run(args: argparse.Namespace) -> int:
+    metrics = AppMetrics()
+    per_request = await middleware_cost(metrics, args.iterations)
+    per_repository_call = await repository_cost(metrics, args.iterations)
+    per_query = query_cost(metrics, args.iterations)
+    overhead = per_request + args.repository_calls * per_repository_call + args.queries * per_query
+
+    if args.request_ms is not None:
+        latency = args.request_ms / 1000
+    else:
+        latency = await request_latency(args.path, args.requests)
+
+    ratio = overhead / latency
+    print(f"middleware per request:     {per_request * 1e6:8.2f} us")
+    print(f"repository per call:        {per_repository_call * 1e6:8.2f} us")
+    print(f"query counter per query:    {per_query * 1e6:8.2f} us")
+    print(f"instrumentation per request:{overhead * 1e6:8.2f} us")
+    print(f"median request latency:     {latency * 1e3:8.2f} ms")
+    print(f"overhead:                   {ratio:8.3%} (budget {args.budget:.1%})")
+    return 0 if ratio < args.budget else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure the cost of request, repository and query instrumentation relative to request latency"
+    )
+    parser.add_argument("--iterations", type=int, default=100_000)
+    parser.add_argument("--path", default="/products?limit=100")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--request-ms", type=float, help="use this latency instead of measuring --path")
+    parser.add_argument("--repository-calls", type=int, default=1)
+    parser.add_argument("--queries", type=int, default=1)
+    parser.add_argument("--budget", type=float, default=0.01)
+    sys.exit(asyncio.run(run(parser.parse_args())))
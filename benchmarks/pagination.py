@@ -0,0 +1,104 @@
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy import select
+
+from infrastructure.repositories.pagination import encode_cursor
+from infrastructure.repositories.product import SqlAlchemyProductRepository
+from infrastructure.repositories.sqlalchemy.entities import Product
+from main import create_engine, create_session_maker
+
+
+async def cursor_at(repository: SqlAlchemyProductRepository, depth: int, **filters) -> Optional[str]:
+    # The cursor a client would hold after paging through ``depth`` rows: the
+    # sort key of the last row it has seen. Found with OFFSET once, outside
+    # the timed calls.
+    if depth == 0:
+        return None
+    stm = repository._listing(select(Product.created_at, Product.id), **filters).offset(depth - 1).limit(1)
+    async with repository.session_maker() as session:
+        row = (await session.execute(stm)).one_or_none()
+    if row is None:
+        raise SystemExit(f"Only fewer than {depth} products match; seed more rows or lower --depths")
+    return encode_cursor(row.created_at, row.id)
+
+
+async def time_call(call: Callable[[], Awaitable], iterations: int) -> dict[str, float]:
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await call()
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return {
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[max(int(len(latencies) * 0.95) - 1, 0)] * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+    }
+
+
+async def run(args: argparse.Namespace) -> int:
+    engine = create_engine()
+    repository = SqlAlchemyProductRepository(create_session_maker(engine), single_flight=False)
+    filters = {} if args.category_id is None else {"category_id": args.category_id}
+    results = {}
+    try:
+        for depth in sorted({0, *args.depths}):
+            cursor = await cursor_at(repository, depth, **filters)
+            keyset = lambda: repository.get_page(args.limit, cursor, **filters)  # noqa: E731
+            offset = lambda: repository.get_all(args.limit, depth, **filters)  # noqa: E731
+            await time_call(keyset, args.warmup)
+            await time_call(offset, args.warmup)
+            results[depth] = {
+                "keyset": await time_call(keyset, args.iterations),
+                "offset": await time_call(offset, args.iterations),
+            }
+    finally:
+        await engine.dispose()
+
+    # The seek is an index range scan wherever it starts, so a deep page
+    # should cost about as much as the first one; OFFSET walks every skipped row.
+    first_page = results[0]["keyset"]["p50_ms"]
+    print(f"{'depth':>10} {'keyset p50':>11} {'keyset p95':>11} {'offset p50':>11} {'offset p95':>11} {'vs page 1':>10}")
+    failures = []
+    for depth, result in results.items():
+        ratio = result["keyset"]["p50_ms"] / first_page
+        print(
+            f"{depth:>10} {result['keyset']['p50_ms']:>11.2f} {result['keyset']['p95_ms']:>11.2f} "
+            f"{result['offset']['p50_ms']:>11.2f} {result['offset']['p95_ms']:>11.2f} {ratio:>9.2f}x"
+        )
+        if ratio > args.max_ratio:
+            failures.append(f"keyset page at depth {depth} costs {ratio:.2f}x page 1 (limit {args.max_ratio:g}x)")
+    for failure in failures:
+        print(f"REGRESSION {failure}", file=sys.stderr)
+    if args.output is not None:
+        args.output.write_text(json.dumps({
+            "limit": args.limit,
+            "category_id": None if args.category_id is None else str(args.category_id),
+            "depths": {str(depth): result for depth, result in results.items()},
+        }, indent=2))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare the cost of deep keyset pages with page 1 and with OFFSET at the same depth; "
+                    "seed the database with benchmarks.seed first"
+    )
+    parser.add_argument("--depths", type=int, nargs="+", default=[1_000, 10_000, 100_000, 900_000],
+                        help="rows already paged through before the timed page")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--category-id", type=uuid.UUID, help="page through one category instead of all products")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--max-ratio", type=float, default=2.0,
+                        help="fail when a deep keyset page's p50 exceeds page 1's by more than this factor")
+    parser.add_argument("--output", type=Path)
+    sys.exit(asyncio.run(run(parser.parse_args())))
@@ -0,0 +1,227 @@
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import random
+import sys
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Optional
+
+import httpx
+
+DEFAULT_TRAFFIC = Path(__file__).parent / "traffic.jsonl"
+PLACEHOLDERS = {"product_id": "/products?limit=100", "category_id": "/categories?limit=100"}
+
+
+@dataclass
+class TrafficEntry:
+    method: str
+    path: str
+    route: str
+    headers: dict[str, str] = field(default_factory=dict)
+    body: Any = None
+    weight: int = 1
+
+
+@dataclass
+class RouteResult:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    def summary(self, elapsed: float) -> dict[str, float]:
+        latencies = sorted(self.latencies)
+        return {
+            "requests": len(latencies),
+            "errors": self.errors,
+            "throughput": len(latencies) / elapsed if elapsed else 0.0,
+            "mean_ms": sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p95_ms": percentile(latencies, 95) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+        }
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[max(math.ceil(q / 100 * len(ordered)) - 1, 0)]
+
+
+def load_traffic(path: Path) -> list[TrafficEntry]:
+    entries = []
+    with path.open(encoding="utf-8") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            method = record.get("method", "GET").upper()
+            entries.append(TrafficEntry(
+                method=method,
+                path=record["path"],
+                route=record.get("route") or f"{method} {record['path'].split('?')[0]}",
+                headers=record.get("headers", {}),
+                body=record.get("body"),
+                weight=record.get("weight", 1),
+            ))
+    return entries
+
+
+@asynccontextmanager
+async def open_client(url: Optional[str]) -> AsyncIterator[httpx.AsyncClient]:
+    if url is not None:
+        async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+            yield client
+        return
+
+    from main import setup
+
+    app = await setup()
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://replay", timeout=60) as client:
+            yield client
+
+
+async def resolve_placeholders(client: httpx.AsyncClient, entries: list[TrafficEntry]) -> dict[str, list[str]]:
+    values = {}
+    for name, listing in PLACEHOLDERS.items():
+        if any(f"{{{name}}}" in entry.path or f"{{{name}}}" in json.dumps(entry.body) for entry in entries):
+            response = await client.get(listing)
+            response.raise_for_status()
+            values[name] = [item["id"] for item in response.json()]
+            if not values[name]:
+                raise SystemExit(f"Traffic needs {{{name}}} but {listing} returned nothing; seed the database first")
+    return values
+
+
+def substitute(value: Any, rng: random.Random, values: dict[str, list[str]]) -> Any:
+    if isinstance(value, str):
+        for name, choices in values.items():
+            placeholder = f"{{{name}}}"
+            while placeholder in value:
+                value = value.replace(placeholder, rng.choice(choices), 1)
+        return value
+    if isinstance(value, dict):
+        return {key: substitute(item, rng, values) for key, item in value.items()}
+    if isinstance(value, list):
+        return [substitute(item, rng, values) for item in value]
+    return value
+
+
+async def replay(
+        client: httpx.AsyncClient, entries: list[TrafficEntry], requests: int, concurrency: int, seed: int,
+) -> tuple[dict[str, RouteResult], float]:
+    rng = random.Random(seed)
+    values = await resolve_placeholders(client, entries)
+    weighted = [entry for entry in entries for _ in range(entry.weight)]
+    schedule = iter(itertools.islice(itertools.cycle(weighted), requests))
+    results = {entry.route: RouteResult() for entry in entries}
+
+    async def worker() -> None:
+        for entry in schedule:
+            body = substitute(entry.body, rng, values)
+            started = time.perf_counter()
+            try:
+                response = await client.request(
+                    entry.method, substitute(entry.path, rng, values), headers=entry.headers,
+                    json=body,
+                )
+                failed = response.status_code >= 500
+            except httpx.HTTPError:
+                failed = True
+            results[entry.route].latencies.append(time.perf_counter() - started)
+            results[entry.route].errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return results, time.perf_counter() - started
+
+
+def build_report(results: dict[str, RouteResult], elapsed: float, args: argparse.Namespace) -> dict[str, Any]:
+    overall = RouteResult(
+        latencies=[latency for result in results.values() for latency in result.latencies],
+        errors=sum(result.errors for result in results.values()),
+    )
+    return {
+        "traffic": str(args.traffic),
+        "target": args.url or "in-process",
+        "concurrency": args.concurrency,
+        "elapsed_s": elapsed,
+        "total": overall.summary(elapsed),
+        "routes": {route: result.summary(elapsed) for route, result in results.items() if result.latencies},
+    }
+
+
+def compare(report: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    regressions = []
+    pairs = [("total", report["total"], baseline["total"])]
+    pairs += [
+        (route, summary, baseline["routes"][route])
+        for route, summary in report["routes"].items()
+        if route in baseline.get("routes", {})
+    ]
+    for name, current, previous in pairs:
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            if previous[metric] and current[metric] > previous[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{name}: {metric} {current[metric]:.2f} > baseline {previous[metric]:.2f} (+{tolerance:.0%})"
+                )
+        if previous["throughput"] and current["throughput"] < previous["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {current['throughput']:.1f} < baseline {previous['throughput']:.1f} "
+                f"(-{tolerance:.0%})"
+            )
+        if current["errors"] > previous["errors"]:
+            regressions.append(f"{name}: errors {current['errors']} > baseline {previous['errors']}")
+    return regressions
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print(f"{'route':<40} {'reqs':>7} {'err':>5} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for route, summary in [*report["routes"].items(), ("TOTAL", report["total"])]:
+        print(
+            f"{route:<40} {summary['requests']:>7} {summary['errors']:>5} {summary['throughput']:>9.1f} "
+            f"{summary['p50_ms']:>9.2f} {summary['p95_ms']:>9.2f} {summary['p99_ms']:>9.2f}"
+        )
+
+
+async def run(args: argparse.Namespace) -> int:
+    entries = load_traffic(args.traffic)
+    async with open_client(args.url) as client:
+        if args.warmup:
+            await replay(client, entries, args.warmup, args.concurrency, args.seed)
+        results, elapsed = await replay(client, entries, args.requests, args.concurrency, args.seed)
+
+    report = build_report(results, elapsed, args)
+    print_report(report)
+    args.output.write_text(json.dumps(report, indent=2))
+
+    if args.baseline is None:
+        return 0
+    if args.update_baseline or not args.baseline.exists():
+        args.baseline.write_text(json.dumps(report, indent=2))
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    regressions = compare(report, json.loads(args.baseline.read_text()), args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a JSONL traffic log against the API and report latencies")
+    parser.add_argument("traffic", type=Path, nargs="?", default=DEFAULT_TRAFFIC)
+    parser.add_argument("--url", help="base URL of a running server; defaults to the in-process app")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=Path("benchmark-results.json"))
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    sys.exit(asyncio.run(run(parser.parse_args())))
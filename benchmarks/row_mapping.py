@@ -0,0 +1,93 @@
+import argparse
+import asyncio
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from sqlalchemy import select
+
+from domain import Product as ProductModel
+from infrastructure.repositories.product import SqlAlchemyProductRepository
+from infrastructure.repositories.sqlalchemy.entities import Product
+from main import create_engine, create_session_maker
+
+
+def readers(repository: SqlAlchemyProductRepository, size: int) -> dict[str, Callable[[], Awaitable[list]]]:
+    # The same page read the way reads used to work (ORM entities, copied
+    # into domain objects) and the way they work now (Core rows straight into
+    # the slotted dataclasses).
+    async def orm() -> list[ProductModel]:
+        async with repository.session_maker() as session:
+            entities = (await session.scalars(repository._listing(select(Product)).limit(size))).all()
+            return [repository.entity_to_model(entity) for entity in entities]
+
+    async def core() -> list[ProductModel]:
+        async with repository.session_maker() as session:
+            rows = await session.execute(repository._listing(select(*repository.columns)).limit(size))
+            return [repository.model(*row) for row in rows]
+
+    return {"orm": orm, "core": core}
+
+
+async def measure(read: Callable[[], Awaitable[list]], iterations: int) -> dict[str, float]:
+    durations, rows = [], 0
+    for _ in range(iterations):
+        started = time.perf_counter()
+        rows = len(await read())
+        durations.append(time.perf_counter() - started)
+    # Peak memory is taken on a separate, untimed read: tracemalloc slows
+    # every allocation down.
+    gc.collect()
+    tracemalloc.start()
+    models = await read()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del models
+    return {
+        "rows": rows,
+        "p50_ms": statistics.median(durations) * 1000,
+        "us_per_row": statistics.median(durations) / rows * 1e6,
+        "peak_mb": peak / 2 ** 20,
+        "bytes_per_row": peak / rows,
+    }
+
+
+async def run(args: argparse.Namespace) -> int:
+    engine = create_engine()
+    repository = SqlAlchemyProductRepository(create_session_maker(engine), single_flight=False)
+    results = {}
+    try:
+        for size in args.sizes:
+            results[size] = {}
+            for name, read in readers(repository, size).items():
+                await read()
+                results[size][name] = await measure(read, args.iterations)
+    finally:
+        await engine.dispose()
+
+    print(f"{'rows':>8} {'path':>5} {'p50 ms':>9} {'us/row':>8} {'peak MB':>9} {'B/row':>7}")
+    for size, by_path in results.items():
+        for name, result in by_path.items():
+            print(
+                f"{result['rows']:>8} {name:>5} {result['p50_ms']:>9.1f} {result['us_per_row']:>8.2f} "
+                f"{result['peak_mb']:>9.1f} {result['bytes_per_row']:>7.0f}"
+            )
+    if args.output is not None:
+        args.output.write_text(json.dumps({str(size): by_path for size, by_path in results.items()}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare per-row cost and peak memory of ORM and Core row mapping for large pages; "
+                    "seed the database with benchmarks.seed first"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--output", type=Path)
+    sys.exit(asyncio.run(run(parser.parse_args())))
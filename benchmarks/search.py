@@ -0,0 +1,121 @@
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from sqlalchemy import select, func, and_, text
+
+from infrastructure.repositories.product import SqlAlchemyProductRepository
+from infrastructure.repositories.sqlalchemy.entities import Product
+from main import create_engine, create_session_maker
+
+# Words and SKU fragments that occur in benchmarks.seed data, plus a typo
+# only the trigram side of the search can match.
+QUERIES = ["phone", "wireless headphones", "acme kettle", "stainless steel", "ACM-00001", "hedphones"]
+
+
+def ilike_listing(query: str, limit: int):
+    # The scan search replaces: every word must occur somewhere in the product.
+    haystack = func.concat_ws(" ", Product.name, Product.sku, Product.description)
+    return (
+        select(Product.id)
+        .where(and_(*(haystack.ilike(f"%{word}%") for word in query.split())))
+        .order_by(Product.created_at.desc(), Product.id.desc())
+        .limit(limit)
+    )
+
+
+def fulltext_listing(query: str, limit: int, candidates: int):
+    # The tsvector half of search on its own, without trigram similarity:
+    # capped candidates, then ranked.
+    ts_query = func.websearch_to_tsquery("simple", query)
+    matches = select(Product.id).where(Product.search_vector.op("@@")(ts_query)).limit(candidates).subquery()
+    return (
+        select(Product.id)
+        .join(matches, matches.c.id == Product.id)
+        .order_by(func.ts_rank_cd(Product.search_vector, ts_query).desc(), Product.id.desc())
+        .limit(limit)
+    )
+
+
+async def time_call(call: Callable[[], Awaitable[int]], iterations: int) -> dict[str, float]:
+    latencies, hits = [], 0
+    for _ in range(iterations):
+        started = time.perf_counter()
+        hits = await call()
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return {
+        "hits": hits,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[max(int(len(latencies) * 0.95) - 1, 0)] * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+    }
+
+
+async def run(args: argparse.Namespace) -> int:
+    engine = create_engine()
+    session_maker = create_session_maker(engine)
+    repository = SqlAlchemyProductRepository(
+        session_maker, single_flight=False, search_candidates=args.candidates
+    )
+
+    async def listing(stm) -> int:
+        async with session_maker() as session:
+            return len((await session.execute(stm)).all())
+
+    methods = {
+        "search": lambda query: lambda: _hits(repository.search(query, args.limit)),
+        "fulltext": lambda query: lambda: listing(fulltext_listing(query, args.limit, args.candidates)),
+        "ilike": lambda query: lambda: listing(ilike_listing(query, args.limit)),
+    }
+    results = {}
+    try:
+        async with session_maker() as session:
+            rows = await session.scalar(text("SELECT reltuples::bigint FROM pg_class WHERE relname = 'products'"))
+        print(f"products: ~{rows:,} rows, {args.candidates} candidates per kind of match")
+        for query in args.queries:
+            results[query] = {}
+            for method in args.methods:
+                call = methods[method](query)
+                await time_call(call, args.warmup)
+                results[query][method] = await time_call(call, args.iterations)
+    finally:
+        await engine.dispose()
+
+    print(f"{'query':<22} " + " ".join(f"{method + ' p50':>13} {'hits':>5}" for method in args.methods))
+    for query, by_method in results.items():
+        print(f"{query:<22} " + " ".join(
+            f"{result['p50_ms']:>13.2f} {result['hits']:>5}" for result in by_method.values()
+        ))
+    if args.output is not None:
+        args.output.write_text(json.dumps({
+            "products": rows, "limit": args.limit, "candidates": args.candidates, "queries": results,
+        }, indent=2))
+    return 0
+
+
+async def _hits(page) -> int:
+    return len((await page).items)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare ranked tsvector/trigram search with an ILIKE scan; "
+                    "seed the database with benchmarks.seed (1M products by default) first"
+    )
+    parser.add_argument("--queries", nargs="+", default=QUERIES)
+    parser.add_argument("--methods", nargs="+", choices=["search", "fulltext", "ilike"],
+                        default=["search", "fulltext", "ilike"],
+                        help="search is the endpoint's query; fulltext is its tsvector half alone")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--candidates", type=int, default=1000,
+                        help="rows each kind of match hands over for ranking (repositories.search_candidates)")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--output", type=Path)
+    sys.exit(asyncio.run(run(parser.parse_args())))
@@ -0,0 +1,194 @@
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from bisect import bisect
+from datetime import datetime, timedelta
+from itertools import accumulate, islice
+from typing import Iterator
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from infrastructure.repositories.product.sqlalchemy import refresh_category_stats
+from infrastructure.repositories.sqlalchemy.entities import Product, Category, CategoryStats, ProductTombstone
+from main import create_engine
+
+EPOCH = datetime(2024, 1, 1)
+
+BRANDS = [
+    "Acme", "Nordia", "Voltek", "Lumen", "Kestrel", "Orbis", "Tundra", "Helix", "Marlow", "Quanta",
+    "Solace", "Vireo", "Zenith", "Arbor", "Cobalt", "Ferro", "Granite", "Juniper", "Onyx", "Pioneer",
+]
+ADJECTIVES = [
+    "compact", "wireless", "classic", "premium", "portable", "smart", "ergonomic", "rugged", "slim", "eco",
+    "professional", "mini", "ultra", "modular", "vintage", "digital", "silent", "heavy-duty", "foldable", "quick",
+]
+NOUNS = [
+    "phone", "headphones", "kettle", "backpack", "lamp", "chair", "keyboard", "blender", "drill", "jacket",
+    "monitor", "speaker", "watch", "camera", "tent", "mixer", "router", "mattress", "bicycle", "vacuum",
+    "printer", "tablet", "sneakers", "heater", "scanner", "grill", "charger", "projector", "toaster", "desk",
+]
+DEPARTMENTS = [
+    "Electronics", "Home", "Garden", "Sports", "Outdoors", "Kitchen", "Office", "Toys", "Fashion", "Tools",
+    "Automotive", "Health", "Beauty", "Books", "Music", "Pets", "Baby", "Travel", "Crafts", "Lighting",
+]
+FEATURES = [
+    "two-year warranty", "fast charging", "water resistant", "recycled materials", "dishwasher safe",
+    "tool-free assembly", "energy efficient", "adjustable height", "noise cancelling", "lightweight frame",
+    "stainless steel", "machine washable", "USB-C", "made to last", "compact storage",
+]
+
+PRODUCT_COLUMNS = ["id", "created_at", "updated_at", "sku", "name", "description", "price", "category_id"]
+CATEGORY_COLUMNS = ["id", "created_at", "updated_at", "name"]
+CATEGORY_TABLE_SIZE = 1 << 20
+PRICE_TABLE_SIZE = 1 << 16
+
+
+def new_uuid(rng: random.Random) -> str:
+    # Random version 4 UUID as a hex string, which asyncpg encodes directly and
+    # which is several times cheaper to build than a uuid.UUID.
+    bits = rng.getrandbits(128) & ~(0xF000 << 64) & ~(0xC000 << 48) | (0x4000 << 64) | (0x8000 << 48)
+    return f"{bits:032x}"
+
+
+def generate_categories(rng: random.Random, count: int, span: timedelta) -> list[tuple]:
+    step = span / max(count, 1)
+    categories = []
+    for n in range(count):
+        created_at = EPOCH + step * n
+        name = f"{rng.choice(DEPARTMENTS)} / {rng.choice(NOUNS).capitalize()}s {n + 1}"
+        categories.append((new_uuid(rng), created_at, created_at, name))
+    return categories
+
+
+def category_table(count: int, zipf: float) -> list[int]:
+    # Category popularity follows a Zipf-like law. The table maps a 20-bit
+    # random number to a category index, so picking one is a list lookup.
+    cum_weights = list(accumulate(1 / (rank + 1) ** zipf for rank in range(count)))
+    scale = cum_weights[-1] / CATEGORY_TABLE_SIZE
+    return [min(bisect(cum_weights, slot * scale), count - 1) for slot in range(CATEGORY_TABLE_SIZE)]
+
+
+def price_table(rng: random.Random) -> list[int]:
+    # Log-normal prices: mostly cheap products with a long expensive tail.
+    return [max(1, round(rng.lognormvariate(7.0, 1.1))) for _ in range(PRICE_TABLE_SIZE)]
+
+
+def generate_products(
+        rng: random.Random, categories: list[tuple], count: int, span: timedelta, zipf: float,
+) -> Iterator[tuple]:
+    category_slots = category_table(len(categories), zipf)
+    prices = price_table(rng)
+    brand_codes = [brand[:3].upper() for brand in BRANDS]
+    step = span / max(count, 1)
+    created_at = EPOCH
+    # Every categorical choice of a row is carved out of one random number.
+    for n in range(count):
+        bits = rng.getrandbits(96)
+        category_index = category_slots[bits & (CATEGORY_TABLE_SIZE - 1)]
+        bits >>= 20
+        price = prices[bits & (PRICE_TABLE_SIZE - 1)]
+        bits >>= 16
+        bits, brand = divmod(bits, len(BRANDS))
+        bits, adjective = divmod(bits, len(ADJECTIVES))
+        bits, noun = divmod(bits, len(NOUNS))
+        bits, first_feature = divmod(bits, len(FEATURES))
+        bits, second_feature = divmod(bits, len(FEATURES))
+        model = 100 + bits % 9900
+        yield (
+            new_uuid(rng),
+            created_at,
+            created_at,
+            f"{brand_codes[brand]}-{category_index:05d}-{n:08d}",
+            f"{BRANDS[brand]} {ADJECTIVES[adjective]} {NOUNS[noun]} {model}",
+            f"{ADJECTIVES[adjective].capitalize()} {NOUNS[noun]} by {BRANDS[brand]}: "
+            f"{FEATURES[first_feature]}, {FEATURES[second_feature]}.",
+            price,
+            categories[category_index][0],
+        )
+        created_at += step
+
+
+async def copy_rows(connection: AsyncConnection, table, columns: list[str], rows: list[tuple]) -> None:
+    raw = await connection.get_raw_connection()
+    driver_connection = raw.driver_connection
+    if hasattr(driver_connection, "copy_records_to_table"):
+        await driver_connection.copy_records_to_table(table.name, records=rows, columns=columns)
+    else:
+        await connection.execute(insert(table), [
+            {column: uuid.UUID(value) if column.endswith("id") else value for column, value in zip(columns, row)}
+            for row in rows
+        ])
+
+
+async def run(args: argparse.Namespace) -> None:
+    rng = random.Random(args.seed)
+    span = timedelta(days=args.days)
+    engine = create_engine()
+    products_table = Product.__table__
+    deferred_indexes = list(products_table.indexes) if args.defer_indexes else []
+    started = time.perf_counter()
+
+    async with engine.connect() as connection:
+        if args.truncate:
+            await connection.execute(text(
+                f"TRUNCATE {products_table.name}, {ProductTombstone.__table__.name}, "
+                f"{CategoryStats.__table__.name}, {Category.__table__.name}"
+            ))
+            await connection.commit()
+        for index in deferred_indexes:
+            await connection.run_sync(lambda sync_connection: index.drop(sync_connection, checkfirst=True))
+        await connection.commit()
+
+        categories = generate_categories(rng, args.categories, span)
+        await copy_rows(connection, Category.__table__, CATEGORY_COLUMNS, categories)
+        await connection.commit()
+        print(f"categories: {len(categories)} rows in {time.perf_counter() - started:.1f}s")
+
+        # The next batch is generated in a worker thread while the current one
+        # is being copied, so row generation overlaps with the server's work.
+        products = generate_products(rng, categories, args.products, span, args.zipf)
+        take_batch = lambda: list(islice(products, args.batch_size))  # noqa: E731
+        next_batch = asyncio.create_task(asyncio.to_thread(take_batch))
+        loaded, load_started = 0, time.perf_counter()
+        while batch := await next_batch:
+            next_batch = asyncio.create_task(asyncio.to_thread(take_batch))
+            await copy_rows(connection, products_table, PRODUCT_COLUMNS, batch)
+            await connection.commit()
+            loaded += len(batch)
+            elapsed = time.perf_counter() - load_started
+            print(f"products: {loaded}/{args.products} rows, {loaded / elapsed:,.0f} rows/s")
+
+        index_started = time.perf_counter()
+        for index in deferred_indexes:
+            await connection.run_sync(lambda sync_connection: index.create(sync_connection, checkfirst=True))
+        await connection.commit()
+        if deferred_indexes:
+            print(f"indexes: rebuilt {len(deferred_indexes)} in {time.perf_counter() - index_started:.1f}s")
+
+        # COPY bypasses the repository, so the per-category stats are rebuilt
+        # from the loaded rows in one pass.
+        await connection.execute(refresh_category_stats())
+        await connection.execute(text(
+            f"ANALYZE {products_table.name}, {CategoryStats.__table__.name}, {Category.__table__.name}"
+        ))
+        await connection.commit()
+
+    await engine.dispose()
+    print(f"done: {args.categories} categories, {args.products} products in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load a deterministic synthetic catalog into the database")
+    parser.add_argument("--products", type=int, default=1_000_000)
+    parser.add_argument("--categories", type=int, default=1_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--days", type=int, default=365, help="spread created_at over this many days")
+    parser.add_argument("--zipf", type=float, default=1.1, help="skew of products across categories")
+    parser.add_argument("--batch-size", type=int, default=100_000)
+    parser.add_argument("--truncate", action="store_true", help="empty products, categories and their stats first")
+    parser.add_argument("--defer-indexes", action="store_true",
+                        help="drop product indexes during the load and rebuild them afterwards")
+    asyncio.run(run(parser.parse_args()))
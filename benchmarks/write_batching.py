@@ -0,0 +1,89 @@
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+from sqlalchemy import delete
+
+from abstractions.repositories.category import CreateCategoryDTO
+from abstractions.repositories.product import CreateProductDTO
+from infrastructure.repositories.category import SqlAlchemyCategoryRepository
+from infrastructure.repositories.product import SqlAlchemyProductRepository
+from infrastructure.repositories.sqlalchemy.entities import Product
+from main import create_engine, create_session_maker
+
+
+async def burst(repository: SqlAlchemyProductRepository, category_id: uuid.UUID, requests: int, concurrency: int):
+    latencies = []
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        for n in counter:
+            dto = CreateProductDTO(
+                sku=f"batch-{uuid.uuid4().hex[:12]}", name=f"Batch product {n}", description="write batching",
+                price=100 + n % 900, category_id=category_id,
+            )
+            started = time.perf_counter()
+            await repository.create(dto)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": requests,
+        "throughput": requests / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+    }
+
+
+async def run(args: argparse.Namespace) -> int:
+    engine = create_engine()
+    session_maker = create_session_maker(engine)
+    categories = SqlAlchemyCategoryRepository(session_maker)
+    category = await categories.create(CreateCategoryDTO(name=f"write batching benchmark {uuid.uuid4().hex[:8]}"))
+    results = {}
+    try:
+        for window_ms in args.windows:
+            repository = SqlAlchemyProductRepository(
+                session_maker, write_batch_window=window_ms / 1000, write_batch_size=args.batch_size,
+            )
+            await burst(repository, category.id, args.warmup, args.concurrency)
+            results[window_ms] = await burst(repository, category.id, args.requests, args.concurrency)
+    finally:
+        async with session_maker() as session, session.begin():
+            await session.execute(delete(Product).where(Product.category_id == category.id))
+        await categories.delete(category.id)
+        await engine.dispose()
+
+    print(f"{'window ms':>10} {'creates/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    for window_ms, result in results.items():
+        label = "off" if window_ms == 0 else f"{window_ms:g}"
+        print(f"{label:>10} {result['throughput']:>10.0f} {result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f}")
+    if args.output is not None:
+        args.output.write_text(json.dumps({
+            "concurrency": args.concurrency,
+            "batch_size": args.batch_size,
+            "windows": {str(window_ms): result for window_ms, result in results.items()},
+        }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare create throughput and latency with group-commit write batching at several windows"
+    )
+    parser.add_argument("--windows", type=float, nargs="+", default=[0, 1, 2, 5], help="batch windows in ms; 0 is off")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--output", type=Path)
+    sys.exit(asyncio.run(run(parser.parse_args())))
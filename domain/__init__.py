@@ -1,16 +1,17 @@
 import uuid
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Base:
     id: uuid.UUID
     created_at: datetime
     updated_at: datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class Product(Base):
     sku: str
     name: str
@@ -19,6 +20,38 @@ class Product(Base):
     category_id: uuid.UUID
 
 
-@dataclass
+@dataclass(slots=True)
 class Category(Base):
     name: str
+
+
+@dataclass(slots=True)
+class ProductWithCategory(Product):
+    category: Optional[Category]
+
+
+@dataclass(slots=True)
+class CategoryStats:
+    category_id: uuid.UUID
+    product_count: int
+    min_price: Optional[int]
+    max_price: Optional[int]
+    avg_price: Optional[float]
+
+    @classmethod
+    def from_totals(
+            cls, category_id: uuid.UUID, product_count: int, price_sum: int, min_price: Optional[int],
+            max_price: Optional[int],
+    ) -> "CategoryStats":
+        return cls(
+            category_id=category_id,
+            product_count=product_count,
+            min_price=min_price,
+            max_price=max_price,
+            avg_price=price_sum / product_count if product_count else None,
+        )
+
+
+@dataclass(slots=True)
+class CategoryWithStats(Category):
+    stats: CategoryStats
@@ -0,0 +1,40 @@
+import argparse
+import asyncio
+import dataclasses
+import json
+from pathlib import Path
+from typing import AsyncIterator
+
+from infrastructure.handlers.fastapi.formats import decode
+from main import create_engines, create_sqlalchemy_repositories, wrap_repositories
+from usecases import ProductImportUseCase
+
+
+async def read_chunks(path: Path, chunk_size: int = 1 << 16) -> AsyncIterator[bytes]:
+    with path.open("rb") as file:
+        while chunk := file.read(chunk_size):
+            yield chunk
+
+
+async def run(path: Path, file_format: str, batch_size: int) -> None:
+    engines = create_engines()
+    products_repo, categories_repo = wrap_repositories(*create_sqlalchemy_repositories(engines))
+    use_case = ProductImportUseCase(products_repo, categories_repo, batch_size=batch_size)
+    summary = await use_case.run(decode(read_chunks(path), file_format))
+    for engine in engines.values():
+        await engine.dispose()
+    print(json.dumps(dataclasses.asdict(summary), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import products from a CSV or NDJSON file")
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--format", choices=["csv", "ndjson"], dest="file_format")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    asyncio.run(run(
+        args.path,
+        args.file_format or ("csv" if args.path.suffix.lower() == ".csv" else "ndjson"),
+        args.batch_size,
+    ))
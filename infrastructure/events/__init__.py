@@ -0,0 +1,2 @@
+from .hub import EventHub, EventHubStats, Subscription, SubscriptionDroppedException
+from .postgres import PostgresListener
@@ -0,0 +1,69 @@
+import asyncio
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Optional, Iterator
+
+
+class SubscriptionDroppedException(Exception):
+    pass
+
+
+@dataclass
+class EventHubStats:
+    subscribers: int = 0
+    published: int = 0
+    delivered: int = 0
+    dropped: int = 0
+
+
+class Subscription[Event]:
+    def __init__(self, predicate: Optional[Callable[[Event], bool]], queue_size: int):
+        self.predicate = predicate
+        self.queue: asyncio.Queue[Event] = asyncio.Queue(queue_size)
+        self.dropped = False
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Event]:
+        # None when nothing arrived within ``timeout``.
+        if self.dropped:
+            raise SubscriptionDroppedException("Subscriber fell too far behind")
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except TimeoutError:
+            return None
+
+
+class EventHub[Event]:
+    # Fans events from one source out to any number of subscribers. Each has
+    # a bounded queue; a subscriber whose queue is full when an event arrives
+    # is dropped rather than letting its backlog grow or stall the others.
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subscriptions: set[Subscription[Event]] = set()
+        self._stats = EventHubStats()
+
+    @property
+    def stats(self) -> EventHubStats:
+        self._stats.subscribers = len(self._subscriptions)
+        return self._stats
+
+    @contextmanager
+    def subscribe(self, predicate: Optional[Callable[[Event], bool]] = None) -> Iterator[Subscription[Event]]:
+        subscription = Subscription(predicate, self.queue_size)
+        self._subscriptions.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._subscriptions.discard(subscription)
+
+    def publish(self, event: Event) -> None:
+        self._stats.published += 1
+        for subscription in list(self._subscriptions):
+            if subscription.predicate is not None and not subscription.predicate(event):
+                continue
+            try:
+                subscription.queue.put_nowait(event)
+                self._stats.delivered += 1
+            except asyncio.QueueFull:
+                subscription.dropped = True
+                self._subscriptions.discard(subscription)
+                self._stats.dropped += 1
@@ -0,0 +1,78 @@
+import asyncio
+import logging
+from typing import Callable, Optional
+
+import asyncpg
+
+from infrastructure.events.hub import EventHub
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresListener[Event]:
+    # Holds one dedicated connection LISTENing on ``channel`` and publishes
+    # every notification to the hub, so a process needs a single connection
+    # however many clients are subscribed. Notifications sent while the
+    # connection is down are lost; the reconnect is logged.
+    def __init__(
+            self,
+            dsn: str,
+            channel: str,
+            decode: Callable[[str], Event],
+            hub: EventHub[Event],
+            retry_delay: float = 1.0,
+            max_retry_delay: float = 30.0,
+    ):
+        self.dsn = dsn
+        self.channel = channel
+        self.decode = decode
+        self.hub = hub
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        delay = self.retry_delay
+        while True:
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                try:
+                    lost = asyncio.Event()
+                    connection.add_termination_listener(lambda _: lost.set())
+                    await connection.add_listener(self.channel, self._receive)
+                    delay = self.retry_delay
+                    await lost.wait()
+                    logger.error(f"Lost the connection listening on {self.channel}, reconnecting")
+                finally:
+                    await connection.close()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Anything short of cancellation is retried, backing off while
+                # the database stays unreachable, so events never stop for good.
+                logger.error(f"Cannot listen on {self.channel}, retrying in {delay:.1f}s: {e!r}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+                continue
+            await asyncio.sleep(self.retry_delay)
+
+    def _receive(self, connection: asyncpg.Connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            event = self.decode(payload)
+        except (TypeError, ValueError, KeyError) as e:
+            logger.error(f"Cannot decode notification on {channel}: {e}")
+            return
+        self.hub.publish(event)
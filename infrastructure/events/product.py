@@ -0,0 +1,54 @@
+import dataclasses
+import json
+import uuid
+from datetime import datetime
+
+from abstractions.repositories.product import ProductEvent
+from domain import Product
+
+PRODUCT_EVENTS_CHANNEL = "product_events"
+# NOTIFY payloads must stay under 8000 bytes.
+MAX_PAYLOAD_SIZE = 7999
+
+
+def encode_product_event(event: ProductEvent) -> str:
+    payload = json.dumps(_fields(event), separators=(",", ":"))
+    if event.item is not None and len(payload.encode()) > MAX_PAYLOAD_SIZE:
+        payload = json.dumps(_fields(dataclasses.replace(event, item=None)), separators=(",", ":"))
+    return payload
+
+
+def decode_product_event(payload: str) -> ProductEvent:
+    values = json.loads(payload)
+    item = values["item"]
+    previous_category_id = values.get("previous_category_id")
+    return ProductEvent(
+        op=values["op"],
+        id=uuid.UUID(values["id"]),
+        category_id=uuid.UUID(values["category_id"]),
+        item=None if item is None else Product(
+            id=uuid.UUID(item["id"]),
+            sku=item["sku"],
+            name=item["name"],
+            price=item["price"],
+            description=item["description"],
+            category_id=uuid.UUID(item["category_id"]),
+            created_at=datetime.fromisoformat(item["created_at"]),
+            updated_at=datetime.fromisoformat(item["updated_at"]),
+        ),
+        previous_category_id=None if previous_category_id is None else uuid.UUID(previous_category_id),
+    )
+
+
+def _fields(event: ProductEvent) -> dict:
+    item = None
+    if event.item is not None:
+        item = {
+            name: value if isinstance(value, (int, float, str)) else str(value)
+            for name, value in dataclasses.asdict(event.item).items()
+        }
+    previous_category_id = None if event.previous_category_id is None else str(event.previous_category_id)
+    return {
+        "op": event.op, "id": str(event.id), "category_id": str(event.category_id), "item": item,
+        "previous_category_id": previous_category_id,
+    }
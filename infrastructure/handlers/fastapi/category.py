@@ -1,16 +1,26 @@
+import dataclasses
 import logging
 import traceback
 import uuid
+from datetime import datetime
+from typing import Optional
 
-from fastapi import APIRouter, Depends
-from fastapi.params import Param
+from fastapi import APIRouter, Depends, Path, Header, Response
 from pydantic import BaseModel
 from starlette.exceptions import HTTPException
 
-from abstractions.repositories.abstract import NotFoundException
+from abstractions.repositories.abstract import (
+    NotFoundException, InvalidCursorException, Page, AlreadyExistsException, PreconditionFailedException
+)
 from abstractions.repositories.category import UpdateCategoryDTO, CreateCategoryDTO
 from abstractions.usecases import CategoryUseCaseInterface
-from domain import Category
+from domain import Category, CategoryStats, CategoryWithStats
+from infrastructure.handlers.fastapi.conditional import (
+    make_etag, parse_etag, make_list_etag, validator_headers, is_not_modified
+)
+from infrastructure.handlers.fastapi.counting import CountMode, total_count_headers
+from infrastructure.handlers.fastapi.fields import parse_fields, with_version, partial_response
+from infrastructure.handlers.fastapi.ids import parse_ids, in_order
 
 logger = logging.getLogger(__name__)
 
@@ -23,9 +33,14 @@ class HandlerUpdateCategoryDTO(BaseModel):
     name: str
 
 
+class HandlerPatchCategoryDTO(BaseModel):
+    name: Optional[str] = None
+
+
 class FastApiCategoryHandler:
-    def __init__(self, use_case: CategoryUseCaseInterface):
+    def __init__(self, use_case: CategoryUseCaseInterface, cache_control: Optional[dict[str, str]] = None):
         self.use_case = use_case
+        self.cache_control = cache_control or {}
         self.router = APIRouter(
             tags=["Category"]
         )
@@ -34,17 +49,65 @@ class FastApiCategoryHandler:
     def register(self):
         self.router.get("")(self.get_all)
         self.router.get("/{id}")(self.get)
+        self.router.get("/{id}/stats")(self.get_stats)
         self.router.post("")(self.create)
         self.router.put("/{id}")(self.update)
+        self.router.patch("/{id}")(self.patch)
         self.router.delete("/{id}")(self.delete)
 
     async def get_all(
             self,
+            response: Response,
             offset: int = 0,
             limit: int = 100,
-    ) -> list[Category]:
+            cursor: str = None,
+            ids: str = None,
+            count: CountMode = "none",
+            with_stats: bool = False,
+            fields: str = None,
+            if_none_match: Optional[str] = Header(None),
+            if_modified_since: Optional[str] = Header(None),
+    ) -> list[CategoryWithStats] | Page[CategoryWithStats] | list[Category] | Page[Category]:
+        obj_ids = parse_ids(ids) if ids is not None else None
+        selected = parse_fields(fields, Category) if fields is not None else None
+        if selected is not None and (cursor is not None or with_stats):
+            raise HTTPException(status_code=400, detail="fields cannot be combined with cursor or with_stats")
         try:
-            return await self.use_case.get_all(offset=offset, limit=limit)
+            if obj_ids is not None:
+                items = in_order(await self.use_case.get_many(obj_ids), obj_ids)
+                if with_stats:
+                    return await self._with_stats(items)
+                headers = self._list_validators([(item.id, item.updated_at) for item in items])
+                if selected is not None:
+                    return partial_response([dataclasses.asdict(item) for item in items], selected, headers)
+                response.headers.update(headers)
+                return items
+            # Stats move with product writes, which the list validators do not
+            # cover, so listings with stats are never answered with a 304.
+            if not with_stats and (if_none_match is not None or if_modified_since is not None):
+                versions = await self.use_case.get_versions(limit=limit, offset=offset, cursor=cursor)
+                headers = self._list_validators(versions)
+                if is_not_modified(headers["ETag"], max((v for _, v in versions), default=None),
+                                   if_none_match, if_modified_since):
+                    return Response(status_code=304, headers=headers)
+            if selected is not None:
+                rows = await self.use_case.get_all_partial(with_version(selected), offset=offset, limit=limit)
+                headers = await total_count_headers(self.use_case.count, count)
+                headers.update(self._list_validators([(row["id"], row["updated_at"]) for row in rows]))
+                return partial_response(rows, selected, headers)
+            if cursor is not None:
+                result = await self.use_case.get_page(limit=limit, cursor=cursor)
+                items = result.items
+            else:
+                result = items = await self.use_case.get_all(offset=offset, limit=limit)
+            response.headers.update(await total_count_headers(self.use_case.count, count))
+            if with_stats:
+                return await self._with_stats(result)
+            response.headers.update(self._list_validators([(item.id, item.updated_at) for item in items]))
+            return result
+        except InvalidCursorException as e:
+            logger.error(f"Invalid cursor: {e}")
+            raise HTTPException(status_code=400, detail=str(e))
         except NotFoundException as e:
             logger.error(f"Product not found: {e}")
             raise HTTPException(status_code=404, detail=str(e))
@@ -54,15 +117,35 @@ class FastApiCategoryHandler:
 
     async def get(
             self,
-            obj_id: str = Param(alias="id"),
+            response: Response,
+            obj_id: str = Path(alias="id"),
+            fields: str = None,
+            if_none_match: Optional[str] = Header(None),
+            if_modified_since: Optional[str] = Header(None),
     ) -> Category:
         try:
             uuid_id = uuid.UUID(obj_id)
         except ValueError as e:
             logger.error(f"Invalid UUID: {e}")
             raise HTTPException(status_code=400, detail="Invalid UUID")
+        selected = parse_fields(fields, Category) if fields is not None else None
         try:
-            return await self.use_case.get(uuid_id)
+            if if_none_match is not None or if_modified_since is not None:
+                updated_at = await self.use_case.get_version(uuid_id)
+                headers = validator_headers(make_etag(updated_at), updated_at, self.cache_control.get("get"))
+                if is_not_modified(headers["ETag"], updated_at, if_none_match, if_modified_since):
+                    return Response(status_code=304, headers=headers)
+            if selected is not None:
+                row = await self.use_case.get_partial(uuid_id, with_version(selected))
+                headers = validator_headers(
+                    make_etag(row["updated_at"]), row["updated_at"], self.cache_control.get("get")
+                )
+                return partial_response(row, selected, headers)
+            category = await self.use_case.get(uuid_id)
+            response.headers.update(
+                validator_headers(make_etag(category.updated_at), category.updated_at, self.cache_control.get("get"))
+            )
+            return category
         except NotFoundException as e:
             logger.error(f"Product not found: {e}")
             raise HTTPException(status_code=404, detail=str(e))
@@ -70,6 +153,47 @@ class FastApiCategoryHandler:
             logger.error(f"Internal error: {e}\n", traceback.format_exc())
             raise HTTPException(status_code=500, detail=str(e))
 
+    async def get_stats(
+            self,
+            obj_id: str = Path(alias="id"),
+    ) -> CategoryStats:
+        try:
+            uuid_id = uuid.UUID(obj_id)
+        except ValueError as e:
+            logger.error(f"Invalid UUID: {e}")
+            raise HTTPException(status_code=400, detail="Invalid UUID")
+        try:
+            return await self.use_case.get_stats(uuid_id)
+        except NotFoundException as e:
+            logger.error(f"Category not found: {e}")
+            raise HTTPException(status_code=404, detail=str(e))
+        except Exception as e:
+            logger.error(f"Internal error: {e}\n", traceback.format_exc())
+            raise HTTPException(status_code=500, detail=str(e))
+
+    async def _with_stats(
+            self, result: list[Category] | Page[Category]
+    ) -> list[CategoryWithStats] | Page[CategoryWithStats]:
+        items = result.items if isinstance(result, Page) else result
+        stats = {item.category_id: item for item in await self.use_case.get_many_stats([item.id for item in items])}
+        with_stats = [
+            CategoryWithStats(
+                id=item.id, created_at=item.created_at, updated_at=item.updated_at, name=item.name,
+                stats=stats.get(item.id) or CategoryStats.from_totals(item.id, 0, 0, None, None),
+            )
+            for item in items
+        ]
+        if isinstance(result, Page):
+            return Page(items=with_stats, next_cursor=result.next_cursor)
+        return with_stats
+
+    def _list_validators(self, versions: list[tuple[uuid.UUID, datetime]]) -> dict[str, str]:
+        return validator_headers(
+            make_list_etag(versions),
+            max((updated_at for _, updated_at in versions), default=None),
+            self.cache_control.get("get_all"),
+        )
+
     async def create(
             self,
             dto: HandlerCreateCategoryDTO,
@@ -83,7 +207,7 @@ class FastApiCategoryHandler:
     async def update(
             self,
             dto: HandlerUpdateCategoryDTO,
-            obj_id: str = Param(alias="id"),
+            obj_id: str = Path(alias="id"),
     ) -> None:
         try:
             uuid_id = uuid.UUID(obj_id)
@@ -95,13 +219,52 @@ class FastApiCategoryHandler:
         except NotFoundException as e:
             logger.error(f"Product not found: {e}")
             raise HTTPException(status_code=404, detail=str(e))
+        except AlreadyExistsException as e:
+            logger.error(f"Conflict: {e}")
+            raise HTTPException(status_code=409, detail=str(e))
+        except Exception as e:
+            logger.error(f"Internal error: {e}\n", traceback.format_exc())
+            raise HTTPException(status_code=500, detail=str(e))
+
+    async def patch(
+            self,
+            dto: HandlerPatchCategoryDTO,
+            response: Response,
+            obj_id: str = Path(alias="id"),
+            if_match: Optional[str] = Header(None),
+    ) -> Category:
+        try:
+            uuid_id = uuid.UUID(obj_id)
+        except ValueError as e:
+            logger.error(f"Invalid UUID: {e}")
+            raise HTTPException(status_code=400, detail="Invalid UUID")
+        expected_updated_at = None
+        if if_match is not None and if_match.strip() != "*":
+            expected_updated_at = parse_etag(if_match)
+            if expected_updated_at is None:
+                raise HTTPException(status_code=412, detail="If-Match must be a single strong ETag")
+        try:
+            category = await self.use_case.patch(
+                uuid_id, dto.model_dump(exclude_unset=True, exclude_none=True), expected_updated_at
+            )
+        except NotFoundException as e:
+            logger.error(f"Product not found: {e}")
+            raise HTTPException(status_code=404, detail=str(e))
+        except PreconditionFailedException as e:
+            logger.error(f"Precondition failed: {e}")
+            raise HTTPException(status_code=412, detail=str(e))
+        except AlreadyExistsException as e:
+            logger.error(f"Conflict: {e}")
+            raise HTTPException(status_code=409, detail=str(e))
         except Exception as e:
             logger.error(f"Internal error: {e}\n", traceback.format_exc())
             raise HTTPException(status_code=500, detail=str(e))
+        response.headers["ETag"] = make_etag(category.updated_at)
+        return category
 
     async def delete(
             self,
-            obj_id: str = Param(alias="id"),
+            obj_id: str = Path(alias="id"),
     ) -> None:
         try:
             uuid_id = uuid.UUID(obj_id)
@@ -0,0 +1,90 @@
+import io
+import sys
+from array import array
+from typing import Optional
+
+from abstractions.repositories.product import ProductColumns
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+except ImportError:
+    pyarrow = None
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+
+
+def negotiate(accept: Optional[str]) -> Optional[str]:
+    if not accept:
+        return None
+    for media_range in accept.split(","):
+        media_type = media_range.split(";")[0].strip().lower()
+        if media_type in (ARROW_MEDIA_TYPE, MSGPACK_MEDIA_TYPE):
+            return media_type
+    return None
+
+
+def is_available(media_type: str) -> bool:
+    if media_type == ARROW_MEDIA_TYPE:
+        return pyarrow is not None
+    return msgpack is not None
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def encode_msgpack(columns: ProductColumns) -> bytes:
+    # Fixed-width columns are raw little-endian buffers: 16-byte UUIDs and
+    # int64 prices/timestamps (microseconds since the epoch).
+    return msgpack.packb({
+        "length": len(columns),
+        "id": columns.ids,
+        "created_at": _little_endian(columns.created_at),
+        "updated_at": _little_endian(columns.updated_at),
+        "sku": columns.sku,
+        "name": columns.name,
+        "description": columns.description,
+        "price": _little_endian(columns.price),
+        "category_id": columns.category_ids,
+    })
+
+
+def encode_arrow(columns: ProductColumns) -> bytes:
+    length = len(columns)
+
+    def fixed(data_type, buffer: bytes):
+        return pyarrow.Array.from_buffers(data_type, length, [None, pyarrow.py_buffer(buffer)])
+
+    batch = pyarrow.RecordBatch.from_arrays(
+        [
+            fixed(pyarrow.binary(16), columns.ids),
+            fixed(pyarrow.timestamp("us"), _little_endian(columns.created_at)),
+            fixed(pyarrow.timestamp("us"), _little_endian(columns.updated_at)),
+            pyarrow.array(columns.sku, pyarrow.string()),
+            pyarrow.array(columns.name, pyarrow.string()),
+            pyarrow.array(columns.description, pyarrow.string()),
+            fixed(pyarrow.int64(), _little_endian(columns.price)),
+            fixed(pyarrow.binary(16), columns.category_ids),
+        ],
+        names=["id", "created_at", "updated_at", "sku", "name", "description", "price", "category_id"],
+    )
+    sink = io.BytesIO()
+    with pyarrow.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue()
+
+
+def encode_columns(columns: ProductColumns, media_type: str) -> bytes:
+    if media_type == ARROW_MEDIA_TYPE:
+        return encode_arrow(columns)
+    return encode_msgpack(columns)
@@ -0,0 +1,59 @@
+import hashlib
+import uuid
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional, Iterable
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def make_etag(updated_at: datetime) -> str:
+    return f'"{(updated_at - _EPOCH) // timedelta(microseconds=1):x}"'
+
+
+def make_list_etag(versions: Iterable[tuple[uuid.UUID, datetime]]) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for obj_id, updated_at in versions:
+        digest.update(obj_id.bytes)
+        digest.update(((updated_at - _EPOCH) // timedelta(microseconds=1)).to_bytes(8, "big", signed=True))
+    return f'"{digest.hexdigest()}"'
+
+
+def parse_etag(etag: str) -> Optional[datetime]:
+    etag = etag.strip()
+    if len(etag) < 3 or not (etag.startswith('"') and etag.endswith('"')):
+        return None
+    try:
+        return _EPOCH + timedelta(microseconds=int(etag[1:-1], 16))
+    except (ValueError, OverflowError):
+        return None
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime], cache_control: Optional[str]) -> dict[str, str]:
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.replace(tzinfo=timezone.utc), usegmt=True)
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return headers
+
+
+def is_not_modified(
+        etag: str,
+        last_modified: Optional[datetime],
+        if_none_match: Optional[str],
+        if_modified_since: Optional[str],
+) -> bool:
+    # If-None-Match wins over If-Modified-Since and uses the weak comparison.
+    if if_none_match is not None:
+        candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in candidates or etag in candidates
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
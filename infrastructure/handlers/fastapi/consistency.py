@@ -0,0 +1,20 @@
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import Response
+
+from infrastructure.repositories.consistency import (
+    CONSISTENCY_TOKEN_HEADER, Consistency, current_consistency, encode_token, decode_token
+)
+
+
+class ConsistencyTokenMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        consistency = Consistency(token=decode_token(request.headers.get(CONSISTENCY_TOKEN_HEADER)))
+        reset_token = current_consistency.set(consistency)
+        try:
+            response = await call_next(request)
+        finally:
+            current_consistency.reset(reset_token)
+        if consistency.written_at is not None:
+            response.headers[CONSISTENCY_TOKEN_HEADER] = encode_token(consistency.written_at)
+        return response
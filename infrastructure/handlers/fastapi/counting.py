@@ -0,0 +1,15 @@
+from typing import Literal, Callable, Awaitable
+
+# How a listing reports its total: "exact" runs a COUNT (briefly cached per
+# filter), "estimated" asks the planner statistics, "none" skips the total.
+CountMode = Literal["exact", "estimated", "none"]
+
+TOTAL_COUNT_HEADER = "X-Total-Count"
+TOTAL_COUNT_MODE_HEADER = "X-Total-Count-Mode"
+
+
+async def total_count_headers(count: Callable[..., Awaitable[int]], mode: CountMode, **filters) -> dict[str, str]:
+    if mode == "none":
+        return {}
+    total = await count(estimated=mode == "estimated", **filters)
+    return {TOTAL_COUNT_HEADER: str(total), TOTAL_COUNT_MODE_HEADER: mode}
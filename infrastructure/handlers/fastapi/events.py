@@ -0,0 +1,34 @@
+import json
+from typing import AsyncIterator, Any, Callable, Optional
+
+from fastapi.encoders import jsonable_encoder
+
+from infrastructure.events import EventHub, SubscriptionDroppedException
+
+EVENT_STREAM_HEADERS = {
+    "Cache-Control": "no-cache",
+    # Keeps reverse proxies from buffering the stream.
+    "X-Accel-Buffering": "no",
+}
+
+
+def format_event(name: str, data: Any) -> str:
+    return f"event: {name}\ndata: {json.dumps(jsonable_encoder(data), separators=(',', ':'))}\n\n"
+
+
+async def encode_events(
+        hub: EventHub, predicate: Optional[Callable[[Any], bool]], heartbeat: float
+) -> AsyncIterator[str]:
+    # Server-sent events named after each event's op. A comment goes out
+    # after ``heartbeat`` seconds of silence so idle connections stay open and
+    # dead ones get noticed; a subscriber that fell too far behind gets a
+    # final ``dropped`` event and is expected to resync and reconnect.
+    with hub.subscribe(predicate) as subscription:
+        yield ": connected\n\n"
+        while True:
+            try:
+                event = await subscription.get(heartbeat)
+            except SubscriptionDroppedException as e:
+                yield format_event("dropped", {"detail": str(e)})
+                return
+            yield ": keep-alive\n\n" if event is None else format_event(event.op, event)
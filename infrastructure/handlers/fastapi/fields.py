@@ -0,0 +1,39 @@
+import dataclasses
+from typing import Any, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from starlette.exceptions import HTTPException
+
+_rows = TypeAdapter(list[dict[str, Any]] | dict[str, Any])
+
+
+def parse_fields(fields: str, model: type) -> list[str]:
+    # ``?fields=sku,name``: every name must be a field of the model. ``id`` is
+    # always included so partial items stay addressable.
+    allowed = [field.name for field in dataclasses.fields(model)]
+    selected = list(dict.fromkeys(["id", *(name.strip() for name in fields.split(",") if name.strip())]))
+    unknown = [name for name in selected if name not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields {', '.join(unknown)}; available fields are {', '.join(allowed)}",
+        )
+    return selected
+
+
+def with_version(fields: list[str]) -> list[str]:
+    # Validators are built from updated_at, so it is read even when not asked for.
+    return fields if "updated_at" in fields else [*fields, "updated_at"]
+
+
+def partial_response(
+        content: list[dict[str, Any]] | dict[str, Any], fields: list[str], headers: Optional[dict[str, str]] = None
+) -> Response:
+    # Serialized directly rather than through the route's response model,
+    # which requires every field.
+    if isinstance(content, dict):
+        content = {name: content[name] for name in fields}
+    else:
+        content = [{name: row[name] for name in fields} for row in content]
+    return Response(_rows.dump_json(content), media_type="application/json", headers=headers)
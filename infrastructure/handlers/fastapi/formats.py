@@ -0,0 +1,124 @@
+import codecs
+import csv
+import io
+import json
+import uuid
+from datetime import datetime
+from typing import AsyncIterator, Any, Literal
+
+from abstractions.usecases.product_import import ImportRecord
+
+FileFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+async def encode_ndjson(items: AsyncIterator[Any], columns: list[str], rows_per_chunk: int = 500) -> AsyncIterator[str]:
+    buffer = []
+    async for item in items:
+        record = {column: _plain(getattr(item, column)) for column in columns}
+        buffer.append(json.dumps(record, ensure_ascii=False))
+        if len(buffer) >= rows_per_chunk:
+            yield "\n".join(buffer) + "\n"
+            buffer.clear()
+    if buffer:
+        yield "\n".join(buffer) + "\n"
+
+
+async def encode_csv(items: AsyncIterator[Any], columns: list[str], rows_per_chunk: int = 500) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    rows = 0
+    async for item in items:
+        writer.writerow([_plain(getattr(item, column)) for column in columns])
+        rows += 1
+        if rows >= rows_per_chunk:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            rows = 0
+    yield buffer.getvalue()
+
+
+def encode(items: AsyncIterator[Any], file_format: FileFormat, columns: list[str]) -> AsyncIterator[str]:
+    if file_format == "csv":
+        return encode_csv(items, columns)
+    return encode_ndjson(items, columns)
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        *lines, pending = (pending + decoder.decode(chunk)).split("\n")
+        for line in lines:
+            yield line.removesuffix("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.removesuffix("\r")
+
+
+async def decode_ndjson(lines: AsyncIterator[str]) -> AsyncIterator[ImportRecord]:
+    row = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            values = json.loads(line)
+        except ValueError as e:
+            yield ImportRecord(row=row, error=f"Invalid JSON: {e}")
+            continue
+        if not isinstance(values, dict):
+            yield ImportRecord(row=row, error="Expected a JSON object")
+            continue
+        yield ImportRecord(row=row, values=values)
+
+
+async def decode_csv(lines: AsyncIterator[str], max_record_lines: int = 1000) -> AsyncIterator[ImportRecord]:
+    header = None
+    row = 0
+    record, quotes = [], 0
+    async for line in lines:
+        record.append(line)
+        quotes += line.count('"')
+        # An odd number of quotes means a quoted field continues on the next line.
+        if quotes % 2:
+            if len(record) >= max_record_lines:
+                row += 1
+                yield ImportRecord(row=row, error="Unterminated quoted field")
+                record, quotes = [], 0
+            continue
+        text = "\n".join(record)
+        record, quotes = [], 0
+        if not text.strip():
+            continue
+        fields = next(csv.reader([text]))
+        if header is None:
+            header = fields
+            continue
+        row += 1
+        if len(fields) != len(header):
+            yield ImportRecord(row=row, error=f"Expected {len(header)} columns, got {len(fields)}")
+            continue
+        yield ImportRecord(row=row, values=dict(zip(header, fields)))
+    if record:
+        yield ImportRecord(row=row + 1, error="Unterminated quoted field")
+
+
+def decode(chunks: AsyncIterator[bytes], file_format: FileFormat) -> AsyncIterator[ImportRecord]:
+    if file_format == "csv":
+        return decode_csv(iter_lines(chunks))
+    return decode_ndjson(iter_lines(chunks))
@@ -0,0 +1,22 @@
+import uuid
+from typing import Iterable
+
+from starlette.exceptions import HTTPException
+
+MAX_IDS = 1000
+
+
+def parse_ids(ids: str) -> list[uuid.UUID]:
+    # ``?ids=a,b,c``: duplicates collapse, order is kept for the response.
+    try:
+        obj_ids = list(dict.fromkeys(uuid.UUID(value.strip()) for value in ids.split(",") if value.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid UUID in ids")
+    if len(obj_ids) > MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_IDS} ids per request")
+    return obj_ids
+
+
+def in_order[Model](models: Iterable[Model], obj_ids: list[uuid.UUID]) -> list[Model]:
+    by_id = {model.id: model for model in models}
+    return [by_id[obj_id] for obj_id in obj_ids if obj_id in by_id]
@@ -0,0 +1,59 @@
+import time
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
+
+from infrastructure.metrics import AppMetrics
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsMiddleware:
+    # Plain ASGI rather than BaseHTTPMiddleware: no extra task or body
+    # buffering per request, just a wrapped ``send``.
+    def __init__(self, app: ASGIApp, metrics: AppMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight = self.metrics.requests_in_flight.labels()
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight.dec()
+            # The router stores the matched route in the scope; labelling by its
+            # template keeps one series per route instead of one per URL.
+            route = scope.get("route")
+            self.metrics.request_duration.labels(
+                scope["method"], route.path if route is not None else "unmatched", str(status)
+            ).observe(time.perf_counter() - started)
+
+
+class FastApiMetricsHandler:
+    def __init__(self, metrics: AppMetrics):
+        self.metrics = metrics
+        self.router = APIRouter(
+            tags=["Metrics"]
+        )
+        self.register()
+
+    def register(self):
+        self.router.get("", response_class=PlainTextResponse)(self.get)
+
+    async def get(self) -> PlainTextResponse:
+        return PlainTextResponse(self.metrics.registry.render(), media_type=PROMETHEUS_MEDIA_TYPE)
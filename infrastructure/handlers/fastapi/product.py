@@ -1,20 +1,38 @@
 import logging
 import traceback
+import dataclasses
 import uuid
-from typing import Annotated
+from datetime import datetime
+from typing import Annotated, Optional, Literal
 
-from fastapi import APIRouter
-from fastapi.params import Param, Depends
+from fastapi import APIRouter, Path, Query, Header, Response
+from fastapi.responses import StreamingResponse
+from fastapi.params import Depends
 from pydantic import BaseModel
 from starlette.exceptions import HTTPException
 
-from abstractions.repositories.abstract import NotFoundException
-from abstractions.repositories.product import CreateProductDTO, UpdateProductDTO
-from abstractions.usecases import ProductUseCaseInterface
-from domain import Product
+from abstractions.repositories.abstract import (
+    NotFoundException, InvalidCursorException, Page, AlreadyExistsException, BulkCreateResult,
+    PreconditionFailedException, ChangeFeed
+)
+from abstractions.repositories.product import CreateProductDTO, UpdateProductDTO, ProductEvent
+from abstractions.usecases import ProductUseCaseInterface, CategoryUseCaseInterface
+from domain import Product, ProductWithCategory
+from infrastructure.handlers.fastapi.columnar import negotiate, is_available, encode_columns
+from infrastructure.handlers.fastapi.conditional import (
+    make_etag, parse_etag, make_list_etag, validator_headers, is_not_modified
+)
+from infrastructure.events import EventHub
+from infrastructure.handlers.fastapi.counting import CountMode, total_count_headers
+from infrastructure.handlers.fastapi.events import EVENT_STREAM_HEADERS, encode_events
+from infrastructure.handlers.fastapi.fields import parse_fields, with_version, partial_response
+from infrastructure.handlers.fastapi.formats import FileFormat, MEDIA_TYPES, encode
+from infrastructure.handlers.fastapi.ids import parse_ids, in_order
 
 logger = logging.getLogger(__name__)
 
+Expand = Literal["category"]
+
 
 class HandlerCreateProductDTO(BaseModel):
     sku: str
@@ -32,9 +50,28 @@ class HandlerUpdateProductDTO(BaseModel):
     category_id: uuid.UUID
 
 
+class HandlerPatchProductDTO(BaseModel):
+    sku: Optional[str] = None
+    name: Optional[str] = None
+    description: Optional[str] = None
+    price: Optional[float] = None
+    category_id: Optional[uuid.UUID] = None
+
+
 class FastApiProductHandler:
-    def __init__(self, use_case: ProductUseCaseInterface):
+    def __init__(
+            self,
+            use_case: ProductUseCaseInterface,
+            cache_control: Optional[dict[str, str]] = None,
+            categories_use_case: Optional[CategoryUseCaseInterface] = None,
+            events: Optional[EventHub[ProductEvent]] = None,
+            events_heartbeat: float = 15.0,
+    ):
         self.use_case = use_case
+        self.categories_use_case = categories_use_case
+        self.events = events
+        self.events_heartbeat = events_heartbeat
+        self.cache_control = cache_control or {}
         self.router = APIRouter(
             tags=["Product"]
         )
@@ -42,21 +79,96 @@ class FastApiProductHandler:
 
     def register(self):
         self.router.get("")(self.get_all)
+        self.router.get("/export")(self.export)
+        self.router.get("/search")(self.search)
+        self.router.get("/changes")(self.changes)
+        if self.events is not None:
+            self.router.get("/stream", response_class=StreamingResponse)(self.stream)
         self.router.get("/{id}")(self.get)
         self.router.post("")(self.create)
+        self.router.post("/bulk")(self.create_many)
         self.router.put("/{id}")(self.update)
+        self.router.patch("/{id}")(self.patch)
         self.router.delete("/{id}")(self.delete)
 
     async def get_all(
             self,
+            response: Response,
             offset: int = 0,
             limit: int = 100,
             sku: str = None,
             name: str = None,
             category_id: str = None,
-    ) -> list[Product]:
+            cursor: str = None,
+            ids: str = None,
+            count: CountMode = "none",
+            expand: Optional[Expand] = None,
+            fields: str = None,
+            if_none_match: Optional[str] = Header(None),
+            if_modified_since: Optional[str] = Header(None),
+            accept: Optional[str] = Header(None),
+    ) -> list[ProductWithCategory] | Page[ProductWithCategory] | list[Product] | Page[Product]:
+        obj_ids = parse_ids(ids) if ids is not None else None
+        selected = parse_fields(fields, Product) if fields is not None else None
+        if selected is not None and (cursor is not None or expand is not None):
+            raise HTTPException(status_code=400, detail="fields cannot be combined with cursor or expand")
+        media_type = None
+        if cursor is None and obj_ids is None and expand is None and selected is None:
+            media_type = negotiate(accept)
+        if media_type is not None and not is_available(media_type):
+            raise HTTPException(status_code=406, detail=f"{media_type} encoding is not installed")
         try:
-            return await self.use_case.get_all(offset=offset, limit=limit, sku=sku, name=name, category_id=category_id)
+            if obj_ids is not None:
+                items = in_order(await self.use_case.get_many(obj_ids), obj_ids)
+                if expand is not None:
+                    return await self._expand(items, expand)
+                headers = self._list_validators([(item.id, item.updated_at) for item in items])
+                if selected is not None:
+                    return partial_response([dataclasses.asdict(item) for item in items], selected, headers)
+                response.headers.update(headers)
+                return items
+            if media_type is not None:
+                columns = await self.use_case.get_all_columnar(offset=offset, limit=limit, sku=sku, name=name,
+                                                               category_id=category_id)
+                headers = await total_count_headers(self.use_case.count, count, sku=sku, name=name,
+                                                    category_id=category_id)
+                return Response(encode_columns(columns, media_type), media_type=media_type,
+                                headers={"Vary": "Accept", **headers})
+            # An embedded category changes without bumping the product's version,
+            # so expanded representations are served without validators.
+            if expand is None and (if_none_match is not None or if_modified_since is not None):
+                versions = await self.use_case.get_versions(limit=limit, offset=offset, cursor=cursor, sku=sku,
+                                                            name=name, category_id=category_id)
+                headers = self._list_validators(versions)
+                if is_not_modified(headers["ETag"], max((v for _, v in versions), default=None),
+                                   if_none_match, if_modified_since):
+                    return Response(status_code=304, headers=headers)
+            if selected is not None:
+                rows = await self.use_case.get_all_partial(with_version(selected), offset=offset, limit=limit,
+                                                           sku=sku, name=name, category_id=category_id)
+                headers = await total_count_headers(self.use_case.count, count, sku=sku, name=name,
+                                                    category_id=category_id)
+                headers.update(self._list_validators([(row["id"], row["updated_at"]) for row in rows]))
+                return partial_response(rows, selected, headers)
+            if cursor is not None:
+                result = await self.use_case.get_page(limit=limit, cursor=cursor, sku=sku, name=name,
+                                                      category_id=category_id)
+                items = result.items
+            else:
+                result = items = await self.use_case.get_all(offset=offset, limit=limit, sku=sku, name=name,
+                                                             category_id=category_id)
+            response.headers.update(
+                await total_count_headers(self.use_case.count, count, sku=sku, name=name, category_id=category_id)
+            )
+            if expand is None:
+                response.headers.update(self._list_validators([(item.id, item.updated_at) for item in items]))
+                return result
+            if isinstance(result, Page):
+                return Page(items=await self._expand(result.items, expand), next_cursor=result.next_cursor)
+            return await self._expand(result, expand)
+        except InvalidCursorException as e:
+            logger.error(f"Invalid cursor: {e}")
+            raise HTTPException(status_code=400, detail=str(e))
         except NotFoundException as e:
             logger.error(f"Product not found: {e}")
             raise HTTPException(status_code=404, detail=str(e))
@@ -64,17 +176,97 @@ class FastApiProductHandler:
             logger.error(f"Internal error: {e}\n", traceback.format_exc())
             raise HTTPException(status_code=500, detail=str(e))
 
+    async def search(
+            self,
+            q: str = Query(min_length=1),
+            limit: int = 100,
+            cursor: str = None,
+    ) -> Page[Product]:
+        try:
+            return await self.use_case.search(q, limit=limit, cursor=cursor)
+        except InvalidCursorException as e:
+            logger.error(f"Invalid cursor: {e}")
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            logger.error(f"Internal error: {e}\n", traceback.format_exc())
+            raise HTTPException(status_code=500, detail=str(e))
+
+    async def changes(
+            self,
+            since: Optional[str] = None,
+            limit: int = Query(1000, ge=1, le=10000),
+    ) -> ChangeFeed[Product]:
+        try:
+            return await self.use_case.changes(since, limit)
+        except InvalidCursorException as e:
+            logger.error(f"Invalid change token: {e}")
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            logger.error(f"Internal error: {e}\n", traceback.format_exc())
+            raise HTTPException(status_code=500, detail=str(e))
+
+    async def stream(self, category_id: Optional[uuid.UUID] = None) -> StreamingResponse:
+        # A product moved out of the category is still reported to its subscribers.
+        predicate = None if category_id is None else (
+            lambda event: category_id in (event.category_id, event.previous_category_id)
+        )
+        return StreamingResponse(
+            encode_events(self.events, predicate, self.events_heartbeat),
+            media_type="text/event-stream",
+            headers=EVENT_STREAM_HEADERS,
+        )
+
+    async def export(
+            self,
+            export_format: FileFormat = Query("ndjson", alias="format"),
+            sku: str = None,
+            name: str = None,
+            category_id: str = None,
+    ) -> StreamingResponse:
+        items = self.use_case.stream(sku=sku, name=name, category_id=category_id)
+        columns = [field.name for field in dataclasses.fields(Product)]
+        return StreamingResponse(
+            encode(items, export_format, columns),
+            media_type=MEDIA_TYPES[export_format],
+            headers={"Content-Disposition": f'attachment; filename="products.{export_format}"'},
+        )
+
     async def get(
             self,
-            obj_id: str = Param(alias="id"),
-    ) -> Product:
+            response: Response,
+            obj_id: str = Path(alias="id"),
+            expand: Optional[Expand] = None,
+            fields: str = None,
+            if_none_match: Optional[str] = Header(None),
+            if_modified_since: Optional[str] = Header(None),
+    ) -> ProductWithCategory | Product:
         try:
             uuid_id = uuid.UUID(obj_id)
         except ValueError as e:
             logger.error(f"Invalid UUID: {e}")
             raise HTTPException(status_code=400, detail="Invalid UUID")
+        selected = parse_fields(fields, Product) if fields is not None else None
+        if selected is not None and expand is not None:
+            raise HTTPException(status_code=400, detail="fields cannot be combined with expand")
         try:
-            return await self.use_case.get(uuid_id)
+            if expand is not None:
+                return (await self._expand([await self.use_case.get(uuid_id)], expand))[0]
+            if if_none_match is not None or if_modified_since is not None:
+                updated_at = await self.use_case.get_version(uuid_id)
+                headers = validator_headers(make_etag(updated_at), updated_at, self.cache_control.get("get"))
+                if is_not_modified(headers["ETag"], updated_at, if_none_match, if_modified_since):
+                    return Response(status_code=304, headers=headers)
+            if selected is not None:
+                row = await self.use_case.get_partial(uuid_id, with_version(selected))
+                headers = validator_headers(
+                    make_etag(row["updated_at"]), row["updated_at"], self.cache_control.get("get")
+                )
+                return partial_response(row, selected, headers)
+            product = await self.use_case.get(uuid_id)
+            response.headers.update(
+                validator_headers(make_etag(product.updated_at), product.updated_at, self.cache_control.get("get"))
+            )
+            return product
         except NotFoundException as e:
             logger.error(f"Product not found: {e}")
             raise HTTPException(status_code=404, detail=str(e))
@@ -82,12 +274,53 @@ class FastApiProductHandler:
             logger.error(f"Internal error: {e}\n", traceback.format_exc())
             raise HTTPException(status_code=500, detail=str(e))
 
+    async def _expand(self, items: list[Product], expand: Expand) -> list[ProductWithCategory]:
+        # One IN query for every distinct category on the page.
+        category_ids = list(dict.fromkeys(item.category_id for item in items))
+        categories = {category.id: category for category in await self.categories_use_case.get_many(category_ids)}
+        return [
+            ProductWithCategory(
+                id=item.id, created_at=item.created_at, updated_at=item.updated_at, sku=item.sku, name=item.name,
+                description=item.description, price=item.price, category_id=item.category_id,
+                category=categories.get(item.category_id),
+            )
+            for item in items
+        ]
+
+    def _list_validators(self, versions: list[tuple[uuid.UUID, datetime]]) -> dict[str, str]:
+        headers = validator_headers(
+            make_list_etag(versions),
+            max((updated_at for _, updated_at in versions), default=None),
+            self.cache_control.get("get_all"),
+        )
+        headers["Vary"] = "Accept"
+        return headers
+
     async def create(
             self,
             dto: HandlerCreateProductDTO
     ) -> Product:
         try:
             return await self.use_case.create(CreateProductDTO(**dto.model_dump()))
+        except AlreadyExistsException as e:
+            logger.error(f"Create rejected: {e}")
+            raise HTTPException(status_code=409, detail=str(e))
+        except Exception as e:
+            logger.error(f"Internal error: {e}\n", traceback.format_exc())
+            raise HTTPException(status_code=500, detail=str(e))
+
+    async def create_many(
+            self,
+            dtos: list[HandlerCreateProductDTO],
+            atomic: bool = True,
+    ) -> list[BulkCreateResult[Product]]:
+        try:
+            return await self.use_case.create_many(
+                [CreateProductDTO(**dto.model_dump()) for dto in dtos], atomic=atomic
+            )
+        except AlreadyExistsException as e:
+            logger.error(f"Bulk create rejected: {e}")
+            raise HTTPException(status_code=409, detail=str(e))
         except Exception as e:
             logger.error(f"Internal error: {e}\n", traceback.format_exc())
             raise HTTPException(status_code=500, detail=str(e))
@@ -95,7 +328,7 @@ class FastApiProductHandler:
     async def update(
             self,
             dto: HandlerUpdateProductDTO,
-            obj_id: str = Param(alias="id"),
+            obj_id: str = Path(alias="id"),
     ) -> None:
         try:
             uuid_id = uuid.UUID(obj_id)
@@ -107,13 +340,52 @@ class FastApiProductHandler:
         except NotFoundException as e:
             logger.error(f"Product not found: {e}")
             raise HTTPException(status_code=404, detail=str(e))
+        except AlreadyExistsException as e:
+            logger.error(f"Conflict: {e}")
+            raise HTTPException(status_code=409, detail=str(e))
+        except Exception as e:
+            logger.error(f"Internal error: {e}\n", traceback.format_exc())
+            raise HTTPException(status_code=500, detail=str(e))
+
+    async def patch(
+            self,
+            dto: HandlerPatchProductDTO,
+            response: Response,
+            obj_id: str = Path(alias="id"),
+            if_match: Optional[str] = Header(None),
+    ) -> Product:
+        try:
+            uuid_id = uuid.UUID(obj_id)
+        except ValueError as e:
+            logger.error(f"Invalid UUID: {e}")
+            raise HTTPException(status_code=400, detail="Invalid UUID")
+        expected_updated_at = None
+        if if_match is not None and if_match.strip() != "*":
+            expected_updated_at = parse_etag(if_match)
+            if expected_updated_at is None:
+                raise HTTPException(status_code=412, detail="If-Match must be a single strong ETag")
+        try:
+            product = await self.use_case.patch(
+                uuid_id, dto.model_dump(exclude_unset=True, exclude_none=True), expected_updated_at
+            )
+        except NotFoundException as e:
+            logger.error(f"Product not found: {e}")
+            raise HTTPException(status_code=404, detail=str(e))
+        except PreconditionFailedException as e:
+            logger.error(f"Precondition failed: {e}")
+            raise HTTPException(status_code=412, detail=str(e))
+        except AlreadyExistsException as e:
+            logger.error(f"Conflict: {e}")
+            raise HTTPException(status_code=409, detail=str(e))
         except Exception as e:
             logger.error(f"Internal error: {e}\n", traceback.format_exc())
             raise HTTPException(status_code=500, detail=str(e))
+        response.headers["ETag"] = make_etag(product.updated_at)
+        return product
 
     async def delete(
             self,
-            obj_id: str = Param(alias="id"),
+            obj_id: str = Path(alias="id"),
     ) -> None:
         try:
             uuid_id = uuid.UUID(obj_id)
@@ -0,0 +1,34 @@
+import logging
+import traceback
+
+from fastapi import APIRouter, Query, Request
+from starlette.exceptions import HTTPException
+
+from abstractions.usecases import ProductImportUseCaseInterface
+from abstractions.usecases.product_import import ImportSummary
+from infrastructure.handlers.fastapi.formats import FileFormat, decode
+
+logger = logging.getLogger(__name__)
+
+
+class FastApiProductImportHandler:
+    def __init__(self, use_case: ProductImportUseCaseInterface):
+        self.use_case = use_case
+        self.router = APIRouter(
+            tags=["Product"]
+        )
+        self.register()
+
+    def register(self):
+        self.router.post("/import")(self.run)
+
+    async def run(
+            self,
+            request: Request,
+            import_format: FileFormat = Query("ndjson", alias="format"),
+    ) -> ImportSummary:
+        try:
+            return await self.use_case.run(decode(request.stream(), import_format))
+        except Exception as e:
+            logger.error(f"Internal error: {e}\n", traceback.format_exc())
+            raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,66 @@
+import asyncio
+import functools
+import time
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
+
+from infrastructure.profiling import RequestProfile, current_profile
+
+
+class ProfilingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"server-timing", _server_timing(profile))]
+            await send(message)
+
+        reset_token = current_profile.set(profile)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_profile.reset(reset_token)
+
+
+def mark_endpoints(app: FastAPI) -> None:
+    # FastAPI's compiled request handler awaits ``dependant.call`` and then
+    # validates and renders the result; wrapping the call records where the
+    # endpoint ends and serialization begins.
+    for route in app.routes:
+        if isinstance(route, APIRoute) and asyncio.iscoroutinefunction(route.dependant.call):
+            route.dependant.call = _marked(route.dependant.call)
+
+
+def _marked(endpoint):
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            profile = current_profile.get()
+            if profile is not None:
+                profile.endpoint_finished = time.perf_counter()
+
+    return wrapper
+
+
+def _server_timing(profile: RequestProfile) -> bytes:
+    now = time.perf_counter()
+    metrics = [
+        f'db;dur={profile.db * 1000:.2f};desc="{profile.queries} queries"',
+        f"map;dur={profile.map * 1000:.2f}",
+    ]
+    if profile.endpoint_finished is not None:
+        metrics.append(f"serialize;dur={(now - profile.endpoint_finished) * 1000:.2f}")
+    metrics.append(f"total;dur={(now - profile.started) * 1000:.2f}")
+    return ", ".join(metrics).encode("latin-1")
@@ -0,0 +1,30 @@
+import dataclasses
+from typing import Any, Callable
+
+from fastapi import APIRouter, Path
+from starlette.exceptions import HTTPException
+
+
+class FastApiStatsHandler:
+    def __init__(self, sources: dict[str, Callable[[], Any]]):
+        self.sources = sources
+        self.router = APIRouter(
+            tags=["Stats"]
+        )
+        self.register()
+
+    def register(self):
+        self.router.get("")(self.get_all)
+        self.router.get("/{name}")(self.get)
+
+    async def get_all(self) -> dict[str, dict[str, Any]]:
+        return {name: dataclasses.asdict(source()) for name, source in self.sources.items()}
+
+    async def get(
+            self,
+            name: str = Path(),
+    ) -> dict[str, Any]:
+        source = self.sources.get(name)
+        if source is None:
+            raise HTTPException(status_code=404, detail=f"Unknown stats source {name}")
+        return dataclasses.asdict(source())
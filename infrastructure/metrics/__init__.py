@@ -0,0 +1,2 @@
+from .collectors import Counter, Gauge, Histogram, Registry
+from .app import AppMetrics
@@ -0,0 +1,88 @@
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from infrastructure.metrics.collectors import Registry, Histogram, Gauge, Counter
+from infrastructure.repositories.changes import ChangeFeedStats
+from infrastructure.repositories.singleflight import SingleFlight
+
+
+class AppMetrics:
+    def __init__(self):
+        self.registry = Registry()
+        self.request_duration = self.registry.register(Histogram(
+            "http_request_duration_seconds", "HTTP request latency by route template and status.",
+            ("method", "route", "status"),
+        ))
+        self.requests_in_flight = self.registry.register(Gauge(
+            "http_requests_in_flight", "HTTP requests currently being served.",
+        ))
+        self.repository_duration = self.registry.register(Histogram(
+            "repository_operation_duration_seconds", "Repository call latency by entity and method.",
+            ("entity", "method"),
+        ))
+        self.db_queries = self.registry.register(Counter(
+            "db_queries_total", "Statements sent to the database by engine and operation.",
+            ("engine", "operation"),
+        ))
+        self.pool_connections = self.registry.register(Gauge(
+            "db_pool_connections", "Pooled connections by engine and state.",
+            ("engine", "state"),
+        ))
+        self.pool_checkouts = self.registry.register(Counter(
+            "db_pool_checkouts_total", "Connections handed out by the pool.",
+            ("engine",),
+        ))
+        self.pool_wait = self.registry.register(Counter(
+            "db_pool_checkout_wait_seconds_total", "Time spent waiting for a pooled connection.",
+            ("engine",),
+        ))
+        self.pool_checkout_failures = self.registry.register(Counter(
+            "db_pool_checkout_failures_total", "Checkouts that timed out or could not connect.",
+            ("engine",),
+        ))
+        self.pool_connect = self.registry.register(Counter(
+            "db_pool_connect_seconds_total", "Time spent opening new connections for the pool.",
+            ("engine",),
+        ))
+        self.single_flights = self.registry.register(Counter(
+            "repository_single_flight_queries_total", "List queries executed on behalf of one or more callers.",
+            ("entity",),
+        ))
+        self.single_flight_coalesced = self.registry.register(Counter(
+            "repository_single_flight_coalesced_total", "List calls served by joining an identical query in flight.",
+            ("entity",),
+        ))
+        self.change_feed_lag = self.registry.register(Gauge(
+            "change_feed_lag_seconds", "How far the change feed horizon trailed the database clock on the last read.",
+            ("entity",),
+        ))
+
+    def instrument_change_feed(self, stats: ChangeFeedStats, entity: str) -> None:
+        def collect_change_feed() -> None:
+            self.change_feed_lag.labels(entity).set(stats.lag_seconds)
+
+        self.registry.on_collect(collect_change_feed)
+
+    def instrument_single_flight(self, flights: SingleFlight, entity: str) -> None:
+        def collect_flights() -> None:
+            self.single_flights.labels(entity).value = flights.stats.flights
+            self.single_flight_coalesced.labels(entity).value = flights.stats.coalesced
+
+        self.registry.on_collect(collect_flights)
+
+    def instrument_engine(self, engine: AsyncEngine, name: str) -> None:
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def count_query(conn, cursor, statement, parameters, context, executemany):
+            self.db_queries.labels(name, statement.split(None, 1)[0].upper()).inc()
+
+        def collect_pool() -> None:
+            stats = engine.pool.stats()
+            self.pool_connections.labels(name, "checked_out").set(stats.checked_out)
+            self.pool_connections.labels(name, "idle").set(stats.idle)
+            self.pool_connections.labels(name, "overflow").set(stats.overflow)
+            self.pool_checkouts.labels(name).value = stats.checkouts
+            self.pool_wait.labels(name).value = stats.wait_seconds_total
+            self.pool_checkout_failures.labels(name).value = stats.failed_checkouts
+            self.pool_connect.labels(name).value = stats.connect_seconds_total
+
+        self.registry.on_collect(collect_pool)
@@ -0,0 +1,152 @@
+import math
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Iterator
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Collectors are only touched from the event loop thread, so series are plain
+# objects mutated in place without locks; ``labels`` is a dict lookup and
+# ``observe`` a bisect plus two additions.
+
+
+class CounterSeries:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class GaugeSeries:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class HistogramSeries:
+    __slots__ = ("buckets", "counts", "sum")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class Collector[Series](ABC):
+    kind: str
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self._series: dict[tuple[str, ...], Series] = {}
+
+    def labels(self, *values: str) -> Series:
+        series = self._series.get(values)
+        if series is None:
+            if len(values) != len(self.label_names):
+                raise ValueError(f"{self.name} expects labels {self.label_names}, got {values}")
+            series = self._series[values] = self._new_series()
+        return series
+
+    @abstractmethod
+    def _new_series(self) -> Series:
+        pass
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for values, series in self._series.items():
+            yield from self._render_series(_format_labels(self.label_names, values), series)
+
+    def _render_series(self, labels: str, series: Series) -> Iterator[str]:
+        suffix = f"{{{labels}}}" if labels else ""
+        yield f"{self.name}{suffix} {_format_value(series.value)}"
+
+
+class Counter(Collector[CounterSeries]):
+    kind = "counter"
+
+    def _new_series(self) -> CounterSeries:
+        return CounterSeries()
+
+
+class Gauge(Collector[GaugeSeries]):
+    kind = "gauge"
+
+    def _new_series(self) -> GaugeSeries:
+        return GaugeSeries()
+
+
+class Histogram(Collector[HistogramSeries]):
+    kind = "histogram"
+
+    def __init__(
+            self, name: str, documentation: str, label_names: tuple[str, ...] = (),
+            buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_series(self) -> HistogramSeries:
+        return HistogramSeries(self.buckets)
+
+    def _render_series(self, labels: str, series: HistogramSeries) -> Iterator[str]:
+        prefix = f"{labels}," if labels else ""
+        cumulative = 0
+        for bound, count in zip((*self.buckets, math.inf), series.counts):
+            cumulative += count
+            yield f'{self.name}_bucket{{{prefix}le="{_format_value(bound)}"}} {cumulative}'
+        suffix = f"{{{labels}}}" if labels else ""
+        yield f"{self.name}_sum{suffix} {_format_value(series.sum)}"
+        yield f"{self.name}_count{suffix} {cumulative}"
+
+
+class Registry:
+    def __init__(self):
+        self._collectors: list[Collector] = []
+        self._hooks: list[Callable[[], None]] = []
+
+    def register[C: Collector](self, collector: C) -> C:
+        self._collectors.append(collector)
+        return collector
+
+    def on_collect(self, hook: Callable[[], None]) -> None:
+        self._hooks.append(hook)
+
+    def render(self) -> str:
+        for hook in self._hooks:
+            hook()
+        lines = [line for collector in self._collectors for line in collector.render()]
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
@@ -0,0 +1,2 @@
+from .profile import RequestProfile, current_profile, timed_mapping
+from .sqlalchemy import QueryProfiler
@@ -0,0 +1,32 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional, Iterator
+
+
+@dataclass
+class RequestProfile:
+    started: float = field(default_factory=time.perf_counter)
+    db: float = 0.0
+    queries: int = 0
+    map: float = 0.0
+    endpoint_finished: Optional[float] = None
+
+
+# Set per request by the profiling middleware; engine events and repositories
+# add their timings to it. Left unset when profiling is disabled.
+current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("current_profile", default=None)
+
+
+@contextmanager
+def timed_mapping() -> Iterator[None]:
+    profile = current_profile.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.map += time.perf_counter() - started
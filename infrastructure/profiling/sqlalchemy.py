@@ -0,0 +1,65 @@
+import logging
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from infrastructure.profiling.profile import current_profile
+
+logger = logging.getLogger(__name__)
+
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+
+@dataclass
+class QueryProfiler:
+    slow_query_threshold: float = 0.2
+    explain: bool = False
+
+    def instrument(self, engine: AsyncEngine) -> None:
+        event.listen(engine.sync_engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine.sync_engine, "after_cursor_execute", self._after_execute)
+
+    @staticmethod
+    def _before_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        # Kept on the statement's own execution context, which goes away with
+        # it, so a statement that raises leaves nothing behind on the pooled
+        # connection.
+        context._query_started = time.perf_counter()
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        elapsed = time.perf_counter() - context._query_started
+        profile = current_profile.get()
+        if profile is not None:
+            profile.db += elapsed
+            profile.queries += 1
+        if elapsed >= self.slow_query_threshold:
+            self._log_slow_query(conn, statement, parameters, executemany, elapsed)
+
+    def _log_slow_query(self, conn, statement, parameters, executemany, elapsed: float) -> None:
+        message = f"Slow query ({elapsed * 1000:.1f} ms): {statement}\nParameters: {parameters!r}"
+        if self.explain and not executemany and statement.lstrip().upper().startswith(_EXPLAINABLE):
+            message += f"\nPlan:\n{self._explain(conn, statement, parameters)}"
+        logger.warning(message)
+
+    @staticmethod
+    def _explain(conn, statement, parameters) -> str:
+        # A separate DBAPI cursor on the same connection and transaction, so
+        # the plan sees the same snapshot and the EXPLAIN itself is not profiled.
+        # The savepoint keeps a failing EXPLAIN from aborting the transaction.
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute("SAVEPOINT explain_slow_query")
+            try:
+                cursor.execute(f"EXPLAIN {statement}", parameters)
+                plan = "\n".join(row[0] for row in cursor.fetchall())
+            except Exception as e:
+                cursor.execute("ROLLBACK TO SAVEPOINT explain_slow_query")
+                plan = f"EXPLAIN failed: {e}"
+            cursor.execute("RELEASE SAVEPOINT explain_slow_query")
+            return plan
+        except Exception as e:
+            return f"EXPLAIN failed: {e}"
+        finally:
+            cursor.close()
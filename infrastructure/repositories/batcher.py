@@ -0,0 +1,49 @@
+import asyncio
+from typing import Callable, Awaitable, Optional
+
+
+class WriteBatcher[Item, Result]:
+    # Group commit: items submitted within ``window`` seconds of the first one
+    # (or until ``max_size`` items are waiting) are written by one
+    # ``write_many`` call, which returns one result per item in order.
+    def __init__(self, write_many: Callable[[list[Item]], Awaitable[list[Result]]], window: float, max_size: int):
+        self.write_many = write_many
+        self.window = window
+        self.max_size = max_size
+        self._batch: Optional[list[tuple[Item, asyncio.Future]]] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, item: Item) -> Result:
+        loop = asyncio.get_running_loop()
+        if self._batch is None:
+            self._batch = []
+            self._timer = loop.call_later(self.window, self._flush)
+        future = loop.create_future()
+        self._batch.append((item, future))
+        if len(self._batch) >= self.max_size:
+            self._timer.cancel()
+            self._flush()
+        return await future
+
+    def _flush(self) -> None:
+        batch, self._batch = self._batch, None
+        # Callers cancelled while their item was still waiting are left out.
+        batch = [(item, future) for item, future in batch if not future.cancelled()]
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[Item, asyncio.Future]]) -> None:
+        try:
+            results = await self.write_many([item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
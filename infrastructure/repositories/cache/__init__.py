@@ -0,0 +1,2 @@
+from .lru import LRUCache, CacheStats, MISSING
+from .repository import CachedRepository
@@ -0,0 +1,161 @@
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional, AsyncIterator, Any
+
+from abstractions.repositories.abstract import CRUDRepositoryInterface, NotFoundException, Page, BulkCreateResult
+from infrastructure.repositories.cache.lru import LRUCache, MISSING
+from infrastructure.repositories.consistency import current_consistency
+
+
+@dataclass
+class CachedRepository[Model, CreateDTO, UpdateDTO](
+    CRUDRepositoryInterface[Model, CreateDTO, UpdateDTO]
+):
+    repository: CRUDRepositoryInterface[Model, CreateDTO, UpdateDTO]
+    cache: LRUCache
+    # How long replicas may lag behind the primary; 0 when reads never go to
+    # a replica. Only holds the cache consistent if the lag really stays below it.
+    max_replica_lag: float = 0.0
+    _settling: OrderedDict[uuid.UUID, float] = field(default_factory=OrderedDict, init=False, repr=False)
+
+    def _invalidate(self, obj_id: uuid.UUID) -> None:
+        # A replica may serve the entity as it was before the write until the
+        # write has replicated, so reads that may have gone to a replica are
+        # not cached for that long.
+        self.cache.invalidate(obj_id)
+        if self.max_replica_lag <= 0:
+            return
+        now = time.monotonic()
+        self._settling.pop(obj_id, None)
+        self._settling[obj_id] = now + self.max_replica_lag
+        while next(iter(self._settling.values())) <= now:
+            self._settling.popitem(last=False)
+
+    def _bypasses_cache(self) -> bool:
+        # A client holding a fresh consistency token reads from the primary;
+        # the entry may have been cached before a write made on another instance.
+        consistency = current_consistency.get()
+        return (
+            self.max_replica_lag > 0
+            and consistency is not None
+            and consistency.requires_primary(self.max_replica_lag)
+        )
+
+    def _cacheable(self, obj_id: uuid.UUID) -> bool:
+        if self._bypasses_cache():
+            return True
+        deadline = self._settling.get(obj_id)
+        return deadline is None or deadline <= time.monotonic()
+
+    def _set(self, obj_id: uuid.UUID, model: Optional[Model], generation: int) -> None:
+        if self._cacheable(obj_id):
+            self.cache.set(obj_id, model, generation)
+
+    async def create(self, obj: CreateDTO) -> Model:
+        # The created model is built from the DTO rather than read back, so
+        # the next get loads the stored row instead of caching it here.
+        model = await self.repository.create(obj)
+        self._invalidate(model.id)
+        return model
+
+    async def create_many(self, objs: list[CreateDTO], atomic: bool = True) -> list[BulkCreateResult[Model]]:
+        results = await self.repository.create_many(objs, atomic)
+        for result in results:
+            if result.item is not None:
+                self._invalidate(result.item.id)
+        return results
+
+    async def get(self, obj_id: uuid.UUID) -> Model:
+        cached = MISSING if self._bypasses_cache() else self.cache.get(obj_id)
+        if cached is None:
+            raise NotFoundException(f"Entity with id {obj_id} not found")
+        if cached is not MISSING:
+            return cached
+        generation = self.cache.generation
+        try:
+            model = await self.repository.get(obj_id)
+        except NotFoundException:
+            self._set(obj_id, None, generation)
+            raise
+        self._set(obj_id, model, generation)
+        return model
+
+    async def get_many(self, obj_ids: list[uuid.UUID]) -> list[Model]:
+        found, missing = [], []
+        bypass = self._bypasses_cache()
+        for obj_id in dict.fromkeys(obj_ids):
+            cached = MISSING if bypass else self.cache.get(obj_id)
+            if cached is MISSING:
+                missing.append(obj_id)
+            elif cached is not None:
+                found.append(cached)
+        if not missing:
+            return found
+        generation = self.cache.generation
+        loaded = {model.id: model for model in await self.repository.get_many(missing)}
+        for obj_id in missing:
+            self._set(obj_id, loaded.get(obj_id), generation)
+        return found + list(loaded.values())
+
+    async def update(self, obj_id: uuid.UUID, obj: UpdateDTO) -> None:
+        try:
+            await self.repository.update(obj_id, obj)
+        finally:
+            self._invalidate(obj_id)
+
+    async def patch(
+            self, obj_id: uuid.UUID, values: dict[str, Any], expected_updated_at: Optional[datetime] = None
+    ) -> Model:
+        try:
+            return await self.repository.patch(obj_id, values, expected_updated_at)
+        finally:
+            self._invalidate(obj_id)
+
+    async def delete(self, obj_id: uuid.UUID) -> None:
+        try:
+            await self.repository.delete(obj_id)
+        finally:
+            self._invalidate(obj_id)
+
+    async def get_all(self, limit: int = 100, offset: int = 0, **kwargs) -> list[Model]:
+        return await self.repository.get_all(limit, offset, **kwargs)
+
+    async def get_partial(self, obj_id: uuid.UUID, fields: list[str]) -> dict[str, Any]:
+        # Served from a cached whole entity when there is one; partial rows
+        # are not cached themselves.
+        cached = MISSING if self._bypasses_cache() else self.cache.get(obj_id)
+        if cached is None:
+            raise NotFoundException(f"Entity with id {obj_id} not found")
+        if cached is not MISSING:
+            return {name: getattr(cached, name) for name in fields}
+        return await self.repository.get_partial(obj_id, fields)
+
+    async def get_all_partial(
+            self, fields: list[str], limit: int = 100, offset: int = 0, **kwargs
+    ) -> list[dict[str, Any]]:
+        return await self.repository.get_all_partial(fields, limit, offset, **kwargs)
+
+    async def get_page(self, limit: int = 100, cursor: Optional[str] = None, **kwargs) -> Page[Model]:
+        return await self.repository.get_page(limit, cursor, **kwargs)
+
+    def stream(self, **kwargs) -> AsyncIterator[Model]:
+        return self.repository.stream(**kwargs)
+
+    async def count(self, estimated: bool = False, **kwargs) -> int:
+        return await self.repository.count(estimated, **kwargs)
+
+    async def get_version(self, obj_id: uuid.UUID) -> datetime:
+        cached = MISSING if self._bypasses_cache() else self.cache.get(obj_id)
+        if cached is None:
+            raise NotFoundException(f"Entity with id {obj_id} not found")
+        if cached is not MISSING:
+            return cached.updated_at
+        return await self.repository.get_version(obj_id)
+
+    async def get_versions(
+            self, limit: int = 100, offset: int = 0, cursor: Optional[str] = None, **kwargs
+    ) -> list[tuple[uuid.UUID, datetime]]:
+        return await self.repository.get_versions(limit, offset, cursor, **kwargs)
@@ -1 +1,4 @@
-from .sqlalchemy import SqlAlchemyCategoryRepository
\ No newline at end of file
+from .sqlalchemy import SqlAlchemyCategoryRepository
+from .cached import CachedCategoryRepository
+from .instrumented import InstrumentedCategoryRepository
+from .memory import InMemoryCategoryRepository
@@ -0,0 +1,19 @@
+import uuid
+
+from abstractions.repositories.category import UpdateCategoryDTO, CreateCategoryDTO, CategoryRepositoryInterface
+from domain import Category, CategoryStats
+from infrastructure.repositories.cache import CachedRepository
+
+
+class CachedCategoryRepository(
+    CachedRepository[
+        Category, CreateCategoryDTO, UpdateCategoryDTO
+    ],
+    CategoryRepositoryInterface,
+):
+    # Stats change with product writes, which this cache never sees.
+    async def get_stats(self, category_id: uuid.UUID) -> CategoryStats:
+        return await self.repository.get_stats(category_id)
+
+    async def get_many_stats(self, category_ids: list[uuid.UUID]) -> list[CategoryStats]:
+        return await self.repository.get_many_stats(category_ids)
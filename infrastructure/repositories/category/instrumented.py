@@ -0,0 +1,20 @@
+import uuid
+
+from abstractions.repositories.category import UpdateCategoryDTO, CreateCategoryDTO, CategoryRepositoryInterface
+from domain import Category, CategoryStats
+from infrastructure.repositories.instrumented import InstrumentedRepository
+
+
+class InstrumentedCategoryRepository(
+    InstrumentedRepository[
+        Category, CreateCategoryDTO, UpdateCategoryDTO
+    ],
+    CategoryRepositoryInterface,
+):
+    async def get_stats(self, category_id: uuid.UUID) -> CategoryStats:
+        with self._timed("get_stats"):
+            return await self.repository.get_stats(category_id)
+
+    async def get_many_stats(self, category_ids: list[uuid.UUID]) -> list[CategoryStats]:
+        with self._timed("get_many_stats"):
+            return await self.repository.get_many_stats(category_ids)
@@ -0,0 +1,72 @@
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Iterable
+
+from abstractions.repositories.abstract import NotFoundException
+from abstractions.repositories.category import UpdateCategoryDTO, CreateCategoryDTO, CategoryRepositoryInterface
+from domain import Category, CategoryStats
+from infrastructure.repositories.memory import InMemoryRepository
+
+
+@dataclass(slots=True)
+class ProductTotals:
+    product_count: int = 0
+    price_sum: int = 0
+    min_price: Optional[int] = None
+    max_price: Optional[int] = None
+
+    def add(self, price: int) -> None:
+        self.product_count += 1
+        self.price_sum += price
+        self.min_price = price if self.min_price is None else min(self.min_price, price)
+        self.max_price = price if self.max_price is None else max(self.max_price, price)
+
+    def remove(self, price: int) -> bool:
+        # True when the removed price was an extreme and the range needs a rescan.
+        self.product_count -= 1
+        self.price_sum -= price
+        return price in (self.min_price, self.max_price)
+
+    def reset_range(self, prices: Iterable[int]) -> None:
+        prices = list(prices)
+        self.min_price = min(prices, default=None)
+        self.max_price = max(prices, default=None)
+
+
+class InMemoryCategoryRepository(
+    InMemoryRepository[
+        Category, CreateCategoryDTO, UpdateCategoryDTO
+    ],
+    CategoryRepositoryInterface,
+):
+    def __post_init__(self):
+        super().__post_init__()
+        # Maintained by the products repository as products are written.
+        self.product_totals: dict[uuid.UUID, ProductTotals] = {}
+
+    async def delete(self, obj_id: uuid.UUID) -> None:
+        await super().delete(obj_id)
+        self.product_totals.pop(obj_id, None)
+
+    async def get_stats(self, category_id: uuid.UUID) -> CategoryStats:
+        if category_id not in self:
+            raise NotFoundException(f"Entity with id {category_id} not found")
+        return self._stats(category_id)
+
+    async def get_many_stats(self, category_ids: list[uuid.UUID]) -> list[CategoryStats]:
+        return [self._stats(category_id) for category_id in dict.fromkeys(category_ids) if category_id in self]
+
+    def _stats(self, category_id: uuid.UUID) -> CategoryStats:
+        totals = self.product_totals.get(category_id) or ProductTotals()
+        return CategoryStats.from_totals(
+            category_id, totals.product_count, totals.price_sum, totals.min_price, totals.max_price
+        )
+
+    def create_dto_to_model(self, create_dto: CreateCategoryDTO, now: datetime) -> Category:
+        return Category(
+            id=create_dto.id,
+            name=create_dto.name,
+            created_at=now,
+            updated_at=now,
+        )
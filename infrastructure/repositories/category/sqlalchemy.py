@@ -1,7 +1,12 @@
+import uuid
+
+from sqlalchemy import select, func, Select
+
+from abstractions.repositories.abstract import NotFoundException
 from abstractions.repositories.category import UpdateCategoryDTO, CreateCategoryDTO, CategoryRepositoryInterface
-from domain import Category as CategoryModel
+from domain import Category as CategoryModel, CategoryStats as CategoryStatsModel
 from infrastructure.repositories.sqlalchemy import AbstractSQLAlchemyRepository
-from infrastructure.repositories.sqlalchemy.entities import Category
+from infrastructure.repositories.sqlalchemy.entities import Category, CategoryStats
 
 
 class SqlAlchemyCategoryRepository(
@@ -10,6 +15,31 @@ class SqlAlchemyCategoryRepository(
     ],
     CategoryRepositoryInterface,
 ):
+    async def get_stats(self, category_id: uuid.UUID) -> CategoryStatsModel:
+        async with self._read_session() as session:
+            row = (await session.execute(self._stats().where(Category.id == category_id))).one_or_none()
+        if row is None:
+            raise NotFoundException(f"Entity with id {category_id} not found")
+        return CategoryStatsModel.from_totals(*row)
+
+    async def get_many_stats(self, category_ids: list[uuid.UUID]) -> list[CategoryStatsModel]:
+        if not category_ids:
+            return []
+        async with self._read_session() as session:
+            rows = (await session.execute(self._stats().where(Category.id.in_(category_ids)))).all()
+        return [CategoryStatsModel.from_totals(*row) for row in rows]
+
+    @staticmethod
+    def _stats() -> Select:
+        # Categories without a stats row yet have no products.
+        return select(
+            Category.id,
+            func.coalesce(CategoryStats.product_count, 0),
+            func.coalesce(CategoryStats.price_sum, 0),
+            CategoryStats.min_price,
+            CategoryStats.max_price,
+        ).outerjoin(CategoryStats, CategoryStats.category_id == Category.id)
+
     def entity_to_model(self, entity: Category) -> CategoryModel:
         return CategoryModel(
             id=entity.id,
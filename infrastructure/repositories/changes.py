@@ -0,0 +1,37 @@
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Iterable
+
+from abstractions.repositories.abstract import Change, ChangeFeed
+from infrastructure.repositories.pagination import encode_cursor, decode_cursor
+
+type ChangeKey = tuple[datetime, uuid.UUID]
+
+# Sorts before every real change, so it is where a feed without a token starts.
+ORIGIN: ChangeKey = (datetime.min, uuid.UUID(int=0))
+
+
+@dataclass
+class ChangeFeedStats:
+    reads: int = 0
+    # How far the horizon trailed the database clock on the last read; it
+    # grows for as long as the oldest open transaction stays open.
+    lag_seconds: float = 0.0
+
+
+def decode_change_token(token: Optional[str]) -> ChangeKey:
+    if not token:
+        return ORIGIN
+    return decode_cursor(token, datetime.fromisoformat, uuid.UUID)
+
+
+def change_feed[Model](changes: Iterable[Change[Model]], limit: int, caught_up: ChangeKey) -> ChangeFeed[Model]:
+    # ``changes`` holds at least the first ``limit + 1`` changes of every
+    # source after the token; merged in commit order, the first ``limit`` of
+    # them are the page. ``caught_up`` is where the next read resumes when
+    # there is nothing new.
+    ordered = sorted(changes, key=lambda change: (change.changed_at, change.id))
+    page = ordered[:limit]
+    last = (page[-1].changed_at, page[-1].id) if page else caught_up
+    return ChangeFeed(changes=page, next_token=encode_cursor(*last), has_more=len(ordered) > limit)
@@ -0,0 +1,39 @@
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+CONSISTENCY_TOKEN_HEADER = "X-Consistency-Token"
+
+
+@dataclass
+class Consistency:
+    token: Optional[float] = None
+    written_at: Optional[float] = None
+
+    def mark_written(self) -> None:
+        self.written_at = time.time()
+
+    # Tokens are wall-clock write times and replica lag is not measured, so
+    # read-your-writes only holds while replicas stay within max_replica_lag
+    # of the primary (and clocks across app instances agree).
+    def requires_primary(self, max_replica_lag: float) -> bool:
+        return self.token is not None and time.time() - self.token < max_replica_lag
+
+
+# Set per request by the HTTP layer; repositories read the client's token from
+# it to route reads and record their writes on it so a fresh token can be issued.
+current_consistency: ContextVar[Optional[Consistency]] = ContextVar("current_consistency", default=None)
+
+
+def encode_token(written_at: float) -> str:
+    return f"{written_at:.6f}"
+
+
+def decode_token(token: Optional[str]) -> Optional[float]:
+    if token is None:
+        return None
+    try:
+        return float(token)
+    except ValueError:
+        return None
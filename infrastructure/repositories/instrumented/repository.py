@@ -0,0 +1,93 @@
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, AsyncIterator, Any, Iterator
+
+from abstractions.repositories.abstract import CRUDRepositoryInterface, Page, BulkCreateResult
+from infrastructure.metrics import Histogram
+
+
+@dataclass
+class InstrumentedRepository[Model, CreateDTO, UpdateDTO](
+    CRUDRepositoryInterface[Model, CreateDTO, UpdateDTO]
+):
+    repository: CRUDRepositoryInterface[Model, CreateDTO, UpdateDTO]
+    histogram: Histogram
+    entity: str
+
+    @contextmanager
+    def _timed(self, method: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.histogram.labels(self.entity, method).observe(time.perf_counter() - started)
+
+    async def create(self, obj: CreateDTO) -> Model:
+        with self._timed("create"):
+            return await self.repository.create(obj)
+
+    async def create_many(self, objs: list[CreateDTO], atomic: bool = True) -> list[BulkCreateResult[Model]]:
+        with self._timed("create_many"):
+            return await self.repository.create_many(objs, atomic)
+
+    async def get(self, obj_id: uuid.UUID) -> Model:
+        with self._timed("get"):
+            return await self.repository.get(obj_id)
+
+    async def get_many(self, obj_ids: list[uuid.UUID]) -> list[Model]:
+        with self._timed("get_many"):
+            return await self.repository.get_many(obj_ids)
+
+    async def update(self, obj_id: uuid.UUID, obj: UpdateDTO) -> None:
+        with self._timed("update"):
+            return await self.repository.update(obj_id, obj)
+
+    async def patch(
+            self, obj_id: uuid.UUID, values: dict[str, Any], expected_updated_at: Optional[datetime] = None
+    ) -> Model:
+        with self._timed("patch"):
+            return await self.repository.patch(obj_id, values, expected_updated_at)
+
+    async def delete(self, obj_id: uuid.UUID) -> None:
+        with self._timed("delete"):
+            return await self.repository.delete(obj_id)
+
+    async def get_all(self, limit: int = 100, offset: int = 0, **kwargs) -> list[Model]:
+        with self._timed("get_all"):
+            return await self.repository.get_all(limit, offset, **kwargs)
+
+    async def get_partial(self, obj_id: uuid.UUID, fields: list[str]) -> dict[str, Any]:
+        with self._timed("get_partial"):
+            return await self.repository.get_partial(obj_id, fields)
+
+    async def get_all_partial(
+            self, fields: list[str], limit: int = 100, offset: int = 0, **kwargs
+    ) -> list[dict[str, Any]]:
+        with self._timed("get_all_partial"):
+            return await self.repository.get_all_partial(fields, limit, offset, **kwargs)
+
+    async def get_page(self, limit: int = 100, cursor: Optional[str] = None, **kwargs) -> Page[Model]:
+        with self._timed("get_page"):
+            return await self.repository.get_page(limit, cursor, **kwargs)
+
+    async def stream(self, **kwargs) -> AsyncIterator[Model]:
+        with self._timed("stream"):
+            async for model in self.repository.stream(**kwargs):
+                yield model
+
+    async def count(self, estimated: bool = False, **kwargs) -> int:
+        with self._timed("count"):
+            return await self.repository.count(estimated, **kwargs)
+
+    async def get_version(self, obj_id: uuid.UUID) -> datetime:
+        with self._timed("get_version"):
+            return await self.repository.get_version(obj_id)
+
+    async def get_versions(
+            self, limit: int = 100, offset: int = 0, cursor: Optional[str] = None, **kwargs
+    ) -> list[tuple[uuid.UUID, datetime]]:
+        with self._timed("get_versions"):
+            return await self.repository.get_versions(limit, offset, cursor, **kwargs)
@@ -0,0 +1,45 @@
+import asyncio
+from typing import Callable, Awaitable, Hashable, Optional
+
+
+class BatchLoader[Key: Hashable, Value]:
+    # Dataloader-style coalescing: every ``load`` made before the event loop
+    # gets back to the dispatch callback joins one ``load_many`` call.
+    def __init__(self, load_many: Callable[[list[Key]], Awaitable[dict[Key, Value]]]):
+        self.load_many = load_many
+        self._pending: Optional[dict[Key, asyncio.Future]] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def load(self, key: Key) -> Optional[Value]:
+        loop = asyncio.get_running_loop()
+        if self._pending is None:
+            self._pending = {}
+            loop.call_soon(self._dispatch)
+        future = self._pending.get(key)
+        if future is None:
+            future = self._pending[key] = loop.create_future()
+        # Shielded so a cancelled caller does not cancel the result for the
+        # other callers waiting on the same key.
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        pending, self._pending = self._pending, None
+        task = asyncio.ensure_future(self._run(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, pending: dict[Key, asyncio.Future]) -> None:
+        try:
+            values = await self.load_many(list(pending))
+        except asyncio.CancelledError:
+            for future in pending.values():
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key, future in pending.items():
+            if not future.done():
+                future.set_result(values.get(key))
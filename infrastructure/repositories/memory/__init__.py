@@ -0,0 +1,2 @@
+from .repository import InMemoryRepository
+from .snapshot import read_snapshot
@@ -0,0 +1,245 @@
+import dataclasses
+import uuid
+from abc import abstractmethod
+from bisect import bisect_left, insort
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Type, Optional, AsyncIterator, Any, ClassVar, Iterator, Iterable
+
+from abstractions.repositories.abstract import (
+    CRUDRepositoryInterface, AlreadyExistsException, NotFoundException, Page, BulkCreateResult,
+    PreconditionFailedException
+)
+from infrastructure.repositories.pagination import encode_cursor, decode_cursor
+
+type ListingKey = tuple[datetime, uuid.UUID]
+
+
+@dataclass
+class InMemoryRepository[Model, CreateDTO, UpdateDTO](
+    CRUDRepositoryInterface[Model, CreateDTO, UpdateDTO]
+):
+    # Fields with a hash index. Each index maps a value to that value's rows
+    # as a sorted list of listing keys, so filtered listings come out ordered
+    # without sorting.
+    indexed_fields: ClassVar[tuple[str, ...]] = ()
+    stream_batch_size: ClassVar[int] = 1000
+
+    def __post_init__(self):
+        self.model: Type[Model] = self.__orig_bases__[0].__args__[0] # noqa
+        self.field_types: dict[str, type] = {field.name: field.type for field in fields(self.model)}
+        self._rows: dict[uuid.UUID, Model] = {}
+        # Listing keys (created_at, id) in ascending order; listings walk it
+        # backwards, matching ORDER BY created_at DESC, id DESC.
+        self._order: list[ListingKey] = []
+        self._indexes: dict[str, dict[Any, list[ListingKey]]] = {name: {} for name in self.indexed_fields}
+
+    def load(self, models: Iterable[Model]) -> None:
+        for model in models:
+            self._rows[model.id] = model
+        self._order = sorted((model.created_at, model.id) for model in self._rows.values())
+        self._indexes = {name: {} for name in self.indexed_fields}
+        for key in self._order:
+            model = self._rows[key[1]]
+            for name, index in self._indexes.items():
+                index.setdefault(getattr(model, name), []).append(key)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, obj_id: uuid.UUID) -> bool:
+        return obj_id in self._rows
+
+    async def create(self, obj: CreateDTO) -> Model:
+        model = self._normalize(self.create_dto_to_model(obj, self._now()))
+        if model.id in self._rows:
+            raise AlreadyExistsException("Unique constraint violation")
+        self.check_constraints(model)
+        self._add(model)
+        return model
+
+    async def create_many(self, objs: list[CreateDTO], atomic: bool = True) -> list[BulkCreateResult[Model]]:
+        now = self._now()
+        models = [self._normalize(self.create_dto_to_model(obj, now)) for obj in objs]
+        results = [BulkCreateResult(index=index) for index in range(len(models))]
+        seen = set()
+        for result, model in zip(results, models):
+            try:
+                if model.id in self._rows or model.id in seen:
+                    raise AlreadyExistsException(f"Integrity constraint violation: duplicate id {model.id}")
+                self.check_constraints(model)
+                seen.add(model.id)
+            except AlreadyExistsException as e:
+                if atomic:
+                    raise
+                result.error = str(e)
+        for result, model in zip(results, models):
+            if result.error is None:
+                self._add(model)
+                result.item = model
+        return results
+
+    async def get(self, obj_id: uuid.UUID) -> Model:
+        model = self._rows.get(obj_id)
+        if model is None:
+            raise NotFoundException(f"Entity with id {obj_id} not found")
+        return model
+
+    async def get_many(self, obj_ids: list[uuid.UUID]) -> list[Model]:
+        return [self._rows[obj_id] for obj_id in dict.fromkeys(obj_ids) if obj_id in self._rows]
+
+    async def update(self, obj_id: uuid.UUID, obj: UpdateDTO) -> None:
+        await self.patch(obj_id, obj.__dict__)
+
+    async def patch(
+            self, obj_id: uuid.UUID, values: dict[str, Any], expected_updated_at: Optional[datetime] = None
+    ) -> Model:
+        model = self._rows.get(obj_id)
+        if model is None:
+            raise NotFoundException(f"Entity with id {obj_id} not found")
+        if expected_updated_at is not None and model.updated_at != expected_updated_at:
+            raise PreconditionFailedException(f"Entity with id {obj_id} was modified")
+        values = {name: self._coerce(name, value) for name, value in values.items()}
+        patched = dataclasses.replace(model, **values, updated_at=self._now())
+        self.check_constraints(patched)
+        self._remove(model)
+        self._add(patched)
+        return patched
+
+    async def delete(self, obj_id: uuid.UUID) -> None:
+        model = self._rows.get(obj_id)
+        if model is not None:
+            self._remove(model)
+
+    async def get_all(self, limit: int = 100, offset: int = 0, **kwargs) -> list[Model]:
+        return list(islice(self._listing(None, **kwargs), offset, offset + limit))
+
+    async def get_partial(self, obj_id: uuid.UUID, fields: list[str]) -> dict[str, Any]:
+        return self._project(await self.get(obj_id), fields)
+
+    async def get_all_partial(
+            self, fields: list[str], limit: int = 100, offset: int = 0, **kwargs
+    ) -> list[dict[str, Any]]:
+        return [self._project(model, fields) for model in await self.get_all(limit, offset, **kwargs)]
+
+    async def get_page(self, limit: int = 100, cursor: Optional[str] = None, **kwargs) -> Page[Model]:
+        models = list(islice(self._listing(self._seek(cursor), **kwargs), limit + 1))
+        items = models[:limit]
+        next_cursor = None
+        if items and len(models) > limit:
+            next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+        return Page(items=items, next_cursor=next_cursor)
+
+    async def stream(self, **kwargs) -> AsyncIterator[Model]:
+        # Batches are re-seeked from the last key, so writes made while the
+        # consumer is suspended cannot shift positions under the iteration.
+        key = None
+        while batch := list(islice(self._listing(key, **kwargs), self.stream_batch_size)):
+            for model in batch:
+                yield model
+            key = (batch[-1].created_at, batch[-1].id)
+
+    async def count(self, estimated: bool = False, **kwargs) -> int:
+        # Counting is a walk over the smallest matching index, cheap enough
+        # that estimates are just exact counts.
+        if not kwargs:
+            return len(self._rows)
+        return sum(1 for _ in self._listing(None, **kwargs))
+
+    async def get_version(self, obj_id: uuid.UUID) -> datetime:
+        return (await self.get(obj_id)).updated_at
+
+    async def get_versions(
+            self, limit: int = 100, offset: int = 0, cursor: Optional[str] = None, **kwargs
+    ) -> list[tuple[uuid.UUID, datetime]]:
+        if cursor is not None:
+            models = islice(self._listing(self._seek(cursor), **kwargs), limit)
+        else:
+            models = islice(self._listing(None, **kwargs), offset, offset + limit)
+        return [(model.id, model.updated_at) for model in models]
+
+    def _listing(self, before: Optional[ListingKey], **kwargs) -> Iterator[Model]:
+        # Same semantics as the SQL listing: equality on every filter, newest
+        # first by (created_at, id), optionally strictly before a seek key.
+        filters = {name: self._coerce(name, value) for name, value in kwargs.items()}
+        keys = self._order
+        for name, value in filters.items():
+            if name in self._indexes:
+                candidates = self._indexes[name].get(value, [])
+                if len(candidates) < len(keys):
+                    keys = candidates
+        end = len(keys) if before is None else bisect_left(keys, before)
+        for position in range(end - 1, -1, -1):
+            model = self._rows[keys[position][1]]
+            if all(getattr(model, name) == value for name, value in filters.items()):
+                yield model
+
+    @staticmethod
+    def _seek(cursor: Optional[str]) -> Optional[ListingKey]:
+        if not cursor:
+            return None
+        return decode_cursor(cursor, datetime.fromisoformat, uuid.UUID)
+
+    def _project(self, model: Model, fields: list[str]) -> dict[str, Any]:
+        unknown = [name for name in fields if name not in self.field_types]
+        if unknown:
+            raise ValueError(f"{self.model.__name__} has no fields {', '.join(unknown)}")
+        return {name: getattr(model, name) for name in fields}
+
+    def _coerce(self, name: str, value: Any) -> Any:
+        # Query parameters arrive as strings; the database casts them to the
+        # column type, so do the same before comparing.
+        field_type = self.field_types.get(name)
+        if field_type is None:
+            raise AttributeError(f"{self.model.__name__} has no field {name}")
+        if value is None or isinstance(value, field_type):
+            return value
+        if field_type is datetime:
+            return datetime.fromisoformat(value)
+        if field_type is uuid.UUID:
+            return uuid.UUID(str(value))
+        coerced = field_type(value)
+        # int() truncates; the database rejects what it cannot store exactly.
+        if field_type is int and coerced != value and not isinstance(value, str):
+            raise ValueError(f"{self.model.__name__}.{name} must be an integer, got {value!r}")
+        return coerced
+
+    def _normalize(self, model: Model) -> Model:
+        for name in self.field_types:
+            setattr(model, name, self._coerce(name, getattr(model, name)))
+        return model
+
+    def _add(self, model: Model) -> None:
+        key = (model.created_at, model.id)
+        self._rows[model.id] = model
+        insort(self._order, key)
+        for name, index in self._indexes.items():
+            insort(index.setdefault(getattr(model, name), []), key)
+
+    def _remove(self, model: Model) -> None:
+        key = (model.created_at, model.id)
+        del self._rows[model.id]
+        _discard(self._order, key)
+        for name, index in self._indexes.items():
+            value = getattr(model, name)
+            _discard(index[value], key)
+            if not index[value]:
+                del index[value]
+
+    @staticmethod
+    def _now() -> datetime:
+        return datetime.now(timezone.utc).replace(tzinfo=None)
+
+    def check_constraints(self, model: Model) -> None:
+        pass
+
+    @abstractmethod
+    def create_dto_to_model(self, create_dto: CreateDTO, now: datetime) -> Model:
+        pass
+
+
+def _discard(keys: list[ListingKey], key: ListingKey) -> None:
+    position = bisect_left(keys, key)
+    if position < len(keys) and keys[position] == key:
+        del keys[position]
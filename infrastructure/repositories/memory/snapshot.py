@@ -0,0 +1,24 @@
+import json
+import uuid
+from dataclasses import fields
+from datetime import datetime
+from pathlib import Path
+from typing import Type, Iterator, Any
+
+
+def read_snapshot[Model](path: Path, model: Type[Model]) -> Iterator[Model]:
+    # NDJSON in the shape written by GET /products/export?format=ndjson.
+    field_types = {field.name: field.type for field in fields(model)}
+    with path.open(encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                record = json.loads(line)
+                yield model(**{name: _parse(field_type, record[name]) for name, field_type in field_types.items()})
+
+
+def _parse(field_type: type, value: Any) -> Any:
+    if field_type is uuid.UUID:
+        return uuid.UUID(value)
+    if field_type is datetime:
+        return datetime.fromisoformat(value)
+    return field_type(value)
@@ -1 +1,4 @@
-from .sqlalchemy import SqlAlchemyProductRepository
\ No newline at end of file
+from .sqlalchemy import SqlAlchemyProductRepository
+from .cached import CachedProductRepository
+from .instrumented import InstrumentedProductRepository
+from .memory import InMemoryProductRepository
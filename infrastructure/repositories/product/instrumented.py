@@ -0,0 +1,26 @@
+from typing import Optional
+
+from abstractions.repositories import ProductRepositoryInterface
+from abstractions.repositories.abstract import Page, ChangeFeed
+from abstractions.repositories.product import UpdateProductDTO, CreateProductDTO, ProductColumns
+from domain import Product
+from infrastructure.repositories.instrumented import InstrumentedRepository
+
+
+class InstrumentedProductRepository(
+    InstrumentedRepository[
+        Product, CreateProductDTO, UpdateProductDTO
+    ],
+    ProductRepositoryInterface,
+):
+    async def search(self, query: str, limit: int = 100, cursor: Optional[str] = None) -> Page[Product]:
+        with self._timed("search"):
+            return await self.repository.search(query, limit, cursor)
+
+    async def get_all_columnar(self, limit: int = 100, offset: int = 0, **kwargs) -> ProductColumns:
+        with self._timed("get_all_columnar"):
+            return await self.repository.get_all_columnar(limit, offset, **kwargs)
+
+    async def changes(self, since: Optional[str] = None, limit: int = 1000) -> ChangeFeed[Product]:
+        with self._timed("changes"):
+            return await self.repository.changes(since, limit)
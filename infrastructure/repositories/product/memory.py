@@ -0,0 +1,186 @@
+import re
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from typing import Optional, Iterable, Any, Literal
+
+from abstractions.repositories import ProductRepositoryInterface
+from abstractions.repositories.abstract import Page, AlreadyExistsException, Change, ChangeFeed, BulkCreateResult
+from abstractions.repositories.product import UpdateProductDTO, CreateProductDTO, ProductColumns, ProductEvent
+from domain import Product
+from infrastructure.events import EventHub
+from infrastructure.repositories.category.memory import InMemoryCategoryRepository, ProductTotals
+from infrastructure.repositories.changes import change_feed, decode_change_token
+from infrastructure.repositories.memory import InMemoryRepository
+from infrastructure.repositories.pagination import encode_cursor, decode_cursor
+
+_WORD = re.compile(r"\w+")
+_SIMILARITY_THRESHOLD = 0.3
+
+
+@dataclass
+class InMemoryProductRepository(
+    InMemoryRepository[
+        Product, CreateProductDTO, UpdateProductDTO
+    ],
+    ProductRepositoryInterface,
+):
+    indexed_fields = ("sku", "category_id")
+
+    categories: Optional[InMemoryCategoryRepository] = None
+    # Stands in for NOTIFY/LISTEN: events go straight to the hub.
+    events: Optional[EventHub[ProductEvent]] = None
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.tombstones: dict[uuid.UUID, datetime] = {}
+
+    def load(self, models: Iterable[Product]) -> None:
+        super().load(models)
+        if self.categories is not None:
+            self.categories.product_totals.clear()
+            for model in self._rows.values():
+                self._totals(model.category_id).add(model.price)
+
+    def _add(self, model: Product) -> None:
+        super()._add(model)
+        if self.categories is not None:
+            self._totals(model.category_id).add(model.price)
+
+    def _remove(self, model: Product) -> None:
+        super()._remove(model)
+        if self.categories is not None and self._totals(model.category_id).remove(model.price):
+            keys = self._indexes["category_id"].get(model.category_id, ())
+            self._totals(model.category_id).reset_range(self._rows[obj_id].price for _, obj_id in keys)
+
+    def _totals(self, category_id: uuid.UUID) -> ProductTotals:
+        return self.categories.product_totals.setdefault(category_id, ProductTotals())
+
+    def check_constraints(self, model: Product) -> None:
+        if self.categories is not None and model.category_id not in self.categories:
+            raise AlreadyExistsException(
+                f"Integrity constraint violation: category {model.category_id} does not exist"
+            )
+
+    async def search(self, query: str, limit: int = 100, cursor: Optional[str] = None) -> Page[Product]:
+        # A linear scan approximating the SQL search: every query word must
+        # occur in the product (websearch AND semantics, 'simple' config), or
+        # the name or SKU must be trigram-similar to the query. Rank weighs
+        # name/SKU hits over description hits, plus the best similarity.
+        terms = set(_words(query))
+        query_trigrams = _trigrams(query)
+        ranked = []
+        for model in self._rows.values():
+            rank = self._rank(model, terms, query_trigrams)
+            if rank is not None:
+                ranked.append((rank, model.id, model))
+        ranked.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        if cursor:
+            after = decode_cursor(cursor, float, uuid.UUID)
+            ranked = [item for item in ranked if (item[0], item[1]) < after]
+        page = ranked[:limit + 1]
+        items = [model for _, _, model in page[:limit]]
+        next_cursor = None
+        if items and len(page) > limit:
+            next_cursor = encode_cursor(page[limit - 1][0], items[-1].id)
+        return Page(items=items, next_cursor=next_cursor)
+
+    @staticmethod
+    def _rank(model: Product, terms: set[str], query_trigrams: set[str]) -> Optional[float]:
+        primary = set(_words(model.name)) | set(_words(model.sku))
+        secondary = set(_words(model.description))
+        matched = bool(terms) and terms <= primary | secondary
+        similarity = max(_similarity(query_trigrams, _trigrams(model.name)),
+                         _similarity(query_trigrams, _trigrams(model.sku)))
+        if not matched and similarity < _SIMILARITY_THRESHOLD:
+            return None
+        text_rank = sum(0.1 if term in primary else 0.04 for term in terms) if matched else 0.0
+        return text_rank + similarity
+
+    async def create(self, obj: CreateProductDTO) -> Product:
+        model = await super().create(obj)
+        self._publish("create", model)
+        return model
+
+    async def create_many(self, objs: list[CreateProductDTO], atomic: bool = True) -> list[BulkCreateResult[Product]]:
+        results = await super().create_many(objs, atomic)
+        for result in results:
+            if result.item is not None:
+                self._publish("create", result.item)
+        return results
+
+    async def patch(
+            self, obj_id: uuid.UUID, values: dict[str, Any], expected_updated_at: Optional[datetime] = None
+    ) -> Product:
+        previous = self._rows.get(obj_id)
+        model = await super().patch(obj_id, values, expected_updated_at)
+        self._publish("update", model, previous.category_id)
+        return model
+
+    async def delete(self, obj_id: uuid.UUID) -> None:
+        model = self._rows.get(obj_id)
+        if model is not None:
+            await super().delete(obj_id)
+            self.tombstones[obj_id] = self._now()
+            self._publish("delete", model)
+
+    def _publish(
+            self, op: Literal["create", "update", "delete"], model: Product,
+            previous_category_id: Optional[uuid.UUID] = None,
+    ) -> None:
+        if self.events is not None:
+            self.events.publish(ProductEvent(
+                op, model.id, model.category_id, None if op == "delete" else model, previous_category_id
+            ))
+
+    async def changes(self, since: Optional[str] = None, limit: int = 1000) -> ChangeFeed[Product]:
+        # Writes apply instantly here, so there are no in-flight transactions
+        # to hold the feed back and everything up to now can be read.
+        after = decode_change_token(since)
+        changes = [
+            Change("upsert", model.id, model.updated_at, model)
+            for model in self._rows.values() if (model.updated_at, model.id) > after
+        ]
+        changes.extend(
+            Change("delete", obj_id, deleted_at)
+            for obj_id, deleted_at in self.tombstones.items() if (deleted_at, obj_id) > after
+        )
+        return change_feed(changes, limit, after)
+
+    async def get_all_columnar(self, limit: int = 100, offset: int = 0, **kwargs) -> ProductColumns:
+        names = list(self.field_types)
+        return ProductColumns.from_rows(
+            tuple(getattr(model, name) for name in names)
+            for model in islice(self._listing(None, **kwargs), offset, offset + limit)
+        )
+
+    def create_dto_to_model(self, create_dto: CreateProductDTO, now: datetime) -> Product:
+        return Product(
+            id=create_dto.id,
+            sku=create_dto.sku,
+            name=create_dto.name,
+            price=create_dto.price,
+            description=create_dto.description,
+            category_id=create_dto.category_id,
+            created_at=now,
+            updated_at=now,
+        )
+
+
+def _words(text: str) -> list[str]:
+    return _WORD.findall(text.lower())
+
+
+def _trigrams(text: str) -> set[str]:
+    trigrams = set()
+    for word in _words(text):
+        padded = f"  {word} "
+        trigrams.update(padded[position:position + 3] for position in range(len(padded) - 2))
+    return trigrams
+
+
+def _similarity(left: set[str], right: set[str]) -> float:
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
@@ -1,17 +1,221 @@
+import uuid
+from dataclasses import dataclass, field
+from typing import Optional, Literal
+
+from sqlalchemy import (
+    select, update, func, or_, cast, tuple_, Double, Insert, TIMESTAMP, table, column, text, union,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from abstractions.repositories import ProductRepositoryInterface
-from abstractions.repositories.product import UpdateProductDTO, CreateProductDTO
+from abstractions.repositories.abstract import Page, Change, ChangeFeed
+from abstractions.repositories.product import UpdateProductDTO, CreateProductDTO, ProductColumns, ProductEvent
 from domain import Product as ProductModel
+from infrastructure.events.product import PRODUCT_EVENTS_CHANNEL, encode_product_event
+from infrastructure.profiling import timed_mapping
+from infrastructure.repositories.changes import change_feed, decode_change_token, ChangeFeedStats
+from infrastructure.repositories.pagination import encode_cursor, decode_cursor
 from infrastructure.repositories.sqlalchemy import AbstractSQLAlchemyRepository
 
-from infrastructure.repositories.sqlalchemy.entities import Product
+from infrastructure.repositories.sqlalchemy.entities import Product, Category, CategoryStats, ProductTombstone
+
+pg_stat_activity = table(
+    "pg_stat_activity", column("datname"), column("pid"), column("xact_start"), column("backend_type"),
+    column("state"),
+)
 
+notify_all = text("SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload")
 
+
+@dataclass
 class SqlAlchemyProductRepository(
     AbstractSQLAlchemyRepository[
         Product, ProductModel, CreateProductDTO, UpdateProductDTO
     ],
     ProductRepositoryInterface,
 ):
+    write_tracked_fields = ("price", "category_id")
+
+    # NOTIFY serializes committing transactions on a global lock, so writes
+    # only publish events when something is listening for them.
+    publish_events: bool = False
+    change_feed_stats: ChangeFeedStats = field(default_factory=ChangeFeedStats)
+    search_candidates: int = 1000
+
+    async def search(self, query: str, limit: int = 100, cursor: Optional[str] = None) -> Page[ProductModel]:
+        ts_query = func.websearch_to_tsquery('simple', query)
+        # Ranking costs as much as the rows it ranks, so each kind of match
+        # only hands over search_candidates rows: any text matches the GIN
+        # index yields first, and the nearest names and SKUs by trigram
+        # distance, walked in order from the GiST indexes. Results and their
+        # cursors only ever cover these candidates.
+        candidates = union(
+            select(Product.id)
+            .where(Product.search_vector.op('@@')(ts_query))
+            .limit(self.search_candidates),
+            select(Product.id)
+            .where(Product.name.op('%')(query))
+            .order_by(Product.name.op('<->')(query))
+            .limit(self.search_candidates),
+            select(Product.id)
+            .where(Product.sku.op('%')(query))
+            .order_by(Product.sku.op('<->')(query))
+            .limit(self.search_candidates),
+        ).subquery()
+        rank = cast(
+            func.ts_rank_cd(Product.search_vector, ts_query)
+            + func.greatest(func.similarity(Product.name, query), func.similarity(Product.sku, query)),
+            Double,
+        )
+        stm = (
+            select(*self.columns, rank)
+            .join(candidates, candidates.c.id == Product.id)
+            .order_by(rank.desc(), Product.id.desc())
+        )
+        if cursor:
+            cursor_rank, cursor_id = decode_cursor(cursor, float, uuid.UUID)
+            stm = stm.where(tuple_(rank, Product.id) < tuple_(cursor_rank, cursor_id))
+        async with self._read_session() as session:
+            rows = (await session.execute(stm.limit(limit + 1))).all()
+        with timed_mapping():
+            items = [self.model(*row[:-1]) for row in rows[:limit]]
+        next_cursor = None
+        if items and len(rows) > limit:
+            next_cursor = encode_cursor(rows[limit - 1][-1], items[-1].id)
+        return Page(items=items, next_cursor=next_cursor)
+
+    async def get_all_columnar(self, limit: int = 100, offset: int = 0, **kwargs) -> ProductColumns:
+        stm = self._listing(select(*self.columns), **kwargs).limit(limit).offset(offset)
+        async with self._read_session() as session:
+            rows = (await session.execute(stm)).all()
+        with timed_mapping():
+            return ProductColumns.from_rows(rows)
+
+    async def changes(self, since: Optional[str] = None, limit: int = 1000) -> ChangeFeed[ProductModel]:
+        after = decode_change_token(since)
+        # Change times are transaction start times (now()), but rows only
+        # become visible at commit, so a long transaction can commit changes
+        # older than ones already read. Reading only up to the start of the
+        # oldest transaction still open keeps the feed from stepping past them.
+        # Only client sessions inside a transaction that can still commit count,
+        # but any of them, on any table, holds the feed back for every reader
+        # until it ends; change_feed_stats.lag_seconds shows how far behind it is.
+        # Sessions of other roles are only visible with pg_read_all_stats.
+        horizon = (
+            select(func.coalesce(func.min(pg_stat_activity.c.xact_start), func.now()))
+            .where(pg_stat_activity.c.datname == func.current_database())
+            .where(pg_stat_activity.c.pid != func.pg_backend_pid())
+            .where(pg_stat_activity.c.backend_type == "client backend")
+            .where(pg_stat_activity.c.state.notin_(("idle", "idle in transaction (aborted)")))
+            .scalar_subquery()
+        )
+        async with self.session_maker() as session:
+            horizon, lag = (await session.execute(select(
+                cast(horizon, TIMESTAMP), func.extract("epoch", func.now() - horizon)
+            ))).one()
+            self.change_feed_stats.reads += 1
+            self.change_feed_stats.lag_seconds = float(lag)
+            upserts = (await session.execute(
+                select(*self.columns)
+                .where(tuple_(Product.updated_at, Product.id) > tuple_(*after))
+                .where(Product.updated_at < horizon)
+                .order_by(Product.updated_at, Product.id)
+                .limit(limit + 1)
+            )).all()
+            deletes = (await session.execute(
+                select(ProductTombstone.id, ProductTombstone.deleted_at)
+                .where(tuple_(ProductTombstone.deleted_at, ProductTombstone.id) > tuple_(*after))
+                .where(ProductTombstone.deleted_at < horizon)
+                .order_by(ProductTombstone.deleted_at, ProductTombstone.id)
+                .limit(limit + 1)
+            )).all()
+        with timed_mapping():
+            changes = [Change("upsert", row.id, row.updated_at, self.model(*row)) for row in upserts]
+        changes.extend(Change("delete", row.id, row.deleted_at) for row in deletes)
+        # Everything before the horizon has been read once the feed is empty.
+        caught_up = max(after, (horizon, uuid.UUID(int=0)))
+        return change_feed(changes, limit, caught_up)
+
+    async def _on_write(self, session: AsyncSession, added: list[ProductModel], removed: list[ProductModel]) -> None:
+        # Removed rows that are not re-added were deleted; their tombstones are
+        # what the change feed reports deletes from.
+        added_ids = {model.id for model in added}
+        deleted_ids = sorted({model.id for model in removed if model.id not in added_ids})
+        if deleted_ids:
+            stm = insert(ProductTombstone).values([{"id": obj_id} for obj_id in deleted_ids])
+            await session.execute(stm.on_conflict_do_update(
+                index_elements=[ProductTombstone.id], set_={"deleted_at": func.now()}
+            ))
+
+        # Keeps category_stats in step with the write: counts and sums take
+        # deltas, min/max widen on insert, and a category is rescanned (through
+        # the category_id/price index) only when one of its extremes is removed.
+        totals: dict[uuid.UUID, list] = {}
+        for model in added:
+            count, price_sum, min_price, max_price = totals.get(model.category_id, (0, 0, None, None))
+            totals[model.category_id] = [
+                count + 1,
+                price_sum + model.price,
+                model.price if min_price is None else min(min_price, model.price),
+                model.price if max_price is None else max(max_price, model.price),
+            ]
+        for model in removed:
+            count, price_sum, min_price, max_price = totals.get(model.category_id, (0, 0, None, None))
+            totals[model.category_id] = [count - 1, price_sum - model.price, min_price, max_price]
+        if not totals:
+            return
+
+        # Upserting in key order keeps concurrent writers locking rows in the same order.
+        stm = insert(CategoryStats).values([
+            {"category_id": category_id, "product_count": count, "price_sum": price_sum,
+             "min_price": min_price, "max_price": max_price}
+            for category_id, (count, price_sum, min_price, max_price) in sorted(totals.items())
+        ])
+        stm = stm.on_conflict_do_update(
+            index_elements=[CategoryStats.category_id],
+            set_={
+                "product_count": CategoryStats.product_count + stm.excluded.product_count,
+                "price_sum": CategoryStats.price_sum + stm.excluded.price_sum,
+                "min_price": func.least(CategoryStats.min_price, stm.excluded.min_price),
+                "max_price": func.greatest(CategoryStats.max_price, stm.excluded.max_price),
+            },
+        )
+        await session.execute(stm)
+
+        for model in removed:
+            prices = select(Product.price).where(Product.category_id == model.category_id)
+            await session.execute(
+                update(CategoryStats)
+                .where(CategoryStats.category_id == model.category_id)
+                .where(or_(CategoryStats.min_price == model.price, CategoryStats.max_price == model.price))
+                .values(
+                    min_price=prices.with_only_columns(func.min(Product.price)).scalar_subquery(),
+                    max_price=prices.with_only_columns(func.max(Product.price)).scalar_subquery(),
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+    async def _on_changed(
+            self,
+            session: AsyncSession,
+            op: Literal["create", "update", "delete"],
+            models: list[ProductModel],
+            previous: Optional[list[ProductModel]] = None,
+    ) -> None:
+        # Notifications are delivered when (and only if) the write commits,
+        # in commit order.
+        if not self.publish_events or not models:
+            return
+        payloads = [
+            encode_product_event(ProductEvent(
+                op, model.id, model.category_id, None if op == "delete" else model,
+                None if previous is None else previous[index].category_id,
+            ))
+            for index, model in enumerate(models)
+        ]
+        await session.execute(notify_all, {"channel": PRODUCT_EVENTS_CHANNEL, "payloads": payloads})
+
     def entity_to_model(self, entity: Product) -> ProductModel:
         return ProductModel(
             id=entity.id,
@@ -54,3 +258,31 @@ class SqlAlchemyProductRepository(
             description=update_dto.description,
             category_id=update_dto.category_id,
         )
+
+
+def refresh_category_stats() -> Insert:
+    # Rebuilds every category's row from the products table, for loads that
+    # bypass the repository.
+    totals = (
+        select(
+            Category.id,
+            func.count(Product.id),
+            func.coalesce(func.sum(Product.price), 0),
+            func.min(Product.price),
+            func.max(Product.price),
+        )
+        .outerjoin(Product, Product.category_id == Category.id)
+        .group_by(Category.id)
+    )
+    stm = insert(CategoryStats).from_select(
+        ["category_id", "product_count", "price_sum", "min_price", "max_price"], totals
+    )
+    return stm.on_conflict_do_update(
+        index_elements=[CategoryStats.category_id],
+        set_={
+            "product_count": stm.excluded.product_count,
+            "price_sum": stm.excluded.price_sum,
+            "min_price": stm.excluded.min_price,
+            "max_price": stm.excluded.max_price,
+        },
+    )
@@ -0,0 +1,53 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Callable, Awaitable, Hashable
+
+
+@dataclass
+class SingleFlightStats:
+    flights: int = 0
+    coalesced: int = 0
+    cancelled: int = 0
+
+
+@dataclass
+class _Flight:
+    task: asyncio.Task
+    waiters: int = 0
+
+
+@dataclass
+class SingleFlight[Key: Hashable, Value]:
+    # Identical calls in flight at the same time share one execution: the
+    # first caller starts it as a task, later callers with the same key await
+    # that task instead of running their own.
+    stats: SingleFlightStats = field(default_factory=SingleFlightStats)
+    _flights: dict[Key, _Flight] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: Key, call: Callable[[], Awaitable[Value]]) -> Value:
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._flights[key] = _Flight(asyncio.ensure_future(call()))
+            flight.task.add_done_callback(lambda _: self._land(key, flight))
+            self.stats.flights += 1
+        else:
+            self.stats.coalesced += 1
+        flight.waiters += 1
+        try:
+            # Shielded so one caller giving up does not cancel the call for the
+            # others; errors and results reach every waiter alike.
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                # Everyone waiting was cancelled: nobody needs the result.
+                self._land(key, flight)
+                flight.task.cancel()
+                self.stats.cancelled += 1
+
+    def _land(self, key: Key, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
@@ -1 +1,2 @@
-from .abstract import AbstractSQLAlchemyRepository
\ No newline at end of file
+from .abstract import AbstractSQLAlchemyRepository
+from .engine import InstrumentedQueuePool, PoolStats, warm_up
@@ -1,12 +1,27 @@
+import itertools
+import uuid
 from abc import abstractmethod
-from dataclasses import dataclass
-from typing import Type
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, fields, field, replace
+from datetime import datetime
+from typing import Type, Optional, AsyncIterator, Any, ClassVar, Literal
 
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, insert, update, func, tuple_, Select
 from sqlalchemy.exc import IntegrityError, NoResultFound
-from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
 
-from abstractions.repositories.abstract import CRUDRepositoryInterface, AlreadyExistsException, NotFoundException
+from abstractions.repositories.abstract import (
+    CRUDRepositoryInterface, AlreadyExistsException, NotFoundException, Page, BulkCreateResult,
+    PreconditionFailedException
+)
+from infrastructure.repositories.batcher import WriteBatcher
+from infrastructure.repositories.cache import LRUCache, MISSING
+from infrastructure.repositories.consistency import current_consistency
+from infrastructure.repositories.loader import BatchLoader
+from infrastructure.repositories.singleflight import SingleFlight
+from infrastructure.profiling import timed_mapping
+from infrastructure.repositories.pagination import encode_cursor, decode_cursor
+from infrastructure.repositories.sqlalchemy.explain import Explain, planned_rows
 
 
 @dataclass
@@ -14,59 +29,382 @@ class AbstractSQLAlchemyRepository[Entity, Model, CreateDTO, UpdateDTO](
     CRUDRepositoryInterface[Model, CreateDTO, UpdateDTO]
 ):
     session_maker: async_sessionmaker
+    bulk_chunk_size: int = 1000
+    stream_batch_size: int = 1000
+    replica_session_makers: list[async_sessionmaker] = field(default_factory=list)
+    max_replica_lag: float = 5.0
+    count_cache: Optional[LRUCache] = None
+    batch_gets: bool = True
+    single_flight: bool = True
+    write_batch_window: float = 0.0
+    write_batch_size: int = 100
+    # Patching any of these fields returns their previous values with the
+    # update, and ``_on_write`` sees the replaced row when one of them changed.
+    write_tracked_fields: ClassVar[tuple[str, ...]] = ()
 
     def __post_init__(self):
         self.entity: Type[Entity] = self.__orig_bases__[0].__args__[0] # noqa
+        self.model: Type[Model] = self.__orig_bases__[0].__args__[1] # noqa
+        # Reads select plain columns in model field order and build models
+        # positionally, skipping ORM hydration; writes keep going through the ORM.
+        self.columns = tuple(getattr(self.entity, model_field.name) for model_field in fields(self.model))
+        self._columns_by_name = {column.key: column for column in self.columns}
+        self._replicas = itertools.cycle(self.replica_session_makers)
+        self._loader = BatchLoader(self._load_many)
+        self.flights = SingleFlight()
+        self._create_batcher = None
+        if self.write_batch_window > 0:
+            self._create_batcher = WriteBatcher(
+                lambda objs: self.create_many(objs, atomic=False), self.write_batch_window, self.write_batch_size
+            )
+
+    def _read_session(self) -> AsyncSession:
+        # Reads go round-robin to the replicas unless the client presented a
+        # consistency token young enough that a replica may not have caught up.
+        if not self.replica_session_makers or self._requires_primary():
+            return self.session_maker()
+        return next(self._replicas)()
+
+    def _requires_primary(self) -> bool:
+        consistency = current_consistency.get()
+        return consistency is not None and consistency.requires_primary(self.max_replica_lag)
+
+    @asynccontextmanager
+    async def _write_session(self) -> AsyncIterator[AsyncSession]:
+        async with self.session_maker() as session:
+            yield session
+        self._mark_written()
+        if self.count_cache is not None:
+            self.count_cache.clear()
+
+    @staticmethod
+    def _mark_written() -> None:
+        consistency = current_consistency.get()
+        if consistency is not None:
+            consistency.mark_written()
 
     async def create(self, obj: CreateDTO) -> Model:
+        if self._create_batcher is not None:
+            # The batch commits in another task; the caller's own consistency
+            # state still has to record the write.
+            result = await self._create_batcher.submit(obj)
+            if result.error is not None:
+                raise AlreadyExistsException(result.error)
+            self._mark_written()
+            return result.item
         entity = self.create_dto_to_entity(obj)
-        async with self.session_maker() as session:
+        async with self._write_session() as session:
             try:
                 async with session.begin():
                     session.add(entity)
                     await session.flush()
-                    return self.entity_to_model(entity)
+                    model = self.entity_to_model(entity)
+                    await self._on_write(session, [model], [])
+                    await self._on_changed(session, "create", [model])
+                    return model
             except IntegrityError as e:
                 raise AlreadyExistsException("Unique constraint violation") from e
 
+    async def create_many(self, objs: list[CreateDTO], atomic: bool = True) -> list[BulkCreateResult[Model]]:
+        rows = [self._insert_values(self.create_dto_to_entity(obj)) for obj in objs]
+        results = [BulkCreateResult(index=index) for index in range(len(rows))]
+        async with self._write_session() as session:
+            try:
+                async with session.begin():
+                    for start in range(0, len(rows), self.bulk_chunk_size):
+                        chunk = range(start, min(start + self.bulk_chunk_size, len(rows)))
+                        if atomic:
+                            await self._insert_chunk(session, rows, results, chunk)
+                        else:
+                            await self._insert_chunk_isolated(session, rows, results, chunk)
+            except IntegrityError as e:
+                raise AlreadyExistsException(self._integrity_error(e)) from e
+        return results
+
+    async def _insert_chunk(
+            self, session: AsyncSession, rows: list[dict], results: list[BulkCreateResult[Model]], chunk: range
+    ) -> None:
+        stm = insert(self.entity).returning(self.entity, sort_by_parameter_order=True)
+        entities = (await session.scalars(stm, [rows[index] for index in chunk])).all()
+        models = [self.entity_to_model(entity) for entity in entities]
+        await self._on_write(session, models, [])
+        await self._on_changed(session, "create", models)
+        # Items are only reported once every statement for the chunk has run,
+        # so a chunk retried row by row cannot leave an item on a failed row.
+        for index, model in zip(chunk, models):
+            results[index].item = model
+
+    async def _insert_chunk_isolated(
+            self, session: AsyncSession, rows: list[dict], results: list[BulkCreateResult[Model]], chunk: range
+    ) -> None:
+        try:
+            async with session.begin_nested():
+                await self._insert_chunk(session, rows, results, chunk)
+            return
+        except IntegrityError:
+            pass
+        # Some row in the chunk is invalid: retry row by row to pin the failure down.
+        for index in chunk:
+            try:
+                async with session.begin_nested():
+                    await self._insert_chunk(session, rows, results, range(index, index + 1))
+            except IntegrityError as e:
+                results[index].error = self._integrity_error(e)
+
+    @staticmethod
+    def _integrity_error(error: IntegrityError) -> str:
+        return f"Integrity constraint violation: {error.orig.__cause__ or error.orig}"
+
+    def _insert_values(self, entity: Entity) -> dict:
+        return {
+            column.key: getattr(entity, column.key)
+            for column in self.entity.__table__.columns
+            if getattr(entity, column.key) is not None
+        }
+
     async def get(self, obj_id: str) -> Model:
-        async with self.session_maker() as session:
+        # Concurrent gets are coalesced into one IN query. A batch reads through
+        # the session of whichever caller opened it, so callers pinned to the
+        # primary by a consistency token query on their own.
+        if self.batch_gets and not self._requires_primary():
+            model = await self._loader.load(obj_id)
+            if model is None:
+                raise NotFoundException(f"Entity with id {obj_id} not found")
+            return model
+        async with self._read_session() as session:
             res = await session.execute(
-                select(self.entity).where(self.entity.id == obj_id)
+                select(*self.columns).where(self.entity.id == obj_id)
             )
             try:
-                obj = res.scalars().one()
+                row = res.one()
             except NoResultFound as e:
                 raise NotFoundException(f"Entity with id {obj_id} not found") from e
-            return self.entity_to_model(obj)
+            with timed_mapping():
+                return self.model(*row)
+
+    async def get_many(self, obj_ids: list[uuid.UUID]) -> list[Model]:
+        if not obj_ids:
+            return []
+        async with self._read_session() as session:
+            res = await session.execute(
+                select(*self.columns).where(self.entity.id.in_(obj_ids))
+            )
+            with timed_mapping():
+                return [self.model(*row) for row in res]
+
+    async def _load_many(self, obj_ids: list[uuid.UUID]) -> dict[uuid.UUID, Model]:
+        return {model.id: model for model in await self.get_many(obj_ids)}
 
     async def update(self, obj_id: str, obj: UpdateDTO) -> None:
-        async with self.session_maker() as session:
-            async with session.begin():
-                stm = (
-                    select(self.entity).where(self.entity.id == obj_id).with_for_update()
-                )
-                entity = (await session.execute(stm)).scalars().one()
-                for key, value in obj.__dict__.items():
-                    setattr(entity, key, value)
-                await session.flush()
+        await self.patch(obj_id, obj.__dict__)
+
+    async def patch(
+            self, obj_id: uuid.UUID, values: dict[str, Any], expected_updated_at: Optional[datetime] = None
+    ) -> Model:
+        stm = update(self.entity).where(self.entity.id == obj_id)
+        if expected_updated_at is not None:
+            stm = stm.where(self.entity.updated_at == expected_updated_at)
+        tracked, previous_columns = [], []
+        if not values.keys().isdisjoint(self.write_tracked_fields):
+            # The previous tracked values come back from the UPDATE itself,
+            # read under the same row lock it takes, rather than from a
+            # separate SELECT ... FOR UPDATE round trip.
+            tracked = list(self.write_tracked_fields)
+            previous = (
+                select(self.entity.id, *(self._columns_by_name[name] for name in tracked))
+                .where(self.entity.id == obj_id)
+                .with_for_update(key_share=True)
+                .subquery("previous")
+            )
+            stm = stm.where(self.entity.id == previous.c.id)
+            previous_columns = [previous.c[name] for name in tracked]
+        stm = (
+            stm.values(**values, updated_at=func.now())
+            .returning(*self.columns, *previous_columns)
+            .execution_options(synchronize_session=False)
+        )
+        async with self._write_session() as session:
+            try:
+                async with session.begin():
+                    row = (await session.execute(stm)).one_or_none()
+                    if row is None:
+                        exists = await session.scalar(select(self.entity.id).where(self.entity.id == obj_id))
+                        if exists is None:
+                            raise NotFoundException(f"Entity with id {obj_id} not found")
+                        raise PreconditionFailedException(f"Entity with id {obj_id} was modified")
+                    model = self.model(*row[:len(self.columns)])
+                    previous = replace(model, **dict(zip(tracked, row[len(self.columns):])))
+                    if previous != model:
+                        await self._on_write(session, [model], [previous])
+                    await self._on_changed(session, "update", [model], [previous])
+                    return model
+            except IntegrityError as e:
+                raise AlreadyExistsException(self._integrity_error(e)) from e
 
     async def delete(self, obj_id: str) -> None:
-        async with self.session_maker() as session:
+        async with self._write_session() as session:
             async with session.begin():
-                stm = delete(self.entity).where(self.entity.id == obj_id)
-                await session.execute(stm)
+                stm = delete(self.entity).where(self.entity.id == obj_id).returning(*self.columns)
+                models = [self.model(*row) for row in (await session.execute(stm)).all()]
+                await self._on_write(session, [], models)
+                await self._on_changed(session, "delete", models)
 
     async def get_all(self, limit: int = 100, offset: int = 0, **kwargs) -> list[Model]:
-        async with self.session_maker() as session:
-            stm = select(self.entity).order_by(self.entity.created_at.desc())
-            for key, value in kwargs.items():
-                stm = stm.where(getattr(self.entity, key) == value) # noqa
+        if not self.single_flight:
+            return await self._get_all(limit, offset, **kwargs)
+        models = await self.flights.do(
+            self._flight_key("get_all", limit, offset, **kwargs), lambda: self._get_all(limit, offset, **kwargs)
+        )
+        return list(models)
+
+    async def _get_all(self, limit: int = 100, offset: int = 0, **kwargs) -> list[Model]:
+        async with self._read_session() as session:
+            stm = self._listing(select(*self.columns), **kwargs)
             stm = stm.limit(limit).offset(offset)
-            return [
-                self.entity_to_model(entity)
-                for entity in (await session.execute(stm)).scalars().all()
-            ]
+            res = await session.execute(stm)
+            with timed_mapping():
+                return [self.model(*row) for row in res]
+
+    async def get_partial(self, obj_id: uuid.UUID, fields: list[str]) -> dict[str, Any]:
+        async with self._read_session() as session:
+            row = (await session.execute(
+                select(*self._projection(fields)).where(self.entity.id == obj_id)
+            )).one_or_none()
+        if row is None:
+            raise NotFoundException(f"Entity with id {obj_id} not found")
+        return row._asdict()
+
+    async def get_all_partial(
+            self, fields: list[str], limit: int = 100, offset: int = 0, **kwargs
+    ) -> list[dict[str, Any]]:
+        if not self.single_flight:
+            return await self._get_all_partial(fields, limit, offset, **kwargs)
+        rows = await self.flights.do(
+            self._flight_key("get_all_partial", tuple(fields), limit, offset, **kwargs),
+            lambda: self._get_all_partial(fields, limit, offset, **kwargs),
+        )
+        return list(rows)
+
+    async def _get_all_partial(
+            self, fields: list[str], limit: int = 100, offset: int = 0, **kwargs
+    ) -> list[dict[str, Any]]:
+        # Only the requested columns leave the database; the listing still
+        # orders by (created_at, id) whether or not they are selected.
+        stm = self._listing(select(*self._projection(fields)), **kwargs).limit(limit).offset(offset)
+        async with self._read_session() as session:
+            res = await session.execute(stm)
+            with timed_mapping():
+                return [dict(zip(fields, row)) for row in res]
+
+    def _projection(self, fields: list[str]) -> list:
+        unknown = [name for name in fields if name not in self._columns_by_name]
+        if unknown:
+            raise ValueError(f"{self.model.__name__} has no fields {', '.join(unknown)}")
+        return [self._columns_by_name[name] for name in fields]
+
+    async def get_page(self, limit: int = 100, cursor: Optional[str] = None, **kwargs) -> Page[Model]:
+        if not self.single_flight:
+            return await self._get_page(limit, cursor, **kwargs)
+        page = await self.flights.do(
+            self._flight_key("get_page", limit, cursor, **kwargs), lambda: self._get_page(limit, cursor, **kwargs)
+        )
+        return Page(items=list(page.items), next_cursor=page.next_cursor)
+
+    async def _get_page(self, limit: int = 100, cursor: Optional[str] = None, **kwargs) -> Page[Model]:
+        stm = self._seek(self._listing(select(*self.columns), **kwargs), cursor)
+        async with self._read_session() as session:
+            rows = (await session.execute(stm.limit(limit + 1))).all()
+        with timed_mapping():
+            items = [self.model(*row) for row in rows[:limit]]
+        next_cursor = None
+        if items and len(rows) > limit:
+            next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+        return Page(items=items, next_cursor=next_cursor)
+
+    def _flight_key(self, method: str, *args, **kwargs) -> tuple:
+        # Filter values are compared as strings, the way they reach the query;
+        # callers pinned to the primary never share a flight with replica reads.
+        return method, *args, *sorted((name, str(value)) for name, value in kwargs.items()), self._requires_primary()
+
+    async def stream(self, **kwargs) -> AsyncIterator[Model]:
+        stm = self._listing(select(*self.columns), **kwargs).execution_options(yield_per=self.stream_batch_size)
+        async with self._read_session() as session:
+            async for row in await session.stream(stm):
+                yield self.model(*row)
+
+    async def count(self, estimated: bool = False, **kwargs) -> int:
+        key = (estimated, *sorted((name, str(value)) for name, value in kwargs.items()))
+        if self.count_cache is not None:
+            cached = self.count_cache.get(key)
+            if cached is not MISSING:
+                return cached
+            generation = self.count_cache.generation
+        async with self._read_session() as session:
+            if estimated:
+                # The planner's row estimate for the filtered scan: a lookup in
+                # the table statistics instead of visiting every matching row.
+                plan = await session.scalar(Explain(self._filtered(select(self.entity.id), **kwargs)))
+                total = planned_rows(plan)
+            else:
+                total = await session.scalar(
+                    self._filtered(select(func.count()).select_from(self.entity), **kwargs)
+                )
+        if self.count_cache is not None:
+            self.count_cache.set(key, total, generation)
+        return total
+
+    async def get_version(self, obj_id: uuid.UUID) -> datetime:
+        async with self._read_session() as session:
+            updated_at = await session.scalar(
+                select(self.entity.updated_at).where(self.entity.id == obj_id)
+            )
+        if updated_at is None:
+            raise NotFoundException(f"Entity with id {obj_id} not found")
+        return updated_at
+
+    async def get_versions(
+            self, limit: int = 100, offset: int = 0, cursor: Optional[str] = None, **kwargs
+    ) -> list[tuple[uuid.UUID, datetime]]:
+        stm = self._listing(select(self.entity.id, self.entity.updated_at), **kwargs)
+        if cursor is not None:
+            stm = self._seek(stm, cursor)
+        else:
+            stm = stm.offset(offset)
+        async with self._read_session() as session:
+            return [tuple(row) for row in (await session.execute(stm.limit(limit))).all()]
+
+    def _seek(self, stm: Select, cursor: Optional[str]) -> Select:
+        if not cursor:
+            return stm
+        created_at, obj_id = decode_cursor(cursor, datetime.fromisoformat, uuid.UUID)
+        return stm.where(
+            tuple_(self.entity.created_at, self.entity.id) < tuple_(created_at, obj_id)
+        )
+
+    def _listing(self, stm: Select, **kwargs) -> Select:
+        return self._filtered(stm, **kwargs).order_by(self.entity.created_at.desc(), self.entity.id.desc())
+
+    def _filtered(self, stm: Select, **kwargs) -> Select:
+        for key, value in kwargs.items():
+            stm = stm.where(getattr(self.entity, key) == value) # noqa
+        return stm
+
+    async def _on_write(self, session: AsyncSession, added: list[Model], removed: list[Model]) -> None:
+        # Runs inside the write's transaction; an update is reported as the new
+        # row added and the previous one removed.
+        pass
+
+    async def _on_changed(
+            self,
+            session: AsyncSession,
+            op: Literal["create", "update", "delete"],
+            models: list[Model],
+            previous: Optional[list[Model]] = None,
+    ) -> None:
+        # Runs inside the write's transaction after every write, tracked
+        # fields or not, with the rows as written (or as they were, for deletes).
+        # Updates also pass the rows with their tracked fields as they were.
+        pass
 
     @abstractmethod
     def entity_to_model(self, entity: Entity) -> Model:
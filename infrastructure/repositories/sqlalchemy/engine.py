@@ -0,0 +1,78 @@
+import asyncio
+import time
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+@dataclass
+class PoolStats:
+    size: int
+    checked_out: int
+    idle: int
+    overflow: int
+    checkouts: int
+    failed_checkouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+    connects: int
+    connect_seconds_total: float
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.failed_checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.connects = 0
+        self.connect_seconds_total = 0.0
+
+    def _do_get(self):
+        # Wait is the time spent queueing for a connection; opening a new one
+        # for a free slot is reported as connect time instead.
+        started = time.perf_counter()
+        try:
+            entry = super()._do_get()
+        except Exception:
+            self.failed_checkouts += 1
+            raise
+        waited = time.perf_counter() - started - entry.info.pop("connect_seconds", 0.0)
+        self.checkouts += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        return entry
+
+    def _create_connection(self):
+        started = time.perf_counter()
+        entry = super()._create_connection()
+        connected = time.perf_counter() - started
+        # Kept on the entry rather than the pool: checkouts interleave.
+        entry.info["connect_seconds"] = connected
+        self.connects += 1
+        self.connect_seconds_total += connected
+        return entry
+
+    def stats(self) -> PoolStats:
+        return PoolStats(
+            size=self.size(),
+            checked_out=self.checkedout(),
+            idle=self.checkedin(),
+            overflow=max(self.overflow(), 0),
+            checkouts=self.checkouts,
+            failed_checkouts=self.failed_checkouts,
+            wait_seconds_total=self.wait_seconds_total,
+            wait_seconds_max=self.wait_seconds_max,
+            connects=self.connects,
+            connect_seconds_total=self.connect_seconds_total,
+        )
+
+
+async def warm_up(engine: AsyncEngine, size: int) -> None:
+    # Open the connections concurrently so they are all held at once, then
+    # return them to the pool where they stay idle until the first requests.
+    connections = await asyncio.gather(*(engine.connect().start() for _ in range(size)))
+    for connection in connections:
+        await connection.close()
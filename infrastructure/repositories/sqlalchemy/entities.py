@@ -1,7 +1,8 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import UUID, TIMESTAMP, func, String, Integer, ForeignKey
+from sqlalchemy import UUID, TIMESTAMP, func, String, Integer, BigInteger, ForeignKey, Index, Computed
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import declarative_base, mapped_column, Mapped
 
 Base = declarative_base()
@@ -18,15 +19,59 @@ class BaseEntity(Base):
 
 class Product(BaseEntity):
     __tablename__ = 'products'
+    __table_args__ = (
+        Index('ix_products_created_at_id', 'created_at', 'id'),
+        Index('ix_products_updated_at_id', 'updated_at', 'id'),
+        Index('ix_products_category_id_created_at_id', 'category_id', 'created_at', 'id'),
+        Index('ix_products_category_id_price', 'category_id', 'price'),
+        Index('ix_products_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('ix_products_name_trgm', 'name', postgresql_using='gist', postgresql_ops={'name': 'gist_trgm_ops'}),
+        Index('ix_products_sku_trgm', 'sku', postgresql_using='gist', postgresql_ops={'sku': 'gist_trgm_ops'}),
+    )
 
     sku: Mapped[str] = mapped_column(String, nullable=False)
     name: Mapped[str] = mapped_column(String, nullable=False)
     description: Mapped[str] = mapped_column(String, nullable=False)
     price: Mapped[int] = mapped_column(Integer, nullable=False)
     category_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey('categories.id'), nullable=False)
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple', name), 'A') || "
+            "setweight(to_tsvector('simple', sku), 'A') || "
+            "setweight(to_tsvector('simple', description), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
 
 class Category(BaseEntity):
     __tablename__ = 'categories'
+    __table_args__ = (
+        Index('ix_categories_created_at_id', 'created_at', 'id'),
+    )
 
     name: Mapped[str] = mapped_column(String, nullable=False)
+
+
+class CategoryStats(Base):
+    __tablename__ = 'category_stats'
+
+    category_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey('categories.id', ondelete='CASCADE'), primary_key=True, nullable=False
+    )
+    product_count: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default='0')
+    price_sum: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default='0')
+    min_price: Mapped[int] = mapped_column(Integer, nullable=True)
+    max_price: Mapped[int] = mapped_column(Integer, nullable=True)
+
+
+class ProductTombstone(Base):
+    __tablename__ = 'product_tombstones'
+    __table_args__ = (
+        Index('ix_product_tombstones_deleted_at_id', 'deleted_at', 'id'),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(TIMESTAMP, nullable=False, server_default=func.now())
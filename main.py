@@ -1,16 +1,39 @@
 import asyncio
 import logging.config
+from contextlib import asynccontextmanager
+from typing import Optional
 
 import uvicorn
 from fastapi import FastAPI
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine
 
+from abstractions.repositories import ProductRepositoryInterface, CategoryRepositoryInterface
+from abstractions.repositories.product import ProductEvent
+from domain import Product, Category
+from infrastructure.events import EventHub, PostgresListener
+from infrastructure.events.product import PRODUCT_EVENTS_CHANNEL, decode_product_event
 from infrastructure.handlers.fastapi.category import FastApiCategoryHandler
+from infrastructure.handlers.fastapi.consistency import ConsistencyTokenMiddleware
+from infrastructure.handlers.fastapi.metrics import MetricsMiddleware, FastApiMetricsHandler
 from infrastructure.handlers.fastapi.product import FastApiProductHandler
-from infrastructure.repositories.category import SqlAlchemyCategoryRepository
-from infrastructure.repositories.product import SqlAlchemyProductRepository
-from settings import Settings
-from usecases import ProductUseCase
+from infrastructure.handlers.fastapi.profiling import ProfilingMiddleware, mark_endpoints
+from infrastructure.handlers.fastapi.product_import import FastApiProductImportHandler
+from infrastructure.handlers.fastapi.stats import FastApiStatsHandler
+from infrastructure.metrics import AppMetrics
+from infrastructure.profiling import QueryProfiler
+from infrastructure.repositories.cache import LRUCache
+from infrastructure.repositories.category import (
+    SqlAlchemyCategoryRepository, CachedCategoryRepository, InstrumentedCategoryRepository,
+    InMemoryCategoryRepository
+)
+from infrastructure.repositories.memory import read_snapshot
+from infrastructure.repositories.product import (
+    SqlAlchemyProductRepository, CachedProductRepository, InstrumentedProductRepository,
+    InMemoryProductRepository
+)
+from infrastructure.repositories.sqlalchemy import InstrumentedQueuePool, warm_up
+from settings import Settings, EntityCacheSettings
+from usecases import ProductUseCase, ProductImportUseCase
 from usecases.category import CategoryUseCase
 
 LOGGING_CONFIG = {
@@ -63,30 +86,199 @@ logging.config.dictConfig(LOGGING_CONFIG)
 settings = Settings()
 
 
-async def setup() -> FastAPI:
-    engine = create_async_engine(
-        settings.db.get_url(),
-        echo=True,
+def create_cache(cache_settings: EntityCacheSettings) -> LRUCache:
+    return LRUCache(
+        max_size=cache_settings.max_size,
+        ttl=cache_settings.ttl,
+        negative_ttl=cache_settings.negative_ttl,
+    )
+
+
+def create_count_cache() -> LRUCache:
+    return LRUCache(max_size=settings.counts.cache_max_size, ttl=settings.counts.cache_ttl, negative_ttl=0)
+
+
+def create_engine(url: str = None) -> AsyncEngine:
+    return create_async_engine(
+        url or settings.db.get_url(),
+        echo=settings.db.echo,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.db.pool_size,
+        max_overflow=settings.db.max_overflow,
+        pool_timeout=settings.db.pool_timeout,
+        pool_recycle=settings.db.pool_recycle,
+        pool_pre_ping=settings.db.pool_pre_ping,
+        connect_args={"prepared_statement_cache_size": settings.db.prepared_statement_cache_size},
+    )
+
+
+def create_engines() -> dict[str, AsyncEngine]:
+    engines = {"primary": create_engine()}
+    for index, url in enumerate(settings.db.replicas):
+        engines[f"replica_{index}"] = create_engine(url)
+    return engines
+
+
+def create_session_maker(engine: AsyncEngine) -> async_sessionmaker:
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+def create_sqlalchemy_repositories(
+        engines: dict[str, AsyncEngine],
+) -> tuple[ProductRepositoryInterface, CategoryRepositoryInterface]:
+    session_maker = create_session_maker(engines["primary"])
+    replica_session_makers = [create_session_maker(engine) for name, engine in engines.items() if name != "primary"]
+    products_repo = SqlAlchemyProductRepository(
+        session_maker,
+        replica_session_makers=replica_session_makers,
+        max_replica_lag=settings.db.max_replica_lag,
+        count_cache=create_count_cache(),
+        batch_gets=settings.repositories.batch_gets,
+        single_flight=settings.repositories.single_flight,
+        write_batch_window=settings.repositories.write_batch_window_ms / 1000,
+        write_batch_size=settings.repositories.write_batch_size,
+        publish_events=settings.events.enabled,
+        search_candidates=settings.repositories.search_candidates,
     )
-    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    categories_repo = SqlAlchemyCategoryRepository(
+        session_maker,
+        replica_session_makers=replica_session_makers,
+        max_replica_lag=settings.db.max_replica_lag,
+        count_cache=create_count_cache(),
+        batch_gets=settings.repositories.batch_gets,
+        single_flight=settings.repositories.single_flight,
+        write_batch_window=settings.repositories.write_batch_window_ms / 1000,
+        write_batch_size=settings.repositories.write_batch_size,
+    )
+    return products_repo, categories_repo
+
+
+def create_memory_repositories(
+        events: Optional[EventHub[ProductEvent]] = None,
+) -> tuple[ProductRepositoryInterface, CategoryRepositoryInterface]:
+    categories_repo = InMemoryCategoryRepository()
+    products_repo = InMemoryProductRepository(categories=categories_repo, events=events)
+    if settings.repositories.categories_snapshot is not None:
+        categories_repo.load(read_snapshot(settings.repositories.categories_snapshot, Category))
+    if settings.repositories.products_snapshot is not None:
+        products_repo.load(read_snapshot(settings.repositories.products_snapshot, Product))
+    return products_repo, categories_repo
+
+
+def wrap_repositories(
+        products_repo: ProductRepositoryInterface,
+        categories_repo: CategoryRepositoryInterface,
+        metrics: AppMetrics = None,
+) -> tuple[ProductRepositoryInterface, CategoryRepositoryInterface]:
+    if metrics is not None:
+        products_repo = InstrumentedProductRepository(products_repo, metrics.repository_duration, "product")
+        categories_repo = InstrumentedCategoryRepository(categories_repo, metrics.repository_duration, "category")
+
+    # Entities are not cached from replica reads while a write to them may
+    # still be replicating.
+    max_replica_lag = settings.db.max_replica_lag if settings.db.replicas else 0.0
+    if settings.cache.products.enabled:
+        products_repo = CachedProductRepository(products_repo, create_cache(settings.cache.products), max_replica_lag)
+    if settings.cache.categories.enabled:
+        categories_repo = CachedCategoryRepository(
+            categories_repo, create_cache(settings.cache.categories), max_replica_lag
+        )
+
+    return products_repo, categories_repo
 
-    products_repo = SqlAlchemyProductRepository(session_maker)
-    categories_repo = SqlAlchemyCategoryRepository(session_maker)
+
+async def setup() -> FastAPI:
+    engines, flights, change_feeds = {}, {}, {}
+    events = EventHub(settings.events.queue_size) if settings.events.enabled else None
+    listener = None
+    if settings.repositories.backend == "memory":
+        products_repo, categories_repo = create_memory_repositories(events)
+    else:
+        engines = create_engines()
+        products_repo, categories_repo = create_sqlalchemy_repositories(engines)
+        flights = {"product": products_repo.flights, "category": categories_repo.flights}
+        change_feeds = {"product": products_repo.change_feed_stats}
+        if events is not None:
+            listener = PostgresListener(
+                settings.db.get_url("postgresql"), PRODUCT_EVENTS_CHANNEL, decode_product_event, events,
+                settings.events.listen_retry_delay, settings.events.listen_max_retry_delay,
+            )
+    # Slow queries are logged even when per-request profiling is off.
+    query_profiler = QueryProfiler(settings.profiling.slow_query_ms / 1000, settings.profiling.explain)
+    for engine in engines.values():
+        query_profiler.instrument(engine)
+    metrics = None
+    if settings.metrics.enabled:
+        metrics = AppMetrics()
+        for name, engine in engines.items():
+            metrics.instrument_engine(engine, name)
+        for entity, entity_flights in flights.items():
+            metrics.instrument_single_flight(entity_flights, entity)
+        for entity, stats in change_feeds.items():
+            metrics.instrument_change_feed(stats, entity)
+    products_repo, categories_repo = wrap_repositories(products_repo, categories_repo, metrics)
 
     products_use_case = ProductUseCase(products_repo)
     categories_use_case = CategoryUseCase(categories_repo)
+    products_import_use_case = ProductImportUseCase(products_repo, categories_repo)
+
+    products_handler = FastApiProductHandler(
+        products_use_case, settings.http_cache.products, categories_use_case, events, settings.events.heartbeat
+    )
+    categories_handler = FastApiCategoryHandler(categories_use_case, settings.http_cache.categories)
+    products_import_handler = FastApiProductImportHandler(products_import_use_case)
+
+    stats_sources = {
+        "pool" if name == "primary" else f"{name}_pool": engine.pool.stats for name, engine in engines.items()
+    }
+    if flights:
+        stats_sources["products_single_flight"] = lambda: flights["product"].stats
+        stats_sources["categories_single_flight"] = lambda: flights["category"].stats
+    if change_feeds:
+        stats_sources["product_changes"] = lambda: change_feeds["product"]
+    if events is not None:
+        stats_sources["product_events"] = lambda: events.stats
+    if isinstance(products_repo, CachedProductRepository):
+        stats_sources["products_cache"] = lambda: products_repo.cache.stats
+    if isinstance(categories_repo, CachedCategoryRepository):
+        stats_sources["categories_cache"] = lambda: categories_repo.cache.stats
+    stats_handler = FastApiStatsHandler(stats_sources)
 
-    products_handler = FastApiProductHandler(products_use_case)
-    categories_handler = FastApiCategoryHandler(categories_use_case)
+    # Connections belong to the event loop that opened them, so the pool is
+    # warmed from the server's own loop rather than from setup().
+    @asynccontextmanager
+    async def lifespan(_: FastAPI):
+        if settings.db.pool_warm_up:
+            await asyncio.gather(*(warm_up(engine, settings.db.pool_size) for engine in engines.values()))
+        if listener is not None:
+            listener.start()
+        yield
+        if listener is not None:
+            await listener.stop()
+        for engine in engines.values():
+            await engine.dispose()
 
     app = FastAPI(
         title="Product API",
         description="API for managing products",
         version="0.1.0",
+        lifespan=lifespan,
     )
 
+    app.add_middleware(ConsistencyTokenMiddleware)
+    if settings.profiling.enabled:
+        app.add_middleware(ProfilingMiddleware)
+    if metrics is not None:
+        app.add_middleware(MetricsMiddleware, metrics=metrics)
+
+    app.include_router(products_import_handler.router, prefix="/products")
     app.include_router(products_handler.router, prefix="/products")
     app.include_router(categories_handler.router, prefix="/categories")
+    app.include_router(stats_handler.router, prefix="/stats")
+    if metrics is not None:
+        app.include_router(FastApiMetricsHandler(metrics).router, prefix="/metrics")
+    if settings.profiling.enabled:
+        mark_endpoints(app)
 
     return app
 
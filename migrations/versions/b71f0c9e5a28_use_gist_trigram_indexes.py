@@ -0,0 +1,41 @@
+"""use gist trigram indexes
+
+Revision ID: b71f0c9e5a28
+Revises: e3a9d17c4b60
+Create Date: 2026-10-18 21:14:36.208913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b71f0c9e5a28'
+down_revision: Union[str, None] = 'e3a9d17c4b60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # GiST trigram indexes also serve ORDER BY <-> (nearest first), which
+    # search uses to cap its fuzzy candidates without ranking every match.
+    op.drop_index('ix_products_sku_trgm', table_name='products', postgresql_using='gin',
+                  postgresql_ops={'sku': 'gin_trgm_ops'})
+    op.drop_index('ix_products_name_trgm', table_name='products', postgresql_using='gin',
+                  postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_products_name_trgm', 'products', ['name'], unique=False, postgresql_using='gist',
+                    postgresql_ops={'name': 'gist_trgm_ops'})
+    op.create_index('ix_products_sku_trgm', 'products', ['sku'], unique=False, postgresql_using='gist',
+                    postgresql_ops={'sku': 'gist_trgm_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_products_sku_trgm', table_name='products', postgresql_using='gist',
+                  postgresql_ops={'sku': 'gist_trgm_ops'})
+    op.drop_index('ix_products_name_trgm', table_name='products', postgresql_using='gist',
+                  postgresql_ops={'name': 'gist_trgm_ops'})
+    op.create_index('ix_products_name_trgm', 'products', ['name'], unique=False, postgresql_using='gin',
+                    postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_products_sku_trgm', 'products', ['sku'], unique=False, postgresql_using='gin',
+                    postgresql_ops={'sku': 'gin_trgm_ops'})
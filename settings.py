@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Tuple, Type
+from typing import Tuple, Type, Literal, Optional
 
 from pydantic_settings import BaseSettings, JsonConfigSettingsSource, PydanticBaseSettingsSource, SettingsConfigDict
 
@@ -10,19 +10,87 @@ class DBSettings(BaseSettings):
     password: str
     host: str
     port: int
+    echo: bool = True
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    pool_warm_up: bool = True
+    prepared_statement_cache_size: int = 100
+    replicas: list[str] = []
+    max_replica_lag: float = 5.0
 
     def get_url(self, driver_with_dialect: str = 'postgresql+asyncpg') -> str:
         return f"{driver_with_dialect}://{self.user}:{self.password}@{self.host}:{self.port}/{self.name}"
 
 
+class RepositorySettings(BaseSettings):
+    backend: Literal['sqlalchemy', 'memory'] = 'sqlalchemy'
+    batch_gets: bool = True
+    single_flight: bool = True
+    write_batch_window_ms: float = 0.0
+    write_batch_size: int = 100
+    search_candidates: int = 1000
+    products_snapshot: Optional[Path] = None
+    categories_snapshot: Optional[Path] = None
+
+
 class AppSettings(BaseSettings):
     host: str = '0.0.0.0'
     port: int = 8000
 
 
+class EntityCacheSettings(BaseSettings):
+    enabled: bool = False
+    max_size: int = 10_000
+    ttl: float = 60.0
+    negative_ttl: float = 5.0
+
+
+class CacheSettings(BaseSettings):
+    products: EntityCacheSettings = EntityCacheSettings()
+    categories: EntityCacheSettings = EntityCacheSettings()
+
+
+class CountSettings(BaseSettings):
+    cache_ttl: float = 5.0
+    cache_max_size: int = 1024
+
+
+class EventSettings(BaseSettings):
+    enabled: bool = False
+    queue_size: int = 100
+    heartbeat: float = 15.0
+    listen_retry_delay: float = 1.0
+    listen_max_retry_delay: float = 30.0
+
+
+class HttpCacheSettings(BaseSettings):
+    products: dict[str, str] = {"get": "no-cache", "get_all": "no-cache"}
+    categories: dict[str, str] = {"get": "no-cache", "get_all": "no-cache"}
+
+
+class MetricsSettings(BaseSettings):
+    enabled: bool = True
+
+
+class ProfilingSettings(BaseSettings):
+    enabled: bool = False
+    slow_query_ms: float = 200.0
+    explain: bool = False
+
+
 class Settings(BaseSettings):
     db: DBSettings
     app: AppSettings = AppSettings()
+    repositories: RepositorySettings = RepositorySettings()
+    cache: CacheSettings = CacheSettings()
+    counts: CountSettings = CountSettings()
+    events: EventSettings = EventSettings()
+    http_cache: HttpCacheSettings = HttpCacheSettings()
+    metrics: MetricsSettings = MetricsSettings()
+    profiling: ProfilingSettings = ProfilingSettings()
 
     model_config = SettingsConfigDict(
         extra='ignore',
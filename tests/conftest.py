@@ -0,0 +1,26 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def database_url(name: str) -> str:
+    # Tests that need Postgres run against already migrated databases
+    # (alembic upgrade head) and are skipped when none are configured.
+    url = os.environ.get(name)
+    if url is None:
+        pytest.skip(f"{name} is not set")
+    return url
+
+
+@pytest.fixture
+def primary_url() -> str:
+    return database_url("TEST_DATABASE_URL")
+
+
+@pytest.fixture
+def replica_url() -> str:
+    return database_url("TEST_REPLICA_DATABASE_URL")
@@ -0,0 +1,85 @@
+import asyncio
+import uuid
+
+from sqlalchemy import insert, delete
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from abstractions.repositories.abstract import NotFoundException
+from abstractions.repositories.product import CreateProductDTO
+from infrastructure.repositories.cache import LRUCache
+from infrastructure.repositories.consistency import Consistency, current_consistency
+from infrastructure.repositories.product import CachedProductRepository, SqlAlchemyProductRepository
+from infrastructure.repositories.sqlalchemy.entities import Category, Product, CategoryStats
+
+MAX_REPLICA_LAG = 60.0
+
+
+# The second database stands in for a replica that has not caught up: rows
+# seeded into both are "replicated", writes made through the repository
+# only ever reach the primary.
+async def with_lagging_replica(primary_url: str, replica_url: str, scenario) -> None:
+    engines = [create_async_engine(primary_url), create_async_engine(replica_url)]
+    category_id = uuid.uuid4()
+    try:
+        for engine in engines:
+            async with engine.begin() as conn:
+                await conn.execute(insert(Category).values(id=category_id, name="consistency"))
+        primary, replica = (async_sessionmaker(engine, expire_on_commit=False) for engine in engines)
+        repository = CachedProductRepository(
+            SqlAlchemyProductRepository(primary, replica_session_makers=[replica], max_replica_lag=MAX_REPLICA_LAG),
+            LRUCache(max_size=100, ttl=60, negative_ttl=60),
+            MAX_REPLICA_LAG,
+        )
+        await scenario(engines, repository, category_id)
+    finally:
+        for engine in engines:
+            async with engine.begin() as conn:
+                await conn.execute(delete(Product).where(Product.category_id == category_id))
+                await conn.execute(delete(CategoryStats).where(CategoryStats.category_id == category_id))
+                await conn.execute(delete(Category).where(Category.id == category_id))
+            await engine.dispose()
+
+
+async def as_client(token, call):
+    consistency = Consistency(token=token)
+    current_consistency.set(consistency)
+    result = await call()
+    return consistency, result
+
+
+def test_writer_reads_patch_after_other_client_read_lagging_replica(primary_url, replica_url):
+    async def scenario(engines, repository, category_id):
+        product_id = uuid.uuid4()
+        for engine in engines:
+            async with engine.begin() as conn:
+                await conn.execute(insert(Product).values(
+                    id=product_id, sku="sku", name="name", description="", price=1, category_id=category_id
+                ))
+
+        writer, _ = await asyncio.create_task(as_client(None, lambda: repository.patch(product_id, {"price": 2})))
+        _, stale = await asyncio.create_task(as_client(None, lambda: repository.get(product_id)))
+        assert stale.price == 1
+        _, fresh = await asyncio.create_task(as_client(writer.written_at, lambda: repository.get(product_id)))
+        assert fresh.price == 2
+
+    asyncio.run(with_lagging_replica(primary_url, replica_url, scenario))
+
+
+def test_writer_reads_create_after_other_client_missed_it_on_replica(primary_url, replica_url):
+    async def scenario(engines, repository, category_id):
+        dto = CreateProductDTO(sku="sku", name="name", description="", price=1, category_id=category_id)
+        writer, product = await asyncio.create_task(as_client(None, lambda: repository.create(dto)))
+
+        async def missing():
+            try:
+                await repository.get(product.id)
+            except NotFoundException:
+                return True
+            return False
+
+        _, not_replicated = await asyncio.create_task(as_client(None, missing))
+        assert not_replicated
+        _, fresh = await asyncio.create_task(as_client(writer.written_at, lambda: repository.get(product.id)))
+        assert fresh.id == product.id
+
+    asyncio.run(with_lagging_replica(primary_url, replica_url, scenario))
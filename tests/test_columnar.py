@@ -0,0 +1,58 @@
+import asyncio
+import uuid
+
+import httpx
+import msgpack
+import pyarrow.ipc
+from fastapi import FastAPI
+
+from abstractions.repositories.category import CreateCategoryDTO
+from abstractions.repositories.product import CreateProductDTO
+from infrastructure.handlers.fastapi.columnar import ARROW_MEDIA_TYPE, MSGPACK_MEDIA_TYPE
+from infrastructure.handlers.fastapi.product import FastApiProductHandler
+from infrastructure.repositories.category import InMemoryCategoryRepository
+from infrastructure.repositories.product import InMemoryProductRepository
+from usecases import ProductUseCase
+
+
+async def get_page(media_type: str) -> tuple[list, httpx.Response]:
+    categories = InMemoryCategoryRepository()
+    products = InMemoryProductRepository(categories=categories)
+    category = await categories.create(CreateCategoryDTO(name="category"))
+    created = [
+        await products.create(CreateProductDTO(
+            sku=f"sku-{n}", name=f"name {n}", description="", price=100 + n, category_id=category.id
+        ))
+        for n in range(3)
+    ]
+    app = FastAPI()
+    app.include_router(FastApiProductHandler(ProductUseCase(products)).router, prefix="/products")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get("/products", headers={"Accept": media_type})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith(media_type)
+    return (await products.get_all()), response
+
+
+def test_arrow_page_decodes():
+    expected, response = asyncio.run(get_page(ARROW_MEDIA_TYPE))
+    table = pyarrow.ipc.open_stream(response.content).read_all()
+    assert [uuid.UUID(bytes=value) for value in table["id"].to_pylist()] == [model.id for model in expected]
+    assert table["sku"].to_pylist() == [model.sku for model in expected]
+    assert table["price"].to_pylist() == [model.price for model in expected]
+    assert table["created_at"].to_pylist() == [model.created_at for model in expected]
+
+
+def test_msgpack_page_decodes():
+    expected, response = asyncio.run(get_page(MSGPACK_MEDIA_TYPE))
+    page = msgpack.unpackb(response.content)
+    assert page["length"] == len(expected)
+    ids = page["id"]
+    assert [uuid.UUID(bytes=ids[index:index + 16]) for index in range(0, len(ids), 16)] == [
+        model.id for model in expected
+    ]
+    assert page["sku"] == [model.sku for model in expected]
+    prices = page["price"]
+    assert [int.from_bytes(prices[index:index + 8], "little", signed=True) for index in range(0, len(prices), 8)] == [
+        model.price for model in expected
+    ]
@@ -0,0 +1,126 @@
+import asyncio
+import json
+import uuid
+
+from fastapi import FastAPI
+
+from abstractions.repositories.category import CreateCategoryDTO
+from abstractions.repositories.product import CreateProductDTO, ProductEvent
+from infrastructure.events import EventHub, SubscriptionDroppedException
+from infrastructure.events.product import encode_product_event, decode_product_event
+from infrastructure.handlers.fastapi.product import FastApiProductHandler
+from infrastructure.repositories.category import InMemoryCategoryRepository
+from infrastructure.repositories.product import InMemoryProductRepository
+from usecases import ProductUseCase
+
+
+def test_hub_delivers_matching_events():
+    async def scenario():
+        hub = EventHub(queue_size=10)
+        with hub.subscribe() as everything, hub.subscribe(lambda event: event % 2 == 0) as even:
+            for event in range(4):
+                hub.publish(event)
+            assert [await everything.get(0.1) for _ in range(4)] == [0, 1, 2, 3]
+            assert [await even.get(0.1) for _ in range(2)] == [0, 2]
+            assert await even.get(0.01) is None
+        assert hub.stats.subscribers == 0
+
+    asyncio.run(scenario())
+
+
+def test_hub_drops_subscriber_that_falls_behind():
+    async def scenario():
+        hub = EventHub(queue_size=2)
+        with hub.subscribe() as slow, hub.subscribe() as fast:
+            for event in range(3):
+                hub.publish(event)
+                assert await fast.get(0.1) == event
+            try:
+                await slow.get(0.1)
+            except SubscriptionDroppedException:
+                pass
+            else:
+                raise AssertionError("slow subscriber was not dropped")
+            assert hub.stats.dropped == 1
+
+    asyncio.run(scenario())
+
+
+def test_product_event_round_trips_previous_category():
+    event = ProductEvent("delete", uuid.uuid4(), uuid.uuid4(), previous_category_id=uuid.uuid4())
+    assert decode_product_event(encode_product_event(event)) == event
+
+
+async def read_events(app: FastAPI, path: str, count: int, ready: asyncio.Event) -> list[tuple[str, dict]]:
+    # Drives the ASGI app directly: an event stream never ends, so the
+    # client disconnects once it has seen ``count`` events.
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "query_string": query.encode(), "root_path": "",
+        "headers": [(b"host", b"test")], "client": ("test", 1), "server": ("test", 80),
+    }
+    events, buffer, disconnected = [], "", asyncio.Event()
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal buffer
+        if message["type"] != "http.response.body":
+            assert message["status"] == 200
+            return
+        buffer += message.get("body", b"").decode()
+        *blocks, buffer = buffer.split("\n\n")
+        for block in blocks:
+            if block == ": connected":
+                ready.set()
+            elif block.startswith("event: "):
+                name, data = block.split("\n")
+                events.append((name.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+        if len(events) >= count:
+            disconnected.set()
+
+    app_task = asyncio.create_task(app(scope, receive, send))
+    await disconnected.wait()
+    await asyncio.wait_for(app_task, 1)
+    return events
+
+
+def test_stream_filters_by_current_or_previous_category():
+    async def scenario():
+        hub = EventHub()
+        categories = InMemoryCategoryRepository()
+        products = InMemoryProductRepository(categories=categories, events=hub)
+        handler = FastApiProductHandler(ProductUseCase(products), events=hub, events_heartbeat=0.01)
+        app = FastAPI()
+        app.include_router(handler.router, prefix="/products")
+        first = await categories.create(CreateCategoryDTO(name="first"))
+        second = await categories.create(CreateCategoryDTO(name="second"))
+
+        ready = asyncio.Event()
+        reader = asyncio.create_task(read_events(app, f"/products/stream?category_id={second.id}", 3, ready))
+        await asyncio.wait_for(ready.wait(), 1)
+        product = await products.create(CreateProductDTO(
+            sku="sku", name="name", description="", price=1, category_id=first.id
+        ))
+        await products.patch(product.id, {"category_id": second.id})
+        await products.patch(product.id, {"category_id": first.id})
+        await products.delete(product.id)
+        await products.create(CreateProductDTO(sku="sku", name="name", description="", price=1, category_id=second.id))
+        events = await asyncio.wait_for(reader, 1)
+
+        assert [(name, event["category_id"], event["previous_category_id"]) for name, event in events] == [
+            ("update", str(second.id), str(first.id)),
+            ("update", str(first.id), str(second.id)),
+            ("create", str(second.id), None),
+        ]
+        assert hub.stats.subscribers == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,28 @@
+import asyncio
+
+import pytest
+
+from abstractions.repositories.category import CreateCategoryDTO
+from abstractions.repositories.product import CreateProductDTO
+from infrastructure.repositories.category import InMemoryCategoryRepository
+from infrastructure.repositories.product import InMemoryProductRepository
+
+
+def test_prices_must_be_integral_like_in_the_database():
+    async def scenario():
+        categories = InMemoryCategoryRepository()
+        products = InMemoryProductRepository(categories=categories)
+        category = await categories.create(CreateCategoryDTO(name="category"))
+        product = await products.create(CreateProductDTO(
+            sku="sku", name="name", description="", price=2.0, category_id=category.id
+        ))
+        assert product.price == 2 and isinstance(product.price, int)
+        with pytest.raises(ValueError):
+            await products.create(CreateProductDTO(
+                sku="sku", name="name", description="", price=1.5, category_id=category.id
+            ))
+        with pytest.raises(ValueError):
+            await products.patch(product.id, {"price": 2.5})
+        assert (await products.get(product.id)).price == 2
+
+    asyncio.run(scenario())
@@ -1 +1,2 @@
-from .product import ProductUseCase
\ No newline at end of file
+from .product import ProductUseCase
+from .product_import import ProductImportUseCase
@@ -1,8 +1,11 @@
 import uuid
 from abc import ABC
 from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, AsyncIterator, Any
 
 from abstractions.repositories import CRUDRepositoryInterface
+from abstractions.repositories.abstract import Page, BulkCreateResult
 from abstractions.usecases.abstract import CRUDUseCaseInterface
 
 
@@ -18,14 +21,50 @@ class AbstractCRUDUseCase[
     async def create(self, obj: CreateDTO) -> Model:
         return await self.repository.create(obj)
 
+    async def create_many(self, objs: list[CreateDTO], atomic: bool = True) -> list[BulkCreateResult[Model]]:
+        return await self.repository.create_many(objs, atomic)
+
     async def get(self, obj_id: uuid.UUID) -> Model:
         return await self.repository.get(obj_id)
 
+    async def get_many(self, obj_ids: list[uuid.UUID]) -> list[Model]:
+        return await self.repository.get_many(obj_ids)
+
     async def update(self, obj_id: uuid.UUID, obj: UpdateDTO) -> None:
         await self.repository.update(obj_id, obj)
 
+    async def patch(
+            self, obj_id: uuid.UUID, values: dict[str, Any], expected_updated_at: Optional[datetime] = None
+    ) -> Model:
+        return await self.repository.patch(obj_id, values, expected_updated_at)
+
     async def delete(self, obj_id: uuid.UUID) -> None:
         await self.repository.delete(obj_id)
 
     async def get_all(self, limit: int = 100, offset: int = 0, **kwargs) -> list[Model]:
         return await self.repository.get_all(limit, offset, **kwargs)
+
+    async def get_partial(self, obj_id: uuid.UUID, fields: list[str]) -> dict[str, Any]:
+        return await self.repository.get_partial(obj_id, fields)
+
+    async def get_all_partial(
+            self, fields: list[str], limit: int = 100, offset: int = 0, **kwargs
+    ) -> list[dict[str, Any]]:
+        return await self.repository.get_all_partial(fields, limit, offset, **kwargs)
+
+    async def get_page(self, limit: int = 100, cursor: Optional[str] = None, **kwargs) -> Page[Model]:
+        return await self.repository.get_page(limit, cursor, **kwargs)
+
+    def stream(self, **kwargs) -> AsyncIterator[Model]:
+        return self.repository.stream(**kwargs)
+
+    async def count(self, estimated: bool = False, **kwargs) -> int:
+        return await self.repository.count(estimated, **kwargs)
+
+    async def get_version(self, obj_id: uuid.UUID) -> datetime:
+        return await self.repository.get_version(obj_id)
+
+    async def get_versions(
+            self, limit: int = 100, offset: int = 0, cursor: Optional[str] = None, **kwargs
+    ) -> list[tuple[uuid.UUID, datetime]]:
+        return await self.repository.get_versions(limit, offset, cursor, **kwargs)
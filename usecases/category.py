@@ -1,6 +1,8 @@
+import uuid
+
 from abstractions.repositories.category import CreateCategoryDTO, UpdateCategoryDTO
 from abstractions.usecases import CategoryUseCaseInterface
-from domain import Category
+from domain import Category, CategoryStats
 from usecases.abstract import AbstractCRUDUseCase
 
 
@@ -10,4 +12,8 @@ class CategoryUseCase(
     ],
     CategoryUseCaseInterface,
 ):
-    pass
+    async def get_stats(self, category_id: uuid.UUID) -> CategoryStats:
+        return await self.repository.get_stats(category_id)
+
+    async def get_many_stats(self, category_ids: list[uuid.UUID]) -> list[CategoryStats]:
+        return await self.repository.get_many_stats(category_ids)
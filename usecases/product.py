@@ -1,6 +1,9 @@
 import uuid
+from datetime import datetime
+from typing import Optional, AsyncIterator, Any
 
-from abstractions.repositories.product import UpdateProductDTO, CreateProductDTO
+from abstractions.repositories.abstract import Page, ChangeFeed
+from abstractions.repositories.product import UpdateProductDTO, CreateProductDTO, ProductColumns
 from abstractions.usecases.product import ProductUseCaseInterface
 from domain import Product
 from usecases.abstract import AbstractCRUDUseCase
@@ -13,6 +16,41 @@ class ProductUseCase(
     ProductUseCaseInterface,
 ):
     async def get_all(self, limit: int = 100, offset: int = 0, sku: str = None, name: str = None, category_id: uuid.UUID = None) -> list[Product]:
+        filters = self._filters(sku=sku, name=name, category_id=category_id)
+        return await self.repository.get_all(limit, offset, **filters)
+
+    async def get_page(self, limit: int = 100, cursor: Optional[str] = None, sku: str = None, name: str = None, category_id: uuid.UUID = None) -> Page[Product]:
+        filters = self._filters(sku=sku, name=name, category_id=category_id)
+        return await self.repository.get_page(limit, cursor, **filters)
+
+    async def get_all_partial(self, fields: list[str], limit: int = 100, offset: int = 0, sku: str = None, name: str = None, category_id: uuid.UUID = None) -> list[dict[str, Any]]:
+        filters = self._filters(sku=sku, name=name, category_id=category_id)
+        return await self.repository.get_all_partial(fields, limit, offset, **filters)
+
+    def stream(self, sku: str = None, name: str = None, category_id: uuid.UUID = None) -> AsyncIterator[Product]:
+        filters = self._filters(sku=sku, name=name, category_id=category_id)
+        return self.repository.stream(**filters)
+
+    async def count(self, estimated: bool = False, sku: str = None, name: str = None, category_id: uuid.UUID = None) -> int:
+        filters = self._filters(sku=sku, name=name, category_id=category_id)
+        return await self.repository.count(estimated, **filters)
+
+    async def get_versions(self, limit: int = 100, offset: int = 0, cursor: Optional[str] = None, sku: str = None, name: str = None, category_id: uuid.UUID = None) -> list[tuple[uuid.UUID, datetime]]:
+        filters = self._filters(sku=sku, name=name, category_id=category_id)
+        return await self.repository.get_versions(limit, offset, cursor, **filters)
+
+    async def get_all_columnar(self, limit: int = 100, offset: int = 0, sku: str = None, name: str = None, category_id: uuid.UUID = None) -> ProductColumns:
+        filters = self._filters(sku=sku, name=name, category_id=category_id)
+        return await self.repository.get_all_columnar(limit, offset, **filters)
+
+    async def search(self, query: str, limit: int = 100, cursor: Optional[str] = None) -> Page[Product]:
+        return await self.repository.search(query, limit, cursor)
+
+    async def changes(self, since: Optional[str] = None, limit: int = 1000) -> ChangeFeed[Product]:
+        return await self.repository.changes(since, limit)
+
+    @staticmethod
+    def _filters(sku: str = None, name: str = None, category_id: uuid.UUID = None) -> dict:
         filters = {}
         if sku is not None:
             filters["sku"] = sku
@@ -20,4 +58,4 @@ class ProductUseCase(
             filters["name"] = name
         if category_id is not None:
             filters["category_id"] = category_id
-        return await self.repository.get_all(limit, offset, **filters)
+        return filters
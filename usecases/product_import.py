@@ -0,0 +1,110 @@
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from abstractions.repositories import ProductRepositoryInterface, CategoryRepositoryInterface
+from abstractions.repositories.product import CreateProductDTO
+from abstractions.usecases.product_import import (
+    ProductImportUseCaseInterface, ImportRecord, ImportSummary, RejectedRow
+)
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_FIELDS = ("sku", "name", "description", "price", "category_id")
+
+
+@dataclass
+class ProductImportUseCase(ProductImportUseCaseInterface):
+    products: ProductRepositoryInterface
+    categories: CategoryRepositoryInterface
+    batch_size: int = 1000
+    max_rejections: int = 1000
+
+    async def run(self, records: AsyncIterator[ImportRecord]) -> ImportSummary:
+        summary = ImportSummary()
+        started = time.perf_counter()
+        batch: list[tuple[int, CreateProductDTO]] = []
+        async for record in records:
+            summary.total_rows += 1
+            if record.error is not None:
+                self._reject(summary, record.row, record.error)
+                continue
+            try:
+                batch.append((record.row, self._to_dto(record.values)))
+            except ValueError as e:
+                self._reject(summary, record.row, str(e))
+                continue
+            # Input is only pulled again once the batch is written, so a slow
+            # database throttles the reader instead of buffering the file.
+            if len(batch) >= self.batch_size:
+                await self._flush(summary, batch)
+                self._report(summary, started)
+                batch = []
+        if batch:
+            await self._flush(summary, batch)
+        self._report(summary, started)
+        logger.info(
+            f"Import finished: {summary.imported} imported, {summary.rejected} rejected "
+            f"of {summary.total_rows} rows in {summary.elapsed_seconds:.2f}s"
+        )
+        return summary
+
+    async def _flush(self, summary: ImportSummary, batch: list[tuple[int, CreateProductDTO]]) -> None:
+        category_ids = list({dto.category_id for _, dto in batch})
+        known = {category.id for category in await self.categories.get_many(category_ids)}
+        rows, dtos = [], []
+        for row, dto in batch:
+            if dto.category_id not in known:
+                self._reject(summary, row, f"Unknown category_id {dto.category_id}")
+                continue
+            rows.append(row)
+            dtos.append(dto)
+        if not dtos:
+            return
+        for result in await self.products.create_many(dtos, atomic=False):
+            if result.error is not None:
+                self._reject(summary, rows[result.index], result.error)
+            else:
+                summary.imported += 1
+
+    def _reject(self, summary: ImportSummary, row: int, reason: str) -> None:
+        summary.rejected += 1
+        if len(summary.rejections) < self.max_rejections:
+            summary.rejections.append(RejectedRow(row=row, reason=reason))
+        else:
+            summary.rejections_truncated = True
+
+    @staticmethod
+    def _report(summary: ImportSummary, started: float) -> None:
+        summary.elapsed_seconds = time.perf_counter() - started
+        if summary.elapsed_seconds > 0:
+            summary.rows_per_second = summary.total_rows / summary.elapsed_seconds
+        logger.info(
+            f"Imported {summary.imported}/{summary.total_rows} rows "
+            f"({summary.rows_per_second:.0f} rows/s, {summary.rejected} rejected)"
+        )
+
+    @staticmethod
+    def _to_dto(values: dict) -> CreateProductDTO:
+        missing = [name for name in REQUIRED_FIELDS if values.get(name) in (None, "")]
+        if missing:
+            raise ValueError(f"Missing fields: {', '.join(missing)}")
+        try:
+            price = float(values["price"])
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid price {values['price']!r}")
+        if not price.is_integer():
+            raise ValueError(f"Invalid price {values['price']!r}")
+        try:
+            category_id = uuid.UUID(str(values["category_id"]))
+        except ValueError:
+            raise ValueError(f"Invalid category_id {values['category_id']!r}")
+        return CreateProductDTO(
+            sku=str(values["sku"]),
+            name=str(values["name"]),
+            description=str(values["description"]),
+            price=int(price),
+            category_id=category_id,
+        )